@@ -1,11 +1,15 @@
 from collections import Counter
 from pathlib import Path
-from typing import Tuple, Dict
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 from more_itertools import flatten
 from tqdm import tqdm
 
+from aspects.data_io.column_store import ColumnStore
+
+STATISTICS_COLUMNS = ("text", "edus", "aspects", "rules", "discourse_tree")
+
 
 def generate_domain_statistics(
     reviews_path: Path, min_trees: int = 200
@@ -13,15 +17,20 @@ def generate_domain_statistics(
     statistics = []
     dfs = {}
 
-    for discourse_trees_df_path in tqdm(
-        list(reviews_path.glob("review*/discourse_trees_df.pkl"))
+    for dataset_path in tqdm(
+        [
+            dataset_path
+            for dataset_path in sorted(reviews_path.glob("review*"))
+            if (dataset_path / "discourse_trees_df").exists()
+            or (dataset_path / "discourse_trees_df.pkl").exists()
+        ]
     ):
         try:
-            df = pd.read_pickle(discourse_trees_df_path)
+            df = load_statistics_df(dataset_path, min_trees)
 
-            if "aspects" in df.columns and len(df) > min_trees:
+            if df is not None:
                 dataset_name = (
-                    discourse_trees_df_path.parent.stem.replace("reviews", "")
+                    dataset_path.stem.replace("reviews", "")
                     .replace("_", " ")
                     .replace("-", " ")
                     .replace("docs", "")
@@ -91,14 +100,31 @@ def generate_domain_statistics(
                     }
                 )
             else:
-                print(f"Not fully processed dataset: {discourse_trees_df_path}")
+                print(f"Not fully processed dataset: {dataset_path}")
 
         except Exception as e:
-            print(f"Problem with parsing {discourse_trees_df_path} - {str(e)}")
+            print(f"Problem with parsing {dataset_path} - {str(e)}")
 
     return pd.DataFrame(statistics), dfs
 
 
+def load_statistics_df(dataset_path: Path, min_trees: int) -> Optional[pd.DataFrame]:
+    """
+    Columns of statistics of a fully processed dataset with more than min_trees documents, from
+    the columnar checkpoint or from discourse_trees_df.pkl of runs before it.
+    """
+    store = ColumnStore(dataset_path / "discourse_trees_df")
+    if store.path.exists():
+        if store.has(*STATISTICS_COLUMNS) and len(store.load()) > min_trees:
+            return store.load(*STATISTICS_COLUMNS)
+        return None
+
+    df = pd.read_pickle(dataset_path / "discourse_trees_df.pkl")
+    if set(STATISTICS_COLUMNS).issubset(df.columns) and len(df) > min_trees:
+        return df[list(STATISTICS_COLUMNS)]
+    return None
+
+
 def get_tuples_aspects(df):
     aspects_in_tuples_counter = Counter(
         flatten(
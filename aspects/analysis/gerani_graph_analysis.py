@@ -13,7 +13,9 @@ from aspects.aspects.aspects_graph_builder import (
     calculate_weighted_page_rank,
     merge_multiedges,
     calculate_hits,
+    calculate_in_degree_centrality,
 )
+from aspects.graph.sparse_graph import SparseAspectGraph
 from aspects.utilities.settings import setup_mlflow
 
 setup_mlflow()
@@ -25,50 +27,95 @@ ASPECT_ABSOLUTE_IMPORTANCE = "absolute_importance"
 
 
 def extend_graph_nodes_with_sentiments_and_weights(
-    graph: nx.MultiDiGraph, discourse_trees_df: pd.DataFrame
-) -> Tuple[nx.MultiDiGraph, Dict]:
-    n_aspects_not_in_graph = 0
-    n_aspects_updated = 0
-    aspect_sentiments = defaultdict(list)
-
-    for _, row in tqdm(
-        discourse_trees_df.iterrows(),
+    graph: nx.DiGraph, discourse_trees_df: pd.DataFrame
+) -> Tuple[nx.DiGraph, Dict]:
+    aspect_sentiments = collect_aspect_sentiments(discourse_trees_df)
+    return add_aspect_sentiments_to_graph(graph, aspect_sentiments), aspect_sentiments
+
+
+def collect_aspect_sentiments(
+    discourse_trees_df: pd.DataFrame, aspect_sentiments: Dict = None
+) -> Dict:
+    """Sentiments of EDUs per aspect, aspect_sentiments is extended if data frame is a chunk."""
+    if aspect_sentiments is None:
+        aspect_sentiments = defaultdict(list)
+
+    for aspects_of_edus, sentiments in tqdm(
+        zip(discourse_trees_df.aspects.tolist(), discourse_trees_df.sentiment.tolist()),
         total=len(discourse_trees_df),
         desc="Adding aspects and sentiment to the graph",
     ):
-        for aspects, sentiment in zip(row.aspects, row.sentiment):
+        for aspects, sentiment in zip(aspects_of_edus, sentiments):
             for aspect in aspects:
                 aspect_sentiments[aspect].append(sentiment)
 
-    for aspect, sentiments in tqdm(
-        aspect_sentiments.items(), desc="Adding attributes to the graph nodes"
+    return aspect_sentiments
+
+
+def aspect_sentiments_statistics(aspect_sentiments: Dict) -> pd.DataFrame:
+    """
+    Count, average, sum, importance (sum of squares) and absolute importance of aspect sentiments.
+
+    Sentiments are flattened into one array with a code of aspect per value and reduced per
+    aspect with np.bincount instead of NumPy calls on a small list of each aspect.
+    """
+    aspects = list(aspect_sentiments.keys())
+    counts = np.fromiter(
+        (len(sentiments) for sentiments in aspect_sentiments.values()),
+        dtype=np.int64,
+        count=len(aspects),
+    )
+    sentiments = np.fromiter(
+        (sentiment for sentiments in aspect_sentiments.values() for sentiment in sentiments),
+        dtype=np.float64,
+        count=int(counts.sum()),
+    )
+    codes = np.repeat(np.arange(len(aspects)), counts)
+    sums = np.bincount(codes, weights=sentiments, minlength=len(aspects))
+    return pd.DataFrame(
+        {
+            "count": counts,
+            "sentiment_avg": sums / np.maximum(counts, 1),
+            "sentiment_sum": sums,
+            ASPECT_IMPORTANCE: np.bincount(
+                codes, weights=sentiments ** 2, minlength=len(aspects)
+            ),
+            ASPECT_ABSOLUTE_IMPORTANCE: np.bincount(
+                codes, weights=np.abs(sentiments), minlength=len(aspects)
+            ),
+        },
+        index=pd.Index(aspects, dtype=object),
+    )
+
+
+def add_aspect_sentiments_to_graph(
+    graph: nx.DiGraph, aspect_sentiments: Dict
+) -> nx.DiGraph:
+    statistics = aspect_sentiments_statistics(aspect_sentiments)
+    in_graph = np.fromiter(
+        (aspect in graph for aspect in statistics.index), dtype=bool, count=len(statistics)
+    )
+    for aspect in statistics.index[~in_graph]:
+        logger.info("There is not aspect: {} in graph".format(aspect))
+
+    # columns as lists of Python numbers
+    columns = {column: statistics[column].to_numpy()[in_graph].tolist() for column in statistics}
+    for i, aspect in enumerate(
+        tqdm(statistics.index[in_graph], desc="Adding attributes to the graph nodes")
     ):
-        try:
-            graph.nodes[aspect]["count"] = len(sentiments)
-            graph.nodes[aspect]["sentiment_avg"] = float(np.average(sentiments))
-            graph.nodes[aspect]["sentiment_sum"] = float(np.sum(sentiments))
-            graph.nodes[aspect][ASPECT_IMPORTANCE] = float(
-                np.sum([x ** 2 for x in sentiments])
-            )
-            graph.nodes[aspect][ASPECT_ABSOLUTE_IMPORTANCE] = float(
-                np.sum([abs(x) for x in sentiments])
-            )
-            n_aspects_updated += 1
-        except KeyError as err:
-            n_aspects_not_in_graph += 1
-            logger.info("There is not aspect: {} in graph".format(str(err)))
-
-    logger.info("#{} aspects not in graph".format(n_aspects_not_in_graph))
-    logger.info("#{} aspects updated in graph".format(n_aspects_updated))
-
-    return graph, aspect_sentiments
+        graph.nodes[aspect].update({column: values[i] for column, values in columns.items()})
+
+    logger.info("#{} aspects not in graph".format(int((~in_graph).sum())))
+    logger.info("#{} aspects updated in graph".format(int(in_graph.sum())))
+
+    return graph
 
 
 def calculate_moi_by_gerani(
-    graph: nx.MultiDiGraph,
+    graph: nx.DiGraph,
     weighted_page_rank: Union[Dict, OrderedDict],
     alpha_coefficient=0.5,
-) -> nx.MultiDiGraph:
+) -> nx.DiGraph:
     aspect_importance = nx.get_node_attributes(graph, ASPECT_IMPORTANCE)
 
     for aspect, weighted_page_rank_element in tqdm(
@@ -89,8 +136,8 @@ def calculate_moi_by_gerani(
 
 
 def calculate_weight(
-    graph: nx.MultiDiGraph, ranks: Union[Dict, OrderedDict], alpha_coefficient=0.5
-) -> nx.MultiDiGraph:
+    graph: nx.DiGraph, ranks: Union[Dict, OrderedDict], alpha_coefficient=0.5
+) -> nx.DiGraph:
     aspect_importance = nx.get_node_attributes(graph, ASPECT_ABSOLUTE_IMPORTANCE)
 
     for aspect, score in tqdm(ranks.items(), desc="Calculating weights..."):
@@ -110,13 +157,15 @@ def calculate_weight(
 
 
 def gerani_paper_arrg_to_aht(
-    graph: nx.MultiDiGraph,
+    graph: nx.DiGraph,
     max_number_of_nodes: int = 100,
     weight: str = "moi",
     alpha_coefficient: float = 0.5,
 ) -> nx.Graph:
     logger.info("Generate Aspect Hierarchical Tree based on ARRG")
-    aspects_weighted_page_rank = calculate_weighted_page_rank(graph, "weight")
+    aspects_weighted_page_rank = calculate_weighted_page_rank(
+        graph, "weight", sparse_graph=SparseAspectGraph(graph)
+    )
     graph = calculate_moi_by_gerani(
         graph=graph,
         weighted_page_rank=aspects_weighted_page_rank,
@@ -142,16 +191,18 @@ def gerani_paper_arrg_to_aht(
 
 
 def our_paper_arrg_to_aht(
-    graph: nx.MultiDiGraph,
+    graph: nx.DiGraph,
     max_number_of_nodes: int,
     weight: str = "weight",
     alpha_coefficient: float = 0.5,
     use_aspect_clustering: bool = False,
 ) -> nx.Graph:
     logger.info("Generate Aspect Hierarchical Tree based on ARRG")
-    # aspects_rank = calculate_hits(graph)
-    aspects_rank = nx.in_degree_centrality(graph)
-    # aspects_rank = calculate_weighted_page_rank(graph, "weight")
+    # graph converted to matrices once for any of the rankings
+    sparse_graph = SparseAspectGraph(graph)
+    # aspects_rank = calculate_hits(graph, sparse_graph=sparse_graph)
+    aspects_rank = calculate_in_degree_centrality(graph, sparse_graph=sparse_graph)
+    # aspects_rank = calculate_weighted_page_rank(graph, "weight", sparse_graph=sparse_graph)
     graph = calculate_weight(
         graph=graph, ranks=aspects_rank, alpha_coefficient=alpha_coefficient
     )
@@ -0,0 +1,37 @@
+import pandas as pd
+from hamcrest import assert_that, contains_inanyorder, equal_to
+from nltk import Tree
+
+from aspects.analysis.domain_statistics import generate_domain_statistics
+from aspects.data_io.column_store import ColumnStore
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+
+
+def _discourse_trees_df(n_docs: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "text": ["good phone and nice screen"] * n_docs,
+            "edus": [["good phone", "and nice screen"]] * n_docs,
+            "aspects": [[["phone"], ["screen"]]] * n_docs,
+            "rules": [[EDURelation(0, 1, "Elaboration", 0.5)]] * n_docs,
+            "discourse_tree": [Tree("Elaboration[N][S]", [0, 1])] * n_docs,
+        }
+    )
+
+
+def test_statistics_of_columnar_and_pickled_datasets(tmp_path):
+    ColumnStore(tmp_path / "reviews_phones" / "discourse_trees_df").save(
+        _discourse_trees_df(5), "text", "edus", "aspects", "rules", "discourse_tree"
+    )
+    (tmp_path / "reviews_books").mkdir()
+    _discourse_trees_df(4).to_pickle(tmp_path / "reviews_books" / "discourse_trees_df.pkl")
+    (tmp_path / "reviews_small").mkdir()
+    _discourse_trees_df(1).to_pickle(tmp_path / "reviews_small" / "discourse_trees_df.pkl")
+
+    statistics_df, dfs = generate_domain_statistics(tmp_path, min_trees=2)
+
+    assert_that(dfs.keys(), contains_inanyorder("phones", "books"))
+    assert_that(
+        statistics_df.set_index("Dataset Name")["# of reviews"].to_dict(),
+        equal_to({"phones": 5, "books": 4}),
+    )
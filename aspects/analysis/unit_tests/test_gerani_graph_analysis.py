@@ -3,7 +3,7 @@ import unittest
 import networkx as nx
 
 from aspects.analysis.gerani_graph_analysis import extend_graph_nodes_with_sentiments_and_weights, \
-    calculate_moi_by_gerani
+    calculate_moi_by_gerani, add_aspect_sentiments_to_graph
 
 
 class GeraniGraphAnalysisTest(unittest.TestCase):
@@ -45,3 +45,17 @@ class GeraniGraphAnalysisTest(unittest.TestCase):
                           'screen': 0.08771919886125766,
                           'speaker': 0.08771919886125766,
                           'apple': 0.16228080113874227})
+
+    def test_add_aspect_sentiments_to_graph(self):
+        graph = nx.DiGraph()
+        graph.add_edge('screen', 'phone')
+        aspect_sentiments = {'phone': [1, -0.5, 0.5], 'screen': [-1], 'battery': [0.5]}
+
+        graph = add_aspect_sentiments_to_graph(graph, aspect_sentiments)
+        self.assertEqual(graph.nodes['phone'], {'count': 3,
+                                                'sentiment_avg': 1 / 3,
+                                                'sentiment_sum': 1.0,
+                                                'importance': 1.5,
+                                                'absolute_importance': 2.0})
+        self.assertEqual(graph.nodes['screen']['sentiment_avg'], -1.0)
+        self.assertNotIn('battery', graph)
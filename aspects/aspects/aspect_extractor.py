@@ -1,8 +1,9 @@
 import logging
 from collections import defaultdict
-from typing import List, Sequence, Dict
+from typing import List, Sequence, Dict, Tuple
 
 from aspects.aspects.neural_aspect_extractor_client import NeuralAspectExtractorClient
+from aspects.data_io.edu_cache import EDUCache
 from aspects.enrichments.conceptnets import (
     load_sentic,
     load_conceptnet_io,
@@ -14,6 +15,8 @@ from aspects.utilities import settings
 log = logging.getLogger(__name__)
 
 nlp = common_nlp.load_spacy()
+# components not needed for entities, most of the pipeline time
+NER_DISABLED_PIPES = ["tagger", "parser"]
 
 
 class AspectExtractor:
@@ -24,6 +27,9 @@ class AspectExtractor:
         is_ner=True,
         sentic=None,
         conceptnet=None,
+        ner_batch_size: int = None,
+        ner_n_process: int = None,
+        cache: EDUCache = None,
     ):
         """
         Initialize extractor aspect extractor.
@@ -41,6 +47,17 @@ class AspectExtractor:
 
         is_ner : bool
             Do we want to extract Named Entity as aspects?
+
+        ner_batch_size : int
+            Number of texts processed at once by spacy in batch extraction.
+
+        ner_n_process : int
+            Number of spacy processes in batch extraction, 1 in workers of
+            already parallelized pipelines.
+
+        cache : EDUCache
+            Aspects of EDUs already seen, only texts missing in it are
+            extracted.
         """
         if ner_types is None:
             ner_types = {u"PERSON", u"GPE", u"ORG", u"PRODUCT", u"FAC", u"LOC"}
@@ -67,18 +84,70 @@ class AspectExtractor:
         else:
             self.conceptnet = conceptnet
 
+        self.ner_batch_size = ner_batch_size or settings.NER_BATCH_SIZE
+        self.ner_n_process = ner_n_process or settings.NER_N_PROCESS
+
         self.neural_aspect_extractor_client = NeuralAspectExtractorClient()
+        self.cache = cache
 
     def extract_batch(self, texts: Sequence[str]) -> Sequence[List[str]]:
-        return [self.extract(text) for text in texts]
+        if self.cache is not None:
+            return self.cache.get_or_compute(texts, self._extract_batch)
+        return self._extract_batch(texts)
+
+    def _extract_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        return self.extract_batch_with_neural_aspects(
+            (texts, self.neural_aspect_extractor_client.extract_many(texts))
+        )
 
     def extract(self, text: str) -> List[str]:
-        aspects = self.neural_aspect_extractor_client.extract(text)
+        if self.cache is not None:
+            return self.cache.get_or_compute([text], self._extract_batch)[0]
+        return self.extract_with_neural_aspects(
+            text, self.neural_aspect_extractor_client.extract(text)
+        )
+
+    def extract_batch_with_neural_aspects(
+        self, texts_and_neural_aspects: Tuple[Sequence[str], Sequence[List[str]]]
+    ) -> List[List[str]]:
+        texts, neural_aspects = texts_and_neural_aspects
+        return [
+            self.merge_aspects(aspects, ner_aspects)
+            for aspects, ner_aspects in zip(neural_aspects, self.extract_ner_batch(texts))
+        ]
 
+    def extract_with_neural_aspects(
+        self, text: str, neural_aspects: List[str]
+    ) -> List[str]:
+        """Merge aspects already extracted by the neural aspect extractor service with NER aspects."""
         if self.is_ner:
-            aspects += [
+            ner_aspects = [
                 ent.text for ent in nlp(text).ents if ent.label_ in self.ner_types
             ]
+        else:
+            ner_aspects = []
+        return self.merge_aspects(neural_aspects, ner_aspects)
+
+    def extract_ner_batch(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        NER aspects of many texts with nlp.pipe, without components not needed for entities.
+        """
+        if not self.is_ner:
+            return [[] for _ in texts]
+        return [
+            [ent.text for ent in doc.ents if ent.label_ in self.ner_types]
+            for doc in nlp.pipe(
+                texts,
+                batch_size=self.ner_batch_size,
+                n_process=self.ner_n_process,
+                disable=[pipe for pipe in NER_DISABLED_PIPES if pipe in nlp.pipe_names],
+            )
+        ]
+
+    def merge_aspects(
+        self, neural_aspects: List[str], ner_aspects: List[str]
+    ) -> List[str]:
+        aspects = list(neural_aspects) + list(ner_aspects)
 
         # lower case every aspect and only longer than 1
         return [
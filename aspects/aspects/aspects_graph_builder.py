@@ -2,14 +2,16 @@ import logging
 from collections import OrderedDict
 from itertools import product
 from operator import itemgetter
-from typing import Callable, Union
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 import mlflow
 import networkx as nx
 import pandas as pd
 from tqdm import tqdm
 
+from aspects.aspects.rule_filters import filter_rules_of_documents
 from aspects.embeddings.clusterizer import cluster_embeddings_with_spacy
+from aspects.graph.sparse_graph import SparseAspectGraph
 from aspects.utilities.settings import setup_mlflow
 
 logger = logging.getLogger(__name__)
@@ -22,7 +24,7 @@ class Aspect2AspectGraph:
 
     def build(
         self, discourse_tree_df: pd.DataFrame, filter_relation_fn: Callable = None
-    ):
+    ) -> nx.DiGraph:
         """
         Build aspect(EDU)-aspect(EDU) network based on RST and ConceptNet relation.
 
@@ -35,51 +37,129 @@ class Aspect2AspectGraph:
         Returns
         -------
         graph: networkx.DiGraph
-            Graph with aspect-aspect relations
+            Graph with aspect-aspect relations, see relations_to_graph for
+            edge attributes
 
         """
         log_rules_stats(discourse_tree_df)
         if filter_relation_fn:
-            tqdm.pandas(desc="Rules filtering...")
-            discourse_tree_df.rules = discourse_tree_df.rules.progress_apply(
-                filter_relation_fn
+            discourse_tree_df["rules"] = filter_rules_of_documents(
+                discourse_tree_df.rules.tolist(), filter_relation_fn
             )
             log_rules_stats(discourse_tree_df, "_filtered")
 
         return self.build_aspects_graph(discourse_tree_df)
 
-    def build_aspects_graph(self, discourse_tree_df: pd.DataFrame) -> nx.MultiDiGraph:
-        graph = nx.MultiDiGraph()
-        for _, row in tqdm(
-            discourse_tree_df.iterrows(),
+    def build_from_chunks(
+        self,
+        discourse_tree_dfs: Iterable[pd.DataFrame],
+        filter_relation_fn: Callable = None,
+    ) -> nx.DiGraph:
+        """
+        Build the same graph as build but from data frame chunks, only one chunk is kept in memory.
+        """
+        relations = {}
+        rules_cardinality = []
+        rules_cardinality_filtered = []
+        for discourse_tree_df in discourse_tree_dfs:
+            rules_cardinality.append(discourse_tree_df.rules.apply(len))
+            if filter_relation_fn:
+                discourse_tree_df["rules"] = filter_rules_of_documents(
+                    discourse_tree_df.rules.tolist(), filter_relation_fn
+                )
+                rules_cardinality_filtered.append(discourse_tree_df.rules.apply(len))
+            self.aggregate_relations(discourse_tree_df, relations)
+
+        log_rules_cardinality_stats(pd.concat(rules_cardinality))
+        if filter_relation_fn:
+            log_rules_cardinality_stats(pd.concat(rules_cardinality_filtered), "_filtered")
+        return relations_to_graph(relations)
+
+    def build_aspects_graph(self, discourse_tree_df: pd.DataFrame) -> nx.DiGraph:
+        return relations_to_graph(self.aggregate_relations(discourse_tree_df))
+
+    def aggregate_relations(
+        self, discourse_tree_df: pd.DataFrame, relations: Dict = None
+    ) -> Dict[Tuple[str, str, str], List]:
+        """
+        Number of occurrences and sum of weights of each (aspect, aspect, relation) in rules.
+
+        relations is extended if data frame is a chunk. Relations are kept in one flat dict while
+        scanning instead of a multi-edge per rule occurrence, the dict keeps order of first
+        occurrences hence nodes of the graph are in the same order as if added edge by edge.
+        """
+        if relations is None:
+            relations = {}
+        aspects_to_skip = set(self.aspects_to_skip)
+        for rules, aspects in tqdm(
+            zip(discourse_tree_df.rules.tolist(), discourse_tree_df.aspects.tolist()),
             total=len(discourse_tree_df),
             desc="Generating aspect-aspect graph based on rules",
         ):
-            for edu_left, edu_right, relation, weight in row.rules:
+            for edu_left, edu_right, relation, weight in rules:
                 for aspect_left, aspect_right in product(
-                    row.aspects[edu_left], row.aspects[edu_right]
+                    aspects[edu_left], aspects[edu_right]
                 ):
-                    if not (
-                        aspect_left in self.aspects_to_skip
-                        or aspect_right in self.aspects_to_skip
+                    if (
+                        aspect_left == aspect_right
+                        or aspect_left in aspects_to_skip
+                        or aspect_right in aspects_to_skip
                     ):
-                        graph = self.add_aspects_to_graph(
-                            graph, aspect_left, aspect_right, relation, weight
-                        )
-        return graph
-
-    @staticmethod
-    def add_aspects_to_graph(graph, aspect_left, aspect_right, relation, weight):
-        if aspect_left != aspect_right:
-            logger.debug(f"Add rule: {(aspect_left, aspect_right, relation, weight)}")
+                        continue
+                    count_and_weight = relations.get((aspect_left, aspect_right, relation))
+                    if count_and_weight is None:
+                        relations[(aspect_left, aspect_right, relation)] = [1, weight]
+                    else:
+                        count_and_weight[0] += 1
+                        count_and_weight[1] += weight
+        return relations
+
+
+def relations_to_graph(relations: Dict[Tuple[str, str, str], List]) -> nx.DiGraph:
+    """
+    Weighted aspect-aspect graph, one edge per pair of aspects with attributes:
+
+    weight - sum of weights of all rules between aspects
+    count - number of rules between aspects
+    relation_counts, relation_weights - the same per RST relation
+    """
+    graph = nx.DiGraph()
+    for (aspect_left, aspect_right, relation), (count, weight) in relations.items():
+        if graph.has_edge(aspect_left, aspect_right):
+            edge = graph[aspect_left][aspect_right]
+            edge["weight"] += weight
+            edge["count"] += count
+        else:
             graph.add_edge(
-                aspect_left, aspect_right, relation_type=relation, weight=weight
+                aspect_left,
+                aspect_right,
+                weight=weight,
+                count=count,
+                relation_counts={},
+                relation_weights={},
             )
-        return graph
+            edge = graph[aspect_left][aspect_right]
+        edge["relation_counts"][relation] = count
+        edge["relation_weights"][relation] = weight
+    return graph
+
+
+def calculate_in_degree_centrality(
+    graph: nx.DiGraph, count: str = "count", sparse_graph: SparseAspectGraph = None
+) -> Dict:
+    """
+    In-degree centrality counting every rule between aspects, the same as nx.in_degree_centrality
+    of a graph with an edge per rule occurrence.
+    """
+    sparse_graph = sparse_graph or SparseAspectGraph(graph, count=count)
+    return sparse_graph.to_dict(sparse_graph.in_degree_centrality())
 
 
 def log_rules_stats(discourse_tree_df, suffix: str = ""):
-    rules_cardinality = discourse_tree_df.rules.apply(lambda rs: len(rs))
+    log_rules_cardinality_stats(discourse_tree_df.rules.apply(lambda rs: len(rs)), suffix)
+
+
+def log_rules_cardinality_stats(rules_cardinality: pd.Series, suffix: str = ""):
     assert rules_cardinality.sum() > 0, "No rules to process"
     mlflow.log_params(
         {
@@ -133,6 +213,8 @@ def merge_multiedges(
 def calculate_weighted_page_rank(
     graph: Union[nx.MultiDiGraph, nx.MultiGraph, nx.Graph, nx.DiGraph],
     weight: str = "weight",
+    sparse_graph: SparseAspectGraph = None,
+    start: Dict = None,
 ) -> OrderedDict:
     """
     Calculate Page Rank for ARRG.
@@ -146,6 +228,14 @@ def calculate_weighted_page_rank(
         Name of edge attribute that consists of weight for an edge. it is
         used to calculate Weighted version of Page Rank.
 
+    sparse_graph : SparseAspectGraph, optional
+        Graph already converted to matrices (with the same weight), shared
+        between rankings of the graph.
+
+    start : dict, optional
+        Page Ranks to start power iteration from, e.g. of a previous version
+        of the graph.
+
     Returns
     -------
     page_ranks : OrderedDict
@@ -153,18 +243,24 @@ def calculate_weighted_page_rank(
 
     """
     logger.info("Weighted Page Rank calculation starts.")
-    page_ranks = nx.pagerank_scipy(graph, weight=weight)
+    sparse_graph = sparse_graph or SparseAspectGraph(graph, weight=weight)
+    page_ranks = sparse_graph.to_dict(sparse_graph.pagerank(start=start))
     logger.info("Weighted Page Rank calculation ended.")
     return OrderedDict(sorted(page_ranks.items(), key=itemgetter(1), reverse=True))
 
 
 def calculate_hits(
-    graph: Union[nx.MultiDiGraph, nx.MultiGraph, nx.Graph, nx.DiGraph]
+    graph: Union[nx.MultiDiGraph, nx.MultiGraph, nx.Graph, nx.DiGraph],
+    sparse_graph: SparseAspectGraph = None,
+    start: Dict = None,
 ) -> OrderedDict:
     logger.info("HITS calculation starts.")
-    hubs, authorities = nx.hits_scipy(graph)
+    sparse_graph = sparse_graph or SparseAspectGraph(graph)
+    hubs, authorities = sparse_graph.hits(start=start)
     logger.info("HITS calculation ended.")
-    return OrderedDict(sorted(authorities.items(), key=itemgetter(1), reverse=True))
+    return OrderedDict(
+        sorted(sparse_graph.to_dict(authorities).items(), key=itemgetter(1), reverse=True)
+    )
 
 
 def sort_networkx_attributes(graph_attribs_tuples):
@@ -0,0 +1,94 @@
+import math
+import random
+import time
+import tracemalloc
+from itertools import product
+
+import networkx as nx
+import pandas as pd
+
+from aspects.aspects.aspects_graph_builder import (
+    Aspect2AspectGraph,
+    calculate_in_degree_centrality,
+    merge_multiedges,
+)
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+from aspects.rst.sample_data import RELATIONS
+
+
+def build_multigraph(discourse_tree_df: pd.DataFrame) -> nx.MultiDiGraph:
+    """Reference graph with an edge per rule occurrence, as before aggregation of relations."""
+    graph = nx.MultiDiGraph()
+    for _, row in discourse_tree_df.iterrows():
+        for edu_left, edu_right, relation, weight in row.rules:
+            for aspect_left, aspect_right in product(
+                row.aspects[edu_left], row.aspects[edu_right]
+            ):
+                if aspect_left != aspect_right:
+                    graph.add_edge(aspect_left, aspect_right, relation_type=relation, weight=weight)
+    return graph
+
+
+def random_discourse_trees_df(n_docs: int, n_aspects: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """Rules and aspects of reviews, aspects are Zipf distributed as in real reviews."""
+    rand = random.Random(seed)
+    aspects = [f"aspect {i}" for i in range(n_aspects)]
+    aspects_weights = [1 / (i + 1) for i in range(n_aspects)]
+    rules_of_docs = []
+    aspects_of_docs = []
+    for _ in range(n_docs):
+        n_edus = rand.randint(2, 15)
+        aspects_of_docs.append(
+            [
+                rand.choices(aspects, aspects_weights, k=rand.choice([0, 0, 1, 1, 2]))
+                for _ in range(n_edus)
+            ]
+        )
+        rules_of_docs.append(
+            [
+                EDURelation(
+                    rand.randrange(n_edus),
+                    rand.randrange(n_edus),
+                    rand.choice(RELATIONS).split("[")[0],
+                    round(rand.random(), 2),
+                )
+                for _ in range(n_edus - 1)
+            ]
+        )
+    return pd.DataFrame({"rules": rules_of_docs, "aspects": aspects_of_docs})
+
+
+def measure(fn, *args):
+    """Result, seconds and memory of the result, time is measured without memory tracing."""
+    start = time.perf_counter()
+    fn(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    result = fn(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, size
+
+
+def benchmark(discourse_tree_df: pd.DataFrame):
+    multigraph, seconds, size = measure(build_multigraph, discourse_tree_df)
+    print(
+        f"{'MultiDiGraph edge per rule':30} {seconds:8.2f} s {size / 2 ** 20:10.1f} MiB "
+        f"{multigraph.number_of_edges():10} edges"
+    )
+    graph, seconds, size = measure(Aspect2AspectGraph().build_aspects_graph, discourse_tree_df)
+    print(
+        f"{'aggregated DiGraph':30} {seconds:8.2f} s {size / 2 ** 20:10.1f} MiB "
+        f"{graph.number_of_edges():10} edges"
+    )
+
+    assert list(graph.nodes) == list(multigraph.nodes), "Nodes differ from the multigraph!"
+    assert graph.size(weight="count") == multigraph.number_of_edges()
+    assert calculate_in_degree_centrality(graph) == nx.in_degree_centrality(multigraph)
+    merged = merge_multiedges(graph)
+    for u, v, weight in merge_multiedges(multigraph).edges(data="weight"):
+        assert math.isclose(merged[u][v]["weight"], weight), "Edge weights differ!"
+
+
+if __name__ == "__main__":
+    benchmark(random_discourse_trees_df(50000))
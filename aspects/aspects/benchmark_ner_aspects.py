@@ -0,0 +1,28 @@
+import time
+from typing import List
+
+from aspects.aspects.aspect_extractor import AspectExtractor
+from aspects.rst.sample_data import load_sample_edus
+
+BATCH_SIZES = [32, 256]
+
+
+def benchmark(edus: List[str], batch_sizes: List[int] = None, n_process: int = 1):
+    """EDUs per second of NER aspects, full pipeline per EDU vs nlp.pipe with NER only."""
+    extractor = AspectExtractor()
+
+    start = time.perf_counter()
+    single_aspects = [extractor.extract_with_neural_aspects(edu, []) for edu in edus]
+    print(f"{'nlp per EDU':25} {len(edus) / (time.perf_counter() - start):10.1f} EDUs/s")
+
+    for batch_size in batch_sizes or BATCH_SIZES:
+        extractor = AspectExtractor(ner_batch_size=batch_size, ner_n_process=n_process)
+        start = time.perf_counter()
+        aspects = extractor.extract_batch_with_neural_aspects((edus, [[] for _ in edus]))
+        seconds = time.perf_counter() - start
+        assert aspects == single_aspects, "Batched NER aspects differ from nlp per EDU!"
+        print(f"{f'nlp.pipe batch of {batch_size}':25} {len(edus) / seconds:10.1f} EDUs/s")
+
+
+if __name__ == "__main__":
+    benchmark(load_sample_edus(4096))
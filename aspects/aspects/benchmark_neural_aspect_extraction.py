@@ -0,0 +1,27 @@
+import time
+from typing import List
+
+from aspects.aspects.neural_aspect_extractor_client import NeuralAspectExtractorClient
+from aspects.rst.sample_data import load_sample_edus
+
+BATCH_SIZES = [1, 32, 256]
+
+
+def benchmark(edus: List[str], batch_sizes: List[int] = None):
+    """EDUs per second of the aspect extraction service, it has to be running."""
+    client = NeuralAspectExtractorClient()
+
+    start = time.perf_counter()
+    single_aspects = [client.extract(edu) for edu in edus]
+    print(f"{'one EDU per request':25} {len(edus) / (time.perf_counter() - start):10.1f} EDUs/s")
+
+    for batch_size in batch_sizes or BATCH_SIZES:
+        start = time.perf_counter()
+        aspects = client.extract_many(edus, batch_size=batch_size)
+        seconds = time.perf_counter() - start
+        assert aspects == single_aspects, "Batched aspects differ from one EDU per request!"
+        print(f"{f'batch of {batch_size}':25} {len(edus) / seconds:10.1f} EDUs/s")
+
+
+if __name__ == "__main__":
+    benchmark(load_sample_edus())
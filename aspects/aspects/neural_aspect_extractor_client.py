@@ -1,15 +1,42 @@
+from typing import List, Sequence
+
 import requests
+from more_itertools import chunked
 
-from aspects.utilities.settings import ASPECT_EXTRACTOR_DOCKER_URL
+from aspects.utilities.settings import (
+    ASPECT_EXTRACTOR_BATCH_DOCKER_URL,
+    ASPECT_EXTRACTOR_BATCH_SIZE,
+    ASPECT_EXTRACTOR_DOCKER_URL,
+)
 
 
 class NeuralAspectExtractorClient:
-    def __init__(self, url=None, json_request_key=None, json_response_key=None):
+    def __init__(
+        self,
+        url=None,
+        json_request_key=None,
+        json_response_key=None,
+        batch_url=None,
+        batch_size: int = None,
+    ):
         self.url = url or ASPECT_EXTRACTOR_DOCKER_URL
+        self.batch_url = batch_url or ASPECT_EXTRACTOR_BATCH_DOCKER_URL
+        self.batch_size = batch_size or ASPECT_EXTRACTOR_BATCH_SIZE
         self.json_request_key = json_request_key or "text"
         self.json_response_key = json_response_key or "aspects"
+        # keep-alive connection reused by all requests of this client
+        self.session = requests.Session()
 
     def extract(self, text):
-        return requests.post(self.url, json={self.json_request_key: text}).json()[
+        return self.session.post(self.url, json={self.json_request_key: text}).json()[
             self.json_response_key
         ]
+
+    def extract_many(self, texts: Sequence[str], batch_size: int = None) -> List[List[str]]:
+        """Aspects of texts, batch_size texts are sent in one request and predicted at once."""
+        aspects = []
+        for texts_batch in chunked(texts, batch_size or self.batch_size):
+            response = self.session.post(self.batch_url, json={"texts": texts_batch})
+            response.raise_for_status()
+            aspects.extend(response.json()[self.json_response_key])
+        return aspects
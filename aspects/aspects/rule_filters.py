@@ -1,8 +1,12 @@
 from functools import partial
 from itertools import groupby
 from operator import attrgetter
-from typing import Callable, List
+from typing import Callable, List, Sequence
 
+import numpy as np
+from tqdm import tqdm
+
+from aspects.aspects.rules_table import RulesTable
 from aspects.rst.edu_tree_rules_extractor import EDURelation
 
 
@@ -65,3 +69,110 @@ def filter_top_n_rules(
         return rules_filtered
     else:
         return sorted(rules, key=attrgetter("weight"), reverse=True)[:top_n]
+
+
+# aggregations of repeated rules computed with numpy on rules tables, exactly as the built-ins
+TABLE_AGGREGATIONS = {max: "max", min: "min"}
+
+
+def filter_rules_gerani_table(
+    rules_table: RulesTable, aggregation: str = "max"
+) -> RulesTable:
+    """
+    Vectorized filter_rules_gerani of all documents at once - one rule per document, EDUs and
+    relation type, in the same order.
+
+    aggregation - max or min of weights of repeated rules, the rule with such weight is kept
+    """
+    if aggregation not in TABLE_AGGREGATIONS.values():
+        raise ValueError(f"Aggregation must be one of {list(TABLE_AGGREGATIONS.values())}")
+    weight = -rules_table.weight if aggregation == "max" else rules_table.weight
+    group_key = _lexicographic_key(
+        rules_table.doc_id, rules_table.edu1, rules_table.edu2, rules_table.relation_id
+    )
+    # the first rule of each group has the aggregated weight
+    order = np.argsort(_lexicographic_key(group_key, _dense_rank(weight)), kind="stable")
+    group_key = group_key[order]
+    is_group_start = np.ones(len(group_key), dtype=bool)
+    is_group_start[1:] = group_key[1:] != group_key[:-1]
+    return rules_table.take(order[is_group_start])
+
+
+def filter_top_n_rules_table(
+    rules_table: RulesTable, top_n: int = 1, aggregation: str = "max"
+) -> RulesTable:
+    """
+    Vectorized filter_top_n_rules of all documents at once, top_n rules of max weight for each
+    document (ties in the order of EDUs and relation type).
+    """
+    if top_n is None:
+        return filter_rules_gerani_table(rules_table, aggregation)
+
+    order_key = _lexicographic_key(
+        rules_table.doc_id,
+        _dense_rank(-rules_table.weight),
+        rules_table.edu1,
+        rules_table.edu2,
+        rules_table.relation_id,
+    )
+    rules_table = rules_table.take(np.argsort(order_key, kind="stable"))
+    # rules of a document are contiguous now, rank is the position from the document's first rule
+    rules_per_doc = np.bincount(rules_table.doc_id, minlength=rules_table.n_docs)
+    doc_starts = np.cumsum(rules_per_doc) - rules_per_doc
+    ranks = np.arange(rules_table.n_rules) - doc_starts[rules_table.doc_id]
+    return rules_table.take(np.flatnonzero(ranks < top_n))
+
+
+def _dense_rank(values: np.ndarray) -> np.ndarray:
+    return np.unique(values, return_inverse=True)[1].astype(np.int64)
+
+
+def _lexicographic_key(*columns: np.ndarray) -> np.ndarray:
+    """
+    One int64 key of non-negative int columns with the same order as the columns, sorting by
+    one key is much faster than np.lexsort by all of them.
+    """
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        base = int(column.max()) + 1 if len(column) else 1
+        if (int(key.max()) + 1 if len(key) else 1) * base >= np.iinfo(np.int64).max:
+            # dense ranks of the key so far keep its order with smaller values
+            key = _dense_rank(key)
+        key = key * base + column
+    return key
+
+
+def filter_rules_of_documents(
+    rules_of_documents: Sequence[List[EDURelation]], filter_relation_fn: Callable
+) -> List[List[EDURelation]]:
+    """
+    Rules of each document filtered with filter_relation_fn.
+
+    filter_rules_gerani and filter_top_n_rules (also as partials) with max or min aggregation
+    are run vectorized on a rules table of all documents, other filters document by document.
+    """
+    fn, kwargs = filter_relation_fn, {}
+    if isinstance(filter_relation_fn, partial) and not filter_relation_fn.args:
+        fn, kwargs = filter_relation_fn.func, dict(filter_relation_fn.keywords)
+
+    aggregation_fn = kwargs.pop("aggregation_fn", None)
+    if isinstance(aggregation_fn, partial) and not aggregation_fn.args:
+        aggregation_fn = aggregation_fn.func
+    aggregation = TABLE_AGGREGATIONS.get(aggregation_fn or max)
+
+    rules_table = None
+    if aggregation is not None:
+        if fn is filter_rules_gerani and not kwargs:
+            rules_table = filter_rules_gerani_table(
+                RulesTable.from_rules(rules_of_documents), aggregation
+            )
+        elif fn is filter_top_n_rules and set(kwargs) <= {"top_n"}:
+            rules_table = filter_top_n_rules_table(
+                RulesTable.from_rules(rules_of_documents), aggregation=aggregation, **kwargs
+            )
+    if rules_table is None:
+        return [
+            filter_relation_fn(rules)
+            for rules in tqdm(rules_of_documents, desc="Rules filtering...")
+        ]
+    return rules_table.to_rules()
@@ -0,0 +1,75 @@
+from itertools import islice
+from operator import itemgetter
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+from more_itertools import flatten
+
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+
+
+class RulesTable(NamedTuple):
+    """
+    Rules of all documents of a corpus as flat arrays, one element per rule.
+
+    Relation types are replaced by ids - indices of sorted relation_types, hence ordering by
+    relation_id is the same as ordering by relation type. Filters select rows of the table, rules
+    are the original rule tuples and index points the row's rule, hence no tuples are created
+    again when a filtered table is converted back to rules of documents.
+    """
+
+    doc_id: np.ndarray
+    edu1: np.ndarray
+    edu2: np.ndarray
+    relation_id: np.ndarray
+    weight: np.ndarray
+    index: np.ndarray
+    rules: List[EDURelation]
+    relation_types: List[str]
+    n_docs: int
+
+    @classmethod
+    def from_rules(cls, rules_of_documents: Sequence[List[EDURelation]]) -> "RulesTable":
+        n_docs = len(rules_of_documents)
+        lengths = np.fromiter(map(len, rules_of_documents), dtype=np.int64, count=n_docs)
+        rules = list(flatten(rules_of_documents))
+
+        def column(position: int, dtype) -> np.ndarray:
+            return np.fromiter(map(itemgetter(position), rules), dtype=dtype, count=len(rules))
+
+        relation_id, relation_types = pd.factorize(column(2, object), sort=True)
+        return cls(
+            doc_id=np.repeat(np.arange(n_docs), lengths),
+            edu1=column(0, np.int64),
+            edu2=column(1, np.int64),
+            relation_id=relation_id.astype(np.int64),
+            weight=column(3, float),
+            index=np.arange(len(rules)),
+            rules=rules,
+            relation_types=list(relation_types),
+            n_docs=n_docs,
+        )
+
+    @property
+    def n_rules(self) -> int:
+        return len(self.doc_id)
+
+    def take(self, indices: np.ndarray) -> "RulesTable":
+        """Rows at indices, in their order."""
+        return self._replace(
+            doc_id=self.doc_id[indices],
+            edu1=self.edu1[indices],
+            edu2=self.edu2[indices],
+            relation_id=self.relation_id[indices],
+            weight=self.weight[indices],
+            index=self.index[indices],
+        )
+
+    def to_rules(self) -> List[List[EDURelation]]:
+        """Rules of each document, rows of a document must be contiguous in the table."""
+        rules = iter(map(self.rules.__getitem__, self.index.tolist()))
+        return [
+            list(islice(rules, length))
+            for length in np.bincount(self.doc_id, minlength=self.n_docs).tolist()
+        ]
@@ -128,3 +128,21 @@ def test_keyword_aspect_extraction():
     # check if rake key exists
     is_([True if 'rake' in keywords_obtained.keys() else False])
     assert_that(keywords_obtained['rake'], equal_to(keywords_expected_rake))
+
+
+def test_batch_ner_aspects_same_as_per_text():
+    texts = [
+        u'Angela Merkel is German, merkel is europe!',
+        u'',
+        u'i wonder if you can propose for me better plan and not leave for Sprint',
+        u'Apple in California makes iPhone',
+    ]
+    neural_aspects = [[u'merkel'], [], [u'plan'], [u'iphone']]
+    aspects_extractor = AspectExtractor(ner_batch_size=2)
+    assert_that(
+        aspects_extractor.extract_batch_with_neural_aspects((texts, neural_aspects)),
+        equal_to([
+            aspects_extractor.extract_with_neural_aspects(text, aspects)
+            for text, aspects in zip(texts, neural_aspects)
+        ])
+    )
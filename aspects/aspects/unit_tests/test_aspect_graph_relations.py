@@ -0,0 +1,64 @@
+import networkx as nx
+import pandas as pd
+from hamcrest import assert_that, equal_to
+
+from aspects.aspects.aspects_graph_builder import (
+    Aspect2AspectGraph,
+    calculate_in_degree_centrality,
+)
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+
+
+def _discourse_trees_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "rules": [
+                [
+                    EDURelation(1, 0, "Elaboration", 0.5),
+                    EDURelation(2, 0, "Contrast", 0.25),
+                    EDURelation(2, 1, "Elaboration", 1.0),
+                ],
+                [
+                    EDURelation(1, 0, "Elaboration", 0.75),
+                    EDURelation(0, 0, "Joint", 1.0),
+                    EDURelation(0, 1, "Joint", 1.0),
+                ],
+            ],
+            "aspects": [
+                [["phone"], ["screen", "phone"], ["screen", "battery"]],
+                [["phone"], ["screen"]],
+            ],
+        }
+    )
+
+
+def test_relations_are_aggregated_into_one_edge_per_aspects_pair():
+    graph = Aspect2AspectGraph(aspects_to_skip=["battery"]).build_aspects_graph(
+        _discourse_trees_df()
+    )
+
+    assert_that(list(graph.nodes), equal_to(["screen", "phone"]))
+    assert_that(
+        dict(graph["screen"]["phone"]),
+        equal_to(
+            {
+                "weight": 2.5,
+                "count": 4,
+                "relation_counts": {"Elaboration": 3, "Contrast": 1},
+                "relation_weights": {"Elaboration": 2.25, "Contrast": 0.25},
+            }
+        ),
+    )
+    assert_that(graph["phone"]["screen"]["relation_counts"], equal_to({"Joint": 1}))
+
+
+def test_in_degree_counts_every_rule():
+    graph = Aspect2AspectGraph(aspects_to_skip=["battery"]).build_aspects_graph(
+        _discourse_trees_df()
+    )
+    multigraph = nx.MultiDiGraph()
+    multigraph.add_edges_from([("screen", "phone")] * 4 + [("phone", "screen")])
+
+    assert_that(
+        calculate_in_degree_centrality(graph), equal_to(nx.in_degree_centrality(multigraph))
+    )
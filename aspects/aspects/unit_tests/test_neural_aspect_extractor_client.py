@@ -0,0 +1,39 @@
+from hamcrest import assert_that, equal_to
+
+from aspects.aspects.neural_aspect_extractor_client import NeuralAspectExtractorClient
+
+
+class _Response:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"aspects": [text.split()[:1] for text in self.texts]}
+
+
+class _Session:
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, json):
+        self.requests.append(json["texts"])
+        return _Response(json["texts"])
+
+
+def test_extract_many_sends_batches_and_keeps_order():
+    client = NeuralAspectExtractorClient(batch_size=2)
+    client.session = _Session()
+    texts = ["phone is great", "battery", "", "screen is bright", "camera"]
+
+    assert_that(
+        client.extract_many(texts),
+        equal_to([["phone"], ["battery"], [], ["screen"], ["camera"]]),
+    )
+    assert_that(
+        client.session.requests,
+        equal_to([texts[0:2], texts[2:4], texts[4:]]),
+    )
+    assert_that(client.extract_many([]), equal_to([]))
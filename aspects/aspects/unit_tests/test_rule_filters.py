@@ -1,10 +1,16 @@
+import random
 from functools import partial
 from statistics import mean
 
 import pytest
 from hamcrest import assert_that, equal_to
 
-from aspects.aspects.rule_filters import filter_rules_gerani, filter_top_n_rules
+from aspects.aspects.rule_filters import (
+    filter_rules_gerani,
+    filter_rules_of_documents,
+    filter_top_n_rules,
+)
+from aspects.aspects.rules_table import RulesTable
 from aspects.rst.edu_tree_rules_extractor import EDURelation
 
 
@@ -78,3 +84,45 @@ def test_gerani_rules_filtering_max_for_repeated(rules, aggregation_fn):
 def test_top_n_rules(rules, aggregation_fn, top_n):
     rules_filtered = filter_top_n_rules(_with_rules(), aggregation_fn, top_n)
     assert_that(set(rules_filtered), equal_to(set(rules)))
+
+
+def _rules_of_documents():
+    rand = random.Random(0)
+    return [_with_rules(), []] + [
+        [
+            EDURelation(
+                rand.randrange(4),
+                rand.randrange(4),
+                rand.choice(["Elaboration", "Contrast", "Joint"]),
+                rand.choice([0.25, 0.5, 1.0]),
+            )
+            for _ in range(rand.randrange(10))
+        ]
+        for _ in range(50)
+    ]
+
+
+def test_rules_table_round_trip():
+    rules_of_documents = _rules_of_documents()
+    assert_that(
+        RulesTable.from_rules(rules_of_documents).to_rules(), equal_to(rules_of_documents)
+    )
+
+
+@pytest.mark.parametrize(
+    "filter_relation_fn",
+    [
+        filter_rules_gerani,
+        partial(filter_rules_gerani, aggregation_fn=partial(min)),
+        partial(filter_top_n_rules, top_n=None),
+        partial(filter_top_n_rules, top_n=1),
+        partial(filter_top_n_rules, top_n=5),
+        partial(filter_top_n_rules, aggregation_fn=mean, top_n=2),
+    ],
+)
+def test_rules_of_documents_filtering_is_the_same_as_per_document(filter_relation_fn):
+    rules_of_documents = _rules_of_documents()
+    assert_that(
+        filter_rules_of_documents(rules_of_documents, filter_relation_fn),
+        equal_to([filter_relation_fn(rules) for rules in rules_of_documents]),
+    )
@@ -0,0 +1,91 @@
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import List, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+log = logging.getLogger(__name__)
+
+INDEX_COLUMN = "__index__"
+INDEX_FILE = "_index.parquet"
+# schema metadata of columns which values are kept as pickles
+ENCODING_KEY = b"encoding"
+PICKLE_ENCODING = b"pickle"
+
+
+class ColumnStore:
+    def __init__(self, path: Union[str, Path]):
+        """
+        Columnar checkpoint of a data frame - each column is kept in its own Parquet file.
+
+        Pipeline stages save only columns they added and load only columns they need, instead of
+        re-serializing the whole data frame after every stage. Numbers and texts are stored as
+        Arrow columns, other objects (discourse trees, lists of EDUs, aspects, rules) as pickled
+        binary values, so they are loaded back with the same types.
+
+        path - directory with the column files
+        """
+        self.path = Path(path)
+
+    @property
+    def columns(self) -> List[str]:
+        if not self.path.exists():
+            return []
+        return sorted(
+            column_path.stem
+            for column_path in self.path.glob("*.parquet")
+            if column_path.name != INDEX_FILE
+        )
+
+    def has(self, *columns: str) -> bool:
+        return set(columns).issubset(self.columns)
+
+    def save(self, df: pd.DataFrame, *columns: str):
+        self.path.mkdir(exist_ok=True, parents=True)
+        self._write(pa.table({INDEX_COLUMN: df.index.to_numpy()}), self.path / INDEX_FILE)
+        for column in columns:
+            log.info(f"Column {column} will be saved in {self.path}.")
+            self._write(_column_table(df, column), self._column_path(column))
+
+    def load(self, *columns: str) -> pd.DataFrame:
+        """Load given columns only, data frame with the index only if no columns are given."""
+        index = pq.read_table(self.path / INDEX_FILE).column(INDEX_COLUMN).to_pandas()
+        df = pd.DataFrame(index=pd.Index(index))
+        for column in columns:
+            log.info(f"Column {column} will be loaded from {self.path}.")
+            df[column] = _column_series(pq.read_table(self._column_path(column)), column)
+        return df
+
+    def _column_path(self, column: str) -> Path:
+        return self.path / f"{column}.parquet"
+
+    @staticmethod
+    def _write(table: pa.Table, path: Path):
+        # interrupted run must not leave a broken checkpoint
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        pq.write_table(table, tmp_path.as_posix())
+        os.replace(tmp_path.as_posix(), path.as_posix())
+
+
+def _column_table(df: pd.DataFrame, column: str) -> pa.Table:
+    values = df[column]
+    index = pa.array(df.index.to_numpy())
+    if values.dtype != object or values.map(lambda v: v is None or isinstance(v, str)).all():
+        return pa.table({INDEX_COLUMN: index, column: pa.array(values.to_numpy(), from_pandas=True)})
+    pickled = pa.array([pickle.dumps(value, protocol=4) for value in values], type=pa.binary())
+    return pa.table({INDEX_COLUMN: index, column: pickled}).replace_schema_metadata(
+        {ENCODING_KEY: PICKLE_ENCODING}
+    )
+
+
+def _column_series(table: pa.Table, column: str) -> pd.Series:
+    index = pd.Index(table.column(INDEX_COLUMN).to_pandas())
+    metadata = table.schema.metadata or {}
+    if metadata.get(ENCODING_KEY) == PICKLE_ENCODING:
+        values = [pickle.loads(value) for value in table.column(column).to_pylist()]
+        return pd.Series(values, index=index, dtype=object)
+    return pd.Series(table.column(column).to_pandas().to_numpy(), index=index)
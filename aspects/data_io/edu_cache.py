@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import pickle
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+from more_itertools import chunked
+
+from aspects.rst.parse_cache import SQLITE_MAX_VARIABLES, normalize_text
+from aspects.utilities import settings
+
+
+class EDUCache:
+    def __init__(
+        self,
+        stage: str,
+        model_version: str,
+        path: Union[str, Path] = None,
+        max_size: int = None,
+    ):
+        """
+        Memoization of EDU-level results (sentiment, aspects) shared between experiments and datasets.
+
+        Short EDUs ("works great", "love it") repeat massively across reviews, hence each distinct
+        EDU is computed only once. Results are kept in a size-bounded in-memory LRU in front of a
+        SQLite database, under the hash of stage, model version and normalized EDU text.
+
+        stage - name of the pipeline stage, e.g. sentiment or aspects
+        model_version - changing it invalidates all previously cached results of the stage
+        path - SQLite database file
+        max_size - max number of results kept in memory
+        """
+        self.stage = stage
+        self.model_version = model_version
+        self.path = Path(path or settings.EDU_CACHE_PATH)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self.max_size = max_size or settings.EDU_CACHE_MAX_SIZE
+        self._memory: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS edu_results (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path.as_posix(), timeout=60)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / ((self.hits + self.misses) or 1)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self.stage}\n{self.model_version}\n{normalize_text(text)}".encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        values = {key: self._memory[key] for key in set(keys) if key in self._memory}
+        for key in values:
+            self._memory.move_to_end(key)
+
+        missing = [key for key in set(keys) if key not in values]
+        if missing:
+            with closing(self._connect()) as connection, connection:
+                for keys_chunk in chunked(missing, SQLITE_MAX_VARIABLES):
+                    rows = connection.execute(
+                        f"SELECT key, value FROM edu_results WHERE key IN ({','.join('?' * len(keys_chunk))})",
+                        keys_chunk,
+                    ).fetchall()
+                    stored = {key: pickle.loads(value) for key, value in rows}
+                    self._remember(stored)
+                    values.update(stored)
+        return values
+
+    def put_many(self, values: Dict[str, Any]):
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO edu_results (key, value) VALUES (?, ?)",
+                ((key, pickle.dumps(value, protocol=4)) for key, value in values.items()),
+            )
+        self._remember(values)
+
+    def _remember(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get_or_compute(
+        self, texts: Sequence[str], compute_fn: Callable[[List[str]], List]
+    ) -> List:
+        """
+        Results of texts, only distinct texts missing in cache are computed with compute_fn.
+        """
+        keys = [self.key(text) for text in texts]
+        values = self.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in values:
+                missing.setdefault(key, text)
+
+        n_hits = sum(key in values for key in keys)
+        self.hits += n_hits
+        self.misses += len(keys) - n_hits
+        logging.info(
+            f"EDU cache of {self.stage}: {n_hits} EDUs cached, {len(missing)} to compute."
+        )
+
+        if missing:
+            computed = dict(zip(missing.keys(), compute_fn(list(missing.values()))))
+            self.put_many(computed)
+            values.update(computed)
+
+        return [values[key] for key in keys]
@@ -2,7 +2,7 @@ import gzip
 import json
 import pickle
 from collections import defaultdict
-from typing import Set
+from typing import Iterator, Set
 
 import pandas as pd
 import srsly
@@ -18,6 +18,58 @@ def parse_gzip(path):
             yield eval(line)
 
 
+def iter_json_object_values(path, block_size: int = 2 ** 20) -> Iterator:
+    """
+    Values of top-level JSON object, as json.load(f).values() but the file is read in blocks, hence
+    only one block and one value are kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    start, key, colon, value, separator = range(5)
+    state = start
+    buffer, position = "", 0
+    with open(path, "r") as json_file:
+        while True:
+            block = json_file.read(block_size)
+            eof = not block
+            buffer, position = buffer[position:] + block, 0
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position == len(buffer):
+                    break
+                char = buffer[position]
+                if state == start and char == "{":
+                    state, position = key, position + 1
+                elif state == key and char == "}":
+                    return
+                elif state in (key, value):
+                    try:
+                        element, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        break
+                    # number at the end of block could be cut in the middle, e.g. 12.5 as 12. and 5
+                    if not eof and (end == len(buffer) or buffer[end] in ".eE+-0123456789"):
+                        break
+                    position = end
+                    if state == key:
+                        state = colon
+                    else:
+                        yield element
+                        state = separator
+                elif state == colon and char == ":":
+                    state, position = value, position + 1
+                elif state == separator and char == ",":
+                    state, position = key, position + 1
+                elif state == separator and char == "}":
+                    return
+                else:
+                    raise ValueError(f"Unexpected {char!r} at {position} of block in {path}")
+            if eof:
+                raise ValueError(f"Unexpected end of {path}")
+
+
 def amazon_dataset_to_spacy_pretrain(dataset_path):
     with open(dataset_path, "r") as f:
         reviews = [{"text": text} for text in tqdm(json.load(f).values())]
@@ -0,0 +1,51 @@
+from hamcrest import assert_that, equal_to
+import pandas as pd
+from nltk import Tree
+
+from aspects.data_io.column_store import ColumnStore
+from aspects.rst.compact_tree import CompactDiscourseTree
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+
+
+def _df() -> pd.DataFrame:
+    # index with gaps as after dropping documents with parsing errors
+    return pd.DataFrame(
+        {
+            "text": ["Great phone. Bad battery.", "Nice screen."],
+            "discourse_tree": [
+                CompactDiscourseTree.from_tree(Tree("Contrast[N][N]", [0, 1])),
+                CompactDiscourseTree.from_tree(Tree("span", [0])),
+            ],
+            "aspects": [[["phone"], ["battery"]], [["screen"]]],
+            "rules": [[EDURelation(0, 1, "Contrast", 0.5)], []],
+            "n_edus": [2, 1],
+        },
+        index=[0, 3],
+    )
+
+
+def test_columns_round_trip_with_types(tmp_path):
+    df = _df()
+    store = ColumnStore(tmp_path / "discourse_trees_df")
+    store.save(df, *df.columns)
+
+    loaded = store.load(*df.columns)
+    assert_that(loaded.index.tolist(), equal_to([0, 3]))
+    for column in df.columns:
+        assert_that(loaded[column].tolist(), equal_to(df[column].tolist()))
+    assert_that(type(loaded.rules[0][0]), equal_to(EDURelation))
+
+
+def test_only_saved_columns_are_written_and_loaded(tmp_path):
+    df = _df()
+    store = ColumnStore(tmp_path / "discourse_trees_df")
+    assert_that(store.has("text"), equal_to(False))
+
+    store.save(df, "text", "discourse_tree")
+    assert_that(store.columns, equal_to(["discourse_tree", "text"]))
+    assert_that(store.has("text", "aspects"), equal_to(False))
+
+    store.save(df, "aspects")
+    assert_that(store.has("text", "aspects"), equal_to(True))
+    assert_that(store.load().columns.tolist(), equal_to([]))
+    assert_that(store.load("aspects").columns.tolist(), equal_to(["aspects"]))
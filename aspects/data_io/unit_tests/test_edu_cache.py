@@ -0,0 +1,54 @@
+from hamcrest import assert_that, close_to, equal_to
+
+from aspects.data_io.edu_cache import EDUCache
+
+
+class _Model:
+    def __init__(self):
+        self.computed = []
+
+    def predict(self, texts):
+        self.computed.extend(texts)
+        return [[text.split()[0]] for text in texts]
+
+
+def test_only_distinct_missing_edus_are_computed(tmp_path):
+    model = _Model()
+    cache = EDUCache("aspects", "v1", tmp_path / "cache.sqlite")
+
+    aspects = cache.get_or_compute(["love it", "works great", "love  it "], model.predict)
+    assert_that(aspects, equal_to([["love"], ["works"], ["love"]]))
+    assert_that(model.computed, equal_to(["love it", "works great"]))
+    assert_that((cache.hits, cache.misses), equal_to((0, 3)))
+
+    # new cache object, e.g. another run or dataset, shares the database
+    cache = EDUCache("aspects", "v1", tmp_path / "cache.sqlite")
+    aspects = cache.get_or_compute(["works great", "returned it"], model.predict)
+    assert_that(aspects, equal_to([["works"], ["returned"]]))
+    assert_that(model.computed[2:], equal_to(["returned it"]))
+    assert_that(cache.hit_rate, close_to(0.5, 1e-9))
+
+
+def test_stage_and_model_version_separate_results(tmp_path):
+    model = _Model()
+    EDUCache("aspects", "v1", tmp_path / "cache.sqlite").get_or_compute(["love it"], model.predict)
+    EDUCache("aspects", "v2", tmp_path / "cache.sqlite").get_or_compute(["love it"], model.predict)
+    EDUCache("sentiment", "v1", tmp_path / "cache.sqlite").get_or_compute(
+        ["love it"], model.predict
+    )
+    assert_that(model.computed, equal_to(["love it"] * 3))
+
+
+def test_memory_is_bounded_to_recently_used(tmp_path):
+    model = _Model()
+    cache = EDUCache("aspects", "v1", tmp_path / "cache.sqlite", max_size=2)
+    cache.get_or_compute(["a 1", "b 2"], model.predict)
+    cache.get_or_compute(["a 1"], model.predict)
+    cache.get_or_compute(["c 3"], model.predict)
+
+    assert_that(
+        list(cache._memory), equal_to([cache.key("a 1"), cache.key("c 3")])
+    )
+    # evicted results are still read from disk
+    assert_that(cache.get_or_compute(["b 2"], model.predict), equal_to([["b"]]))
+    assert_that(model.computed, equal_to(["a 1", "b 2", "c 3"]))
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from aspects.data_io.parsers import iter_json_object_values
+
+REVIEWS = {
+    "0": "Great phone, {battery} is \"ok\".",
+    "1": "",
+    "2": 12.5e3,
+    "3": ["nested", {"}": ","}],
+    "4": None,
+}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("block_size", [1, 3, 7, 2 ** 20])
+def test_values_same_as_json_load(tmp_path, indent, block_size):
+    path = tmp_path / "reviews.json"
+    path.write_text(json.dumps(REVIEWS, indent=indent))
+    assert_that(
+        list(iter_json_object_values(path, block_size=block_size)),
+        equal_to(list(REVIEWS.values())),
+    )
+
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / "reviews.json"
+    path.write_text(json.dumps(REVIEWS)[:-10])
+    with pytest.raises(ValueError):
+        list(iter_json_object_values(path, block_size=4))
@@ -2,7 +2,6 @@ import logging
 from itertools import product
 from typing import NamedTuple
 
-import pandas as pd
 from gensim.models.poincare import PoincareModel
 from tqdm import tqdm
 
@@ -28,7 +27,7 @@ aspect_analysis_gerani = AspectAnalysis(
     max_docs=50000
 )
 
-discourse_tree_df = pd.read_pickle(aspect_analysis_gerani.paths.discourse_trees_df)
+discourse_tree_df = aspect_analysis_gerani.discourse_trees_store.load('rules', 'aspects')
 
 relations = []
 
@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+from concurrent.futures.process import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Sequence, Union
+
+import mlflow
+import pandas as pd
+
+from aspects.experiments import experiment_name_enum
+from aspects.pipelines.aspect_analysis import AspectAnalysis
+
+
+class Experiment(NamedTuple):
+    name: str
+    run_id: str
+    aspect_analysis_kwargs: Dict
+    use_aspect_clustering: bool = False
+
+
+def run_pipeline(
+    aspect_analysis: AspectAnalysis,
+    experiment_name: str,
+    use_aspect_clustering: bool = False,
+    discourse_trees_df: pd.DataFrame = None,
+):
+    if experiment_name == experiment_name_enum.OUR_ALL_RULES:
+        aspect_analysis.our_pipeline(
+            use_aspect_clustering=use_aspect_clustering,
+            discourse_trees_df=discourse_trees_df,
+        )
+    elif experiment_name == experiment_name_enum.GERANI:
+        aspect_analysis.gerani_pipeline(discourse_trees_df=discourse_trees_df)
+    elif experiment_name == experiment_name_enum.OUR_TOP_1_RULES:
+        aspect_analysis.our_pipeline_top_n_rules_per_discourse_tree(
+            top_n=1,
+            use_aspect_clustering=use_aspect_clustering,
+            discourse_trees_df=discourse_trees_df,
+        )
+    elif experiment_name == experiment_name_enum.OUR_TOP_5_RULES:
+        aspect_analysis.our_pipeline_top_n_rules_per_discourse_tree(
+            top_n=5,
+            use_aspect_clustering=use_aspect_clustering,
+            discourse_trees_df=discourse_trees_df,
+        )
+    else:
+        raise Exception("Wrong experiment type")
+
+
+# corpus shared by experiments of the current process, set by init_worker (ProcessPoolExecutor
+# initializer) - forked workers get it copy-on-write instead of unpickling a copy each
+_discourse_trees_df: pd.DataFrame = None
+
+
+def init_worker(discourse_trees_df: pd.DataFrame = None):
+    global _discourse_trees_df
+    _discourse_trees_df = discourse_trees_df
+
+
+def run_experiment(experiment: Experiment) -> str:
+    """Experiment on the shared corpus, logged to its own (already created) mlflow run."""
+    with mlflow.start_run(run_id=experiment.run_id, nested=True):
+        aspect_analysis = AspectAnalysis(
+            experiment_name=experiment.name, **experiment.aspect_analysis_kwargs
+        )
+        run_pipeline(
+            aspect_analysis,
+            experiment.name,
+            experiment.use_aspect_clustering,
+            _discourse_trees_df,
+        )
+    return experiment.name
+
+
+def run_experiments(
+    experiment_names: Sequence[str],
+    aspect_analysis_kwargs: Dict,
+    experiment_id: Union[str, int] = None,
+    use_aspect_clustering: bool = False,
+    jobs: int = None,
+) -> List[str]:
+    """
+    Experiments on one corpus, run concurrently in forked processes.
+
+    Documents are parsed and their rules, aspects and sentiment extracted (or loaded from the
+    checkpoint) once, only graph building and AHT generation run per experiment. The corpus
+    stages are logged to a corpus run and every experiment to its own run, all nested in the
+    active mlflow run, hence parameters of AspectAnalysis do not clash with the active run ones.
+
+    aspect_analysis_kwargs - AspectAnalysis arguments except experiment_name
+    jobs - number of experiments run at once, all of them by default
+    """
+    if not experiment_names:
+        return []
+
+    with mlflow.start_run(experiment_id=experiment_id, run_name="corpus", nested=True):
+        corpus_analysis = AspectAnalysis(**aspect_analysis_kwargs)
+        if corpus_analysis.chunk_size is None:
+            discourse_trees_df = corpus_analysis.extract_discourse_trees_df()
+        else:
+            # streaming mode, experiments read chunks checkpointed once here
+            corpus_analysis.extract_discourse_trees_in_chunks()
+            discourse_trees_df = None
+
+    experiments = []
+    for experiment_name in experiment_names:
+        # runs are created here, hence nested in the active run of this process
+        with mlflow.start_run(
+            experiment_id=experiment_id, run_name=f"{experiment_name}", nested=True
+        ) as experiment_subflow:
+            experiments.append(
+                Experiment(
+                    experiment_name,
+                    experiment_subflow.info.run_id,
+                    aspect_analysis_kwargs,
+                    use_aspect_clustering,
+                )
+            )
+
+    logging.info(f"Experiments {experiment_names} running concurrently.")
+    with ProcessPoolExecutor(
+        min(jobs or len(experiments), len(experiments)),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=init_worker,
+        initargs=(discourse_trees_df,),
+    ) as pool:
+        return list(pool.map(run_experiment, experiments))
@@ -7,7 +7,7 @@ import seaborn as sns
 from tqdm import tqdm
 
 from aspects.experiments import experiment_name_enum
-from aspects.pipelines.aspect_analysis import AspectAnalysis
+from aspects.experiments.experiments_runner import run_experiments
 from aspects.utilities import settings
 from aspects.utilities.settings import setup_mlflow
 
@@ -51,12 +51,19 @@ USE_ASPECT_CLUSTERING = False
     "--alpha_coefficient", default=0.5, help="Alpha coefficient for moi calculation"
 )
 @click.option("--experiment-id", default=8, help="name of experiment for mlflow")
+@click.option(
+    "--n-experiment-jobs",
+    default=None,
+    type=int,
+    help="Number of experiments run concurrently on the dataset, all of them by default.",
+)
 def main(
     n_jobs: int,
     batch_size: int,
     aht_max_number_of_nodes: int,
     alpha_coefficient: float,
     experiment_id: Union[str, int],
+    n_experiment_jobs: int,
 ):
     for dataset_path, max_reviews in tqdm(
         DATASETS, desc="Amazon datasets processing..."
@@ -64,40 +71,21 @@ def main(
         with mlflow.start_run(
             experiment_id=experiment_id, run_name=f"{dataset_path.stem}-{max_reviews}"
         ) as dataset_flow:
-            for experiment_name in EXPERIMENTS:
-                with mlflow.start_run(
-                    experiment_id=experiment_id,
-                    run_name=f"{experiment_name}",
-                    nested=True,
-                ) as experiment_subflow:
-
-                    aspect_analysis = AspectAnalysis(
-                        input_path=dataset_path.as_posix(),
-                        output_path=settings.DEFAULT_OUTPUT_PATH / dataset_path.stem,
-                        experiment_name=experiment_name,
-                        jobs=n_jobs,
-                        batch_size=batch_size,
-                        max_docs=max_reviews,
-                        aht_max_number_of_nodes=aht_max_number_of_nodes,
-                        alpha_coefficient=alpha_coefficient,
-                    )
-
-                    if experiment_name == experiment_name_enum.OUR_ALL_RULES:
-                        aspect_analysis.our_pipeline(
-                            use_aspect_clustering=USE_ASPECT_CLUSTERING
-                        )
-                    elif experiment_name == experiment_name_enum.GERANI:
-                        aspect_analysis.gerani_pipeline()
-                    elif experiment_name == experiment_name_enum.OUR_TOP_1_RULES:
-                        aspect_analysis.our_pipeline_top_n_rules_per_discourse_tree(
-                            top_n=1, use_aspect_clustering=USE_ASPECT_CLUSTERING
-                        )
-                    elif experiment_name == experiment_name_enum.OUR_TOP_5_RULES:
-                        aspect_analysis.our_pipeline_top_n_rules_per_discourse_tree(
-                            top_n=5, use_aspect_clustering=USE_ASPECT_CLUSTERING
-                        )
-                    else:
-                        raise Exception("Wrong experiment type")
+            run_experiments(
+                EXPERIMENTS,
+                dict(
+                    input_path=dataset_path.as_posix(),
+                    output_path=settings.DEFAULT_OUTPUT_PATH / dataset_path.stem,
+                    jobs=n_jobs,
+                    batch_size=batch_size,
+                    max_docs=max_reviews,
+                    aht_max_number_of_nodes=aht_max_number_of_nodes,
+                    alpha_coefficient=alpha_coefficient,
+                ),
+                experiment_id=experiment_id,
+                use_aspect_clustering=USE_ASPECT_CLUSTERING,
+                jobs=n_experiment_jobs,
+            )
 
             mlflow.log_param("dataset_path", dataset_path)
             mlflow.log_param("dataset_name", dataset_path.stem)
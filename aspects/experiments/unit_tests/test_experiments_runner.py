@@ -0,0 +1,68 @@
+import mlflow
+import pandas as pd
+import pytest
+from hamcrest import assert_that, contains_inanyorder, equal_to, has_entries
+
+from aspects.experiments import experiment_name_enum, experiments_runner
+from aspects.experiments.experiments_runner import run_experiments
+
+DISCOURSE_TREES_DF = pd.DataFrame({"text": ["good phone", "nice screen"]})
+
+
+class _AspectAnalysis:
+    """Stub pipeline logging what it gets to the active run."""
+
+    def __init__(self, experiment_name: str = None, jobs: int = None, chunk_size: int = None):
+        self.chunk_size = chunk_size
+        # as AspectAnalysis, the resolved number of jobs differs from the argument
+        mlflow.log_param("n_jobs", 7 if jobs == -1 else jobs)
+
+    def extract_discourse_trees_df(self) -> pd.DataFrame:
+        mlflow.log_metric("rst_parse_cache_hits", len(DISCOURSE_TREES_DF))
+        return DISCOURSE_TREES_DF
+
+    def gerani_pipeline(self, discourse_trees_df: pd.DataFrame = None):
+        self._log_corpus(discourse_trees_df)
+
+    def our_pipeline(self, use_aspect_clustering: bool = False, discourse_trees_df: pd.DataFrame = None):
+        self._log_corpus(discourse_trees_df)
+
+    @staticmethod
+    def _log_corpus(discourse_trees_df: pd.DataFrame):
+        # forked workers share the frame, hence it has the same id as in the parent process
+        mlflow.log_param("discourse_trees_df_id", id(discourse_trees_df))
+
+
+@pytest.fixture
+def experiment_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(experiments_runner, "AspectAnalysis", _AspectAnalysis)
+    tracking_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    yield mlflow.create_experiment("experiments")
+    mlflow.set_tracking_uri(tracking_uri)
+
+
+def test_experiments_share_corpus_and_have_own_runs(experiment_id):
+    experiment_names = [experiment_name_enum.GERANI, experiment_name_enum.OUR_ALL_RULES]
+    with mlflow.start_run(experiment_id=experiment_id) as dataset_run:
+        assert_that(
+            run_experiments(experiment_names, dict(jobs=-1), experiment_id=experiment_id),
+            equal_to(experiment_names),
+        )
+        # as generate_summaries, the raw argument is logged to the dataset run
+        mlflow.log_param("n_jobs", -1)
+
+    runs = mlflow.search_runs(
+        [experiment_id],
+        filter_string=f"tags.mlflow.parentRunId = '{dataset_run.info.run_id}'",
+        output_format="list",
+    )
+    runs = {run.info.run_name: run.data for run in runs}
+    assert_that(runs.keys(), contains_inanyorder("corpus", *experiment_names))
+    assert_that(runs["corpus"].metrics, has_entries(rst_parse_cache_hits=2))
+    for experiment_name in experiment_names:
+        assert_that(
+            runs[experiment_name].params,
+            has_entries(n_jobs="7", discourse_trees_df_id=str(id(DISCOURSE_TREES_DF))),
+        )
+        assert_that(runs[experiment_name].metrics, equal_to({}))
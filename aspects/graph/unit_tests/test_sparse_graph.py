@@ -0,0 +1,62 @@
+import networkx as nx
+import numpy as np
+from hamcrest import assert_that, close_to, equal_to
+
+from aspects.graph.sparse_graph import SparseAspectGraph
+
+
+def _multigraph() -> nx.MultiDiGraph:
+    graph = nx.MultiDiGraph()
+    graph.add_edge("phone", "screen", weight=0.5)
+    graph.add_edge("phone", "screen", weight=0.25)
+    graph.add_edge("screen", "phone", weight=1.0)
+    graph.add_edge("battery", "phone", weight=0.75)
+    graph.add_edge("screen", "price", weight=0.5)
+    graph.add_node("camera")
+    return graph
+
+
+def _assert_rankings_equal(ranking, expected, tolerance=1e-6):
+    assert_that(set(ranking), equal_to(set(expected)))
+    for node, value in expected.items():
+        assert_that(ranking[node], close_to(value, tolerance))
+
+
+def test_pagerank_of_parallel_edges_is_the_same_as_networkx():
+    graph = _multigraph()
+    sparse_graph = SparseAspectGraph(graph)
+
+    _assert_rankings_equal(
+        sparse_graph.to_dict(sparse_graph.pagerank()), nx.pagerank(graph, weight="weight")
+    )
+
+
+def test_pagerank_from_start_converges_to_the_same_ranking():
+    sparse_graph = SparseAspectGraph(_multigraph())
+    page_ranks = sparse_graph.pagerank()
+
+    warm_page_ranks = sparse_graph.pagerank(start=sparse_graph.to_dict(page_ranks))
+
+    assert_that(np.allclose(warm_page_ranks, page_ranks, atol=1e-6), equal_to(True))
+
+
+def test_hits_authorities_are_the_same_as_networkx():
+    graph = nx.DiGraph(_multigraph())
+    sparse_graph = SparseAspectGraph(graph)
+
+    hubs, authorities = sparse_graph.hits(tol=1e-10)
+
+    _assert_rankings_equal(sparse_graph.to_dict(authorities), nx.hits(graph, tol=1e-10)[1])
+
+
+def test_in_degree_centrality_counts_aggregated_rules():
+    graph = nx.DiGraph()
+    graph.add_edge("phone", "screen", count=2)
+    graph.add_edge("screen", "phone", count=1)
+    graph.add_node("price")
+    sparse_graph = SparseAspectGraph(graph)
+
+    assert_that(
+        sparse_graph.to_dict(sparse_graph.in_degree_centrality()),
+        equal_to({"phone": 0.5, "screen": 1.0, "price": 0.0}),
+    )
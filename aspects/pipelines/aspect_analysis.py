@@ -1,21 +1,25 @@
 import json
 import logging
 import multiprocessing
-from collections import Counter
+from collections import Counter, defaultdict
 from concurrent.futures.process import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from functools import partial
+from itertools import islice
 from os.path import basename
 from pathlib import Path
-from typing import Callable, List, Sequence, Union
+from typing import Callable, Iterator, List, Sequence, Union
 
 import mlflow
 import networkx as nx
 import pandas as pd
-from more_itertools import flatten
+from more_itertools import chunked, flatten
 from tqdm import tqdm
 
 from aspects.analysis.gerani_graph_analysis import (
+    add_aspect_sentiments_to_graph,
+    collect_aspect_sentiments,
     extend_graph_nodes_with_sentiments_and_weights,
     gerani_paper_arrg_to_aht,
     our_paper_arrg_to_aht,
@@ -27,13 +31,20 @@ from aspects.aspects.aspects_graph_builder import (
     sort_networkx_attributes,
 )
 from aspects.data_io import serializer
+from aspects.data_io.column_store import ColumnStore
+from aspects.data_io.edu_cache import EDUCache
+from aspects.data_io.parsers import iter_json_object_values
+from aspects.pipelines import async_services, document_worker
+from aspects.rst.compact_tree import CompactDiscourseTree
 from aspects.rst.extractors import (
-    extract_discourse_tree,
     extract_discourse_tree_with_ids_only,
+    extract_discourse_trees,
     extract_rules,
 )
+from aspects.rst.parse_cache import RSTParseCache
+from aspects.sentiment.sentiment_client import BiLSTMModel
 from aspects.sentiment.simple_textblob import analyze
-from aspects.utilities import pandas_utils
+from aspects.utilities import pandas_utils, settings
 from aspects.utilities.data_paths import ExperimentPaths
 from aspects.utilities.settings import setup_mlflow
 from aspects.visualization.drawing import draw_tree
@@ -82,6 +93,13 @@ class AspectAnalysis:
         alpha_coefficient: float = 0.5,
         aht_max_number_of_nodes: int = 50,
         min_freq_of_aspects: int = 1,
+        async_services: bool = False,
+        max_in_flight_requests: int = None,
+        sentiment_model: str = "textblob",
+        rst_parse_cache: bool = True,
+        chunk_size: int = None,
+        fused_document_workers: bool = False,
+        edu_cache: bool = True,
     ):
         self.max_docs = max_docs
         mlflow.log_param("max_docs", max_docs)
@@ -94,6 +112,7 @@ class AspectAnalysis:
             self.output_path = output_path
         self.experiment_name = experiment_name
         self.paths = ExperimentPaths(input_path, self.output_path, experiment_name)
+        self.discourse_trees_store = ColumnStore(self.paths.discourse_trees_columns)
         self.sent_model_path = sent_model_path
         mlflow.log_param("sent_model_path", sent_model_path)
 
@@ -111,6 +130,43 @@ class AspectAnalysis:
         self.min_freq_of_aspects = min_freq_of_aspects
         mlflow.log_param("min_freq_of_aspects", min_freq_of_aspects)
 
+        # service-backed stages (discourse trees, neural aspects, bilstm sentiment) run as asyncio
+        # requests instead of process pools
+        self.async_services = async_services
+        mlflow.log_param("async_services", async_services)
+        self.max_in_flight_requests = max_in_flight_requests
+        mlflow.log_param("max_in_flight_requests", max_in_flight_requests)
+        assert sentiment_model in ["textblob", "bilstm"], "Sentiment model must be textblob or bilstm"
+        self.sentiment_model = sentiment_model
+        mlflow.log_param("sentiment_model", sentiment_model)
+        # parse trees shared between datasets and runs, see settings.RST_PARSE_CACHE_PATH
+        self.rst_parse_cache = rst_parse_cache
+        mlflow.log_param("rst_parse_cache", rst_parse_cache)
+        # streaming mode for datasets larger than RAM - documents are read and processed in chunks
+        # and the graph is built incrementally
+        self.chunk_size = chunk_size
+        mlflow.log_param("chunk_size", chunk_size)
+        # one pass of long-lived workers per document (EDU ids, sentiment, aspects and rules)
+        # instead of a process pool per stage, service-backed stages use synchronous clients then
+        self.fused_document_workers = fused_document_workers
+        mlflow.log_param("fused_document_workers", fused_document_workers)
+        # sentiment and aspects of distinct EDUs shared between datasets and runs, see
+        # settings.EDU_CACHE_PATH
+        if edu_cache and fused_document_workers:
+            # fused workers compute sentiment and aspects per document, not per distinct EDU
+            logging.warning("EDU cache is not used by fused document workers, it is disabled.")
+            edu_cache = False
+        self.edu_cache = edu_cache
+        mlflow.log_param("edu_cache", edu_cache)
+        self.sentiment_cache = (
+            EDUCache("sentiment", settings.SENTIMENT_MODEL_VERSIONS[sentiment_model])
+            if edu_cache
+            else None
+        )
+        self.aspects_cache = (
+            EDUCache("aspects", settings.ASPECT_EXTRACTOR_VERSION) if edu_cache else None
+        )
+
     def parallelized_extraction(
         self, elements: Sequence, fn: Callable, desc: str = "Running in parallel"
     ) -> List:
@@ -123,57 +179,208 @@ class AspectAnalysis:
                 )
             )
 
+    def extract_for_edus(
+        self,
+        edus_of_documents: List[List[str]],
+        extract_fn: Callable[[List[List[str]]], List[List]],
+        cache: EDUCache = None,
+    ) -> List[List]:
+        """
+        Values of EDUs of documents extracted with extract_fn (list of EDUs per document).
+
+        With cache, only distinct EDUs missing in it are extracted, in batches of
+        settings.EDU_CACHE_BATCH_SIZE EDUs in place of documents.
+        """
+        if cache is None:
+            return extract_fn(edus_of_documents)
+        values = cache.get_or_compute(
+            list(flatten(edus_of_documents)),
+            lambda edus: list(
+                flatten(extract_fn(list(chunked(edus, settings.EDU_CACHE_BATCH_SIZE))))
+            ),
+        )
+        mlflow.log_metric(f"{cache.stage}_cache_hits", cache.hits)
+        mlflow.log_metric(f"{cache.stage}_cache_misses", cache.misses)
+        mlflow.log_metric(f"{cache.stage}_cache_hit_rate", cache.hit_rate)
+        return split_by_lengths(values, [len(edus) for edus in edus_of_documents])
+
+    def document_workers_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            self.jobs,
+            initializer=document_worker.init_worker,
+            initargs=(self.sentiment_model,),
+        )
+
+    def extract_document_features(
+        self,
+        df: pd.DataFrame,
+        store: ColumnStore = None,
+        pool: ProcessPoolExecutor = None,
+    ) -> pd.DataFrame:
+        """EDU ids, sentiment, aspects and rules of discourse trees."""
+        if self.fused_document_workers:
+            return self.process_documents(df, store=store, pool=pool)
+        return (
+            df.pipe(self.extract_discourse_trees_ids_only, store=store)
+            .pipe(self.extract_sentiment, store=store)
+            .pipe(self.extract_aspects, store=store)
+            .pipe(self.extract_edu_rhetorical_rules, store=store)
+        )
+
+    def process_documents(
+        self,
+        df: pd.DataFrame,
+        store: ColumnStore = None,
+        pool: ProcessPoolExecutor = None,
+    ) -> pd.DataFrame:
+        """
+        Fused per-document stages - each tree is sent to a worker once and one record is returned.
+
+        pool - pool of document workers reused between chunks, a new one is created if None
+        """
+        columns = document_worker.DocumentRecord._fields
+        if self.has_columns(df, *columns, store=store):
+            return df
+
+        df = self.with_columns(df, "discourse_tree", store=store)
+        with nullcontext(pool) if pool is not None else self.document_workers_pool() as pool:
+            records = list(
+                tqdm(
+                    pool.map(
+                        document_worker.process_document,
+                        df.discourse_tree.tolist(),
+                        chunksize=self.batch_size or 1,
+                    ),
+                    total=len(df),
+                    desc="Documents processing",
+                )
+            )
+        for column, values in zip(columns, zip(*records)):
+            df[column] = list(values)
+        self.discourse_trees_df_checkpoint(df, *columns, store=store)
+
+        return df
+
     def extract_discourse_trees(self) -> pd.DataFrame:
-        if self.paths.discourse_trees_df.exists():
+        if self.discourse_trees_store.has("discourse_tree"):
+            # columns are loaded lazily by stages that need them
             logging.info("Discourse trees loading.")
-            return pd.read_pickle(self.paths.discourse_trees_df)
+            return self.discourse_trees_store.load()
+        elif self.paths.discourse_trees_df.exists():
+            logging.info("Discourse trees loading and converting to columnar checkpoint.")
+            df = pd.read_pickle(self.paths.discourse_trees_df)
+            self.discourse_trees_df_checkpoint(df, *df.columns)
+            return df
         else:
-            print(f"{self.input_file_path} will be loaded!")
-            f_extension = basename(self.input_file_path).split(".")[-1]
-
-            if f_extension in ["json"]:
-                with open(self.input_file_path, "r") as json_file:
-                    df = pd.DataFrame(json.load(json_file).values(), columns=["text"])
-            elif f_extension in ["csv", "txt"]:
-                df = pd.read_csv(self.input_file_path, header=None)
-                df.columns = ["text"]
-            else:
-                raise Exception("Wrong file type! It must be [json, txt or csv]")
-
-            if self.max_docs is not None:
-                df = df.head(self.max_docs)
+            df = self.read_input()
 
             mlflow.log_param(
                 "discourse_parsing_start_time",
                 datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
             )
-            df["discourse_tree"] = self.parallelized_extraction(
-                df.text.tolist(), extract_discourse_tree, "Discourse trees parsing"
-            )
+            cache = RSTParseCache() if self.rst_parse_cache else None
+            df = self.parse_discourse_trees(df, cache=cache)
+            if cache is not None:
+                mlflow.log_metric("rst_parse_cache_hits", cache.hits)
+                mlflow.log_metric("rst_parse_cache_misses", cache.misses)
             mlflow.log_param(
                 "discourse_parsing_end_time",
                 datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
             )
 
-            n_docs = len(df)
-            df.dropna(subset=["discourse_tree"], inplace=True)
-            logging.info(
-                f"{n_docs - len(df)} discourse tree has been parser with errors and we skip them."
-            )
-
             assert not df.empty, "No trees to process!"
             assert (
-                df[df.edus.apply(lambda l: len(l) > 0)].shape[0] > df.shape[0] / 2
+                df[df.discourse_tree.apply(lambda dt: len(dt.leaves()) > 0)].shape[0]
+                > df.shape[0] / 2
             ), "Probably to many RST errors, please check to discourse trees!"
 
-            self.discourse_trees_df_checkpoint(df)
+        return df
+
+    def read_input(self) -> pd.DataFrame:
+        print(f"{self.input_file_path} will be loaded!")
+        f_extension = basename(self.input_file_path).split(".")[-1]
 
+        if f_extension in ["json"]:
+            with open(self.input_file_path, "r") as json_file:
+                df = pd.DataFrame(json.load(json_file).values(), columns=["text"])
+        elif f_extension in ["csv", "txt"]:
+            df = pd.read_csv(self.input_file_path, header=None)
+            df.columns = ["text"]
+        else:
+            raise Exception("Wrong file type! It must be [json, txt or csv]")
+
+        if self.max_docs is not None:
+            df = df.head(self.max_docs)
         return df
 
-    def extract_discourse_trees_ids_only(self, df: pd.DataFrame) -> pd.DataFrame:
-        if "discourse_tree_ids_only" in df.columns:
+    def read_input_chunks(self) -> Iterator[pd.DataFrame]:
+        """Input documents in data frames of chunk_size, with index continued between chunks."""
+        print(f"{self.input_file_path} will be streamed in chunks of {self.chunk_size}!")
+        f_extension = basename(self.input_file_path).split(".")[-1]
+
+        if f_extension in ["json"]:
+            texts = iter_json_object_values(self.input_file_path)
+            if self.max_docs is not None:
+                texts = islice(texts, self.max_docs)
+            chunks = (
+                pd.DataFrame(texts_chunk, columns=["text"])
+                for texts_chunk in chunked(texts, self.chunk_size)
+            )
+        elif f_extension in ["csv", "txt"]:
+            chunks = pd.read_csv(
+                self.input_file_path,
+                header=None,
+                names=["text"],
+                nrows=self.max_docs,
+                chunksize=self.chunk_size,
+            )
+        else:
+            raise Exception("Wrong file type! It must be [json, txt or csv]")
+
+        n_docs = 0
+        for df in chunks:
+            df.index = pd.RangeIndex(n_docs, n_docs + len(df))
+            n_docs += len(df)
+            yield df
+
+    def parse_discourse_trees(
+        self, df: pd.DataFrame, cache: RSTParseCache = None, store: ColumnStore = None
+    ) -> pd.DataFrame:
+        if self.async_services:
+            parse_fn = partial(
+                async_services.run_for_all,
+                async_services.parse_discourse_tree,
+                desc="Discourse trees parsing",
+                max_in_flight=self.max_in_flight_requests,
+            )
+        else:
+            parse_fn = None
+        df["discourse_tree"] = extract_discourse_trees(
+            df.text.tolist(),
+            batch_size=self.batch_size,
+            concurrency=self.jobs,
+            parse_fn=parse_fn,
+            cache=cache,
+        )
+
+        n_docs = len(df)
+        df.dropna(subset=["discourse_tree"], inplace=True)
+        logging.info(
+            f"{n_docs - len(df)} discourse tree has been parser with errors and we skip them."
+        )
+        # array-backed trees are much smaller to keep in data frame, pickle and send to workers
+        df["discourse_tree"] = df.discourse_tree.apply(CompactDiscourseTree.from_tree)
+
+        self.discourse_trees_df_checkpoint(df, "text", "discourse_tree", store=store)
+        return df
+
+    def extract_discourse_trees_ids_only(
+        self, df: pd.DataFrame, store: ColumnStore = None
+    ) -> pd.DataFrame:
+        if self.has_columns(df, "discourse_tree_ids_only", "edus", store=store):
             return df
 
+        df = self.with_columns(df, "discourse_tree", store=store)
         df["discourse_tree_ids_only"], df["edus"] = tuple(
             zip(
                 *self.parallelized_extraction(
@@ -183,63 +390,133 @@ class AspectAnalysis:
                 )
             )
         )
-        self.discourse_trees_df_checkpoint(df)
+        self.discourse_trees_df_checkpoint(
+            df, "discourse_tree_ids_only", "edus", store=store
+        )
 
         return df
 
-    def discourse_trees_df_checkpoint(self, df: pd.DataFrame):
-        logging.info(f"Discourse data frame - saving.")
-        df.to_pickle(self.paths.discourse_trees_df)
+    def discourse_trees_df_checkpoint(
+        self, df: pd.DataFrame, *columns: str, store: ColumnStore = None
+    ):
+        """
+        Save only given columns, the others have not changed since they were saved.
+
+        store - checkpoint of a chunk in streaming mode, the whole data frame checkpoint by default
+        """
+        logging.info(f"Discourse data frame - saving {columns}.")
+        (store or self.discourse_trees_store).save(df, *columns)
         logging.info(f"Discourse data frame - saved.")
 
-    def extract_sentiment(self, df: pd.DataFrame) -> pd.DataFrame:
-        if "sentiment" in df.columns:
+    def has_columns(
+        self, df: pd.DataFrame, *columns: str, store: ColumnStore = None
+    ) -> bool:
+        """Columns are in data frame or were saved by one of previous runs."""
+        store = store or self.discourse_trees_store
+        return all(column in df.columns or store.has(column) for column in columns)
+
+    def with_columns(
+        self, df: pd.DataFrame, *columns: str, store: ColumnStore = None
+    ) -> pd.DataFrame:
+        """Load columns missing in data frame from the checkpoint."""
+        missing = [column for column in columns if column not in df.columns]
+        if not missing:
+            return df
+        return df.join((store or self.discourse_trees_store).load(*missing))
+
+    def extract_sentiment(
+        self, df: pd.DataFrame, store: ColumnStore = None
+    ) -> pd.DataFrame:
+        if self.has_columns(df, "sentiment", store=store):
             logging.info(
                 "Sentiments have been already extracted. Passing to the next step."
             )
             return df
 
+        df = self.with_columns(df, "edus", store=store)
         pandas_utils.assert_columns(df, "edus")
-        df["sentiment"] = self.parallelized_extraction(
-            df.edus.tolist(), analyze, "Sentiment extracting"
+        if self.sentiment_model == "bilstm" and self.async_services:
+            extract_fn = partial(
+                async_services.run_for_all,
+                async_services.extract_sentiments,
+                desc="Sentiment extracting",
+                max_in_flight=self.max_in_flight_requests,
+            )
+        elif self.sentiment_model == "bilstm":
+            # EDUs of all documents are sent in full batches to the batch endpoint
+            def extract_fn(edus_of_documents: List[List[str]]) -> List[List[float]]:
+                return split_by_lengths(
+                    BiLSTMModel().get_sentiments(list(flatten(edus_of_documents))),
+                    [len(edus) for edus in edus_of_documents],
+                )
+        else:
+            extract_fn = partial(
+                self.parallelized_extraction, fn=analyze, desc="Sentiment extracting"
+            )
+        df["sentiment"] = self.extract_for_edus(
+            df.edus.tolist(), extract_fn, self.sentiment_cache
         )
-        self.discourse_trees_df_checkpoint(df)
+        self.discourse_trees_df_checkpoint(df, "sentiment", store=store)
 
         return df
 
-    def extract_aspects(self, df: pd.DataFrame) -> pd.DataFrame:
-        if "aspects" in df.columns:
+    def extract_aspects(
+        self, df: pd.DataFrame, store: ColumnStore = None
+    ) -> pd.DataFrame:
+        if self.has_columns(df, "aspects", store=store):
             logging.info(
                 "Aspects have been already extracted. Passing to the next step."
             )
             return df
 
+        df = self.with_columns(df, "edus", store=store)
         pandas_utils.assert_columns(df, "edus")
 
         extractor = AspectExtractor()
-        df["aspects"] = self.parallelized_extraction(
-            df.edus.tolist(), extractor.extract_batch, "Aspects extracting"
+
+        def extract_fn(edus_of_documents: List[List[str]]) -> List[List[List[str]]]:
+            if self.async_services:
+                neural_aspects = async_services.run_for_all(
+                    async_services.extract_neural_aspects,
+                    edus_of_documents,
+                    "Neural aspects extracting",
+                    self.max_in_flight_requests,
+                )
+                return self.parallelized_extraction(
+                    list(zip(edus_of_documents, neural_aspects)),
+                    extractor.extract_batch_with_neural_aspects,
+                    "Aspects extracting",
+                )
+            return self.parallelized_extraction(
+                edus_of_documents, extractor.extract_batch, "Aspects extracting"
+            )
+
+        df["aspects"] = self.extract_for_edus(
+            df.edus.tolist(), extract_fn, self.aspects_cache
         )
-        self.discourse_trees_df_checkpoint(df)
+        self.discourse_trees_df_checkpoint(df, "aspects", store=store)
 
         # df["concepts"] = self.parallelized_extraction(
         #     df.aspects.tolist(), extractor.extract_concepts_batch, "Concepts extracting"
         # )
-        self.discourse_trees_df_checkpoint(df)
+        # self.discourse_trees_df_checkpoint(df, "concepts", store=store)
 
         return df
 
-    def extract_edu_rhetorical_rules(self, df: pd.DataFrame) -> pd.DataFrame:
+    def extract_edu_rhetorical_rules(
+        self, df: pd.DataFrame, store: ColumnStore = None
+    ) -> pd.DataFrame:
         # if "rules" in df.columns:
         #     return df
 
+        df = self.with_columns(df, "discourse_tree_ids_only", store=store)
         pandas_utils.assert_columns(df, "discourse_tree_ids_only")
 
         df["rules"] = self.parallelized_extraction(
             df.discourse_tree_ids_only.tolist(), extract_rules, "Extracting rules"
         )
 
-        self.discourse_trees_df_checkpoint(df)
+        self.discourse_trees_df_checkpoint(df, "rules", store=store)
 
         return df
 
@@ -274,30 +551,42 @@ class AspectAnalysis:
         metric_for_aspect_with_max_weight="pagerank",
         aspects_to_skip=None,
         with_aspect_filtering: bool = False,
+        discourse_trees_df: pd.DataFrame = None,
     ):
+        """
+        discourse_trees_df - rules, aspects and sentiment of documents already extracted, e.g.
+            shared by experiments run on the same corpus, it is not modified
+        """
         logging.info(f"Experiments for:  {self.paths.experiment_path}")
 
-        discourse_trees_df = (
-            self.extract_discourse_trees()
-            .pipe(self.extract_discourse_trees_ids_only)
-            .pipe(self.extract_sentiment)
-            .pipe(self.extract_aspects)
-            .pipe(self.extract_edu_rhetorical_rules)
-        )
-
-        if with_aspect_filtering:
-            discourse_trees_df = self.filter_rules_based_on_aspects_freq(
-                discourse_trees_df
+        if self.chunk_size is not None:
+            graph = self.generate_aspect_to_aspect_graph_in_chunks(
+                filter_relation_fn, aspects_to_skip, with_aspect_filtering
             )
+        else:
+            if discourse_trees_df is None:
+                discourse_trees_df = self.extract_discourse_trees_df()
+            else:
+                # rules and aspects columns are replaced by filtering, not the shared lists
+                discourse_trees_df = discourse_trees_df.copy(deep=False)
 
-        mlflow.log_metric("discourse_tree_df_len", len(discourse_trees_df))
+            if with_aspect_filtering:
+                discourse_trees_df = self.filter_rules_based_on_aspects_freq(
+                    discourse_trees_df
+                )
 
-        graph = self.build_aspect_to_aspect_graph(
-            discourse_trees_df, filter_relation_fn, aspects_to_skip
-        )
-        mlflow.log_metric("aspect_2_aspect_graph_edges", graph.number_of_edges())
-        mlflow.log_metric("aspect_2_aspect_graph_nodes", graph.number_of_nodes())
-        graph, _ = self.add_sentiments_and_weights_to_nodes(graph, discourse_trees_df)
+            mlflow.log_metric("discourse_tree_df_len", len(discourse_trees_df))
+
+            graph = self.build_aspect_to_aspect_graph(
+                discourse_trees_df, filter_relation_fn, aspects_to_skip
+            )
+            mlflow.log_metric("aspect_2_aspect_graph_edges", graph.number_of_edges())
+            # edges of the former multigraph, one per rule between aspects
+            mlflow.log_metric("aspect_2_aspect_graph_rules", graph.size(weight="count"))
+            mlflow.log_metric("aspect_2_aspect_graph_nodes", graph.number_of_nodes())
+            graph, _ = self.add_sentiments_and_weights_to_nodes(
+                graph, discourse_trees_df
+            )
         aht_graph = aht_graph_creation_fn(
             graph,
             max_number_of_nodes=self.aht_max_number_of_nodes,
@@ -318,24 +607,102 @@ class AspectAnalysis:
             self.paths.experiment_path / f"aht_for_{self.paths.experiment_name}",
         )
 
-    def filter_rules_based_on_aspects_freq(
-        self, discourse_trees_df: pd.DataFrame
-    ) -> pd.DataFrame:
-        # generate aspects counter for aspect when in discourse tree appear at least two aspects -
-        # the relation could be derived from it
-        aspect_counter = Counter(
-            flatten(
-                flatten(
-                    (
-                        discourse_trees_df[
-                            discourse_trees_df.aspects.apply(
-                                lambda aspects: list(flatten(aspects))
-                            ).apply(lambda aspects: len(set(aspects)) > 1)
-                        ]["aspects"]
-                    )
+    def extract_discourse_trees_df(self) -> pd.DataFrame:
+        """Rules, aspects and sentiment of all documents, all stages run or loaded from checkpoint."""
+        return (
+            self.extract_discourse_trees()
+            .pipe(self.extract_document_features)
+            .pipe(self.with_columns, "rules", "aspects", "sentiment")
+        )
+
+    def extract_discourse_trees_in_chunks(self) -> List[ColumnStore]:
+        """
+        Run all document level stages chunk by chunk, only one chunk of documents is in memory.
+
+        Every chunk has its own columnar checkpoint named by the range of input rows of the chunk,
+        chunks processed by previous runs are skipped only if they cover the same rows, e.g. not
+        after a change of chunk_size or max_docs.
+        """
+        stores = []
+        cache = RSTParseCache() if self.rst_parse_cache else None
+        mlflow.log_param(
+            "discourse_parsing_start_time",
+            datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        )
+        pool = self.document_workers_pool() if self.fused_document_workers else None
+        with nullcontext() if pool is None else pool:
+            for chunk_id, chunk_df in enumerate(self.read_input_chunks()):
+                store = ColumnStore(
+                    self.paths.discourse_trees_chunks
+                    / f"{chunk_df.index[0]:010d}-{chunk_df.index[-1] + 1:010d}"
                 )
-            )
+                if store.has("discourse_tree"):
+                    df = store.load()
+                else:
+                    df = self.parse_discourse_trees(chunk_df, cache=cache, store=store)
+                if len(df) == 0:
+                    logging.info(f"No discourse trees in chunk {chunk_id}, skipping it.")
+                    continue
+                self.extract_document_features(df, store=store, pool=pool)
+                stores.append(store)
+        if cache is not None:
+            mlflow.log_metric("rst_parse_cache_hits", cache.hits)
+            mlflow.log_metric("rst_parse_cache_misses", cache.misses)
+        mlflow.log_param(
+            "discourse_parsing_end_time",
+            datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
         )
+
+        assert stores, "No trees to process!"
+        return stores
+
+    def generate_aspect_to_aspect_graph_in_chunks(
+        self,
+        filter_relation_fn: Callable = None,
+        aspects_to_skip=None,
+        with_aspect_filtering: bool = False,
+    ) -> nx.DiGraph:
+        """Streaming version of graph building and adding sentiments to its nodes."""
+        stores = self.extract_discourse_trees_in_chunks()
+
+        aspect_counter = None
+        if with_aspect_filtering:
+            aspect_counter = Counter()
+            for store in stores:
+                aspect_counter.update(count_aspects_in_relations(store.load("aspects")))
+
+        n_discourse_trees = 0
+        aspect_sentiments = defaultdict(list)
+
+        def discourse_trees_dfs():
+            nonlocal n_discourse_trees
+            for store in tqdm(stores, desc="Aspect-aspect graph building in chunks"):
+                df = store.load("rules", "aspects", "sentiment")
+                if with_aspect_filtering:
+                    df = self.filter_rules_based_on_aspects_freq(df, aspect_counter)
+                n_discourse_trees += len(df)
+                collect_aspect_sentiments(df, aspect_sentiments)
+                yield df
+
+        builder = Aspect2AspectGraph(aspects_to_skip=aspects_to_skip)
+        graph = builder.build_from_chunks(discourse_trees_dfs(), filter_relation_fn)
+        mlflow.log_metric("discourse_tree_df_len", n_discourse_trees)
+        mlflow.log_metric("aspect_2_aspect_graph_edges", graph.number_of_edges())
+        # edges of the former multigraph, one per rule between aspects
+        mlflow.log_metric("aspect_2_aspect_graph_rules", graph.size(weight="count"))
+        mlflow.log_metric("aspect_2_aspect_graph_nodes", graph.number_of_nodes())
+
+        graph = add_aspect_sentiments_to_graph(graph, aspect_sentiments)
+        serializer.save(graph, self.paths.aspect_to_aspect_graph)
+        serializer.save(aspect_sentiments, self.paths.aspect_sentiments)
+        return graph
+
+    def filter_rules_based_on_aspects_freq(
+        self, discourse_trees_df: pd.DataFrame, aspect_counter: Counter = None
+    ) -> pd.DataFrame:
+        """aspect_counter - counts of aspects in all chunks in streaming mode"""
+        if aspect_counter is None:
+            aspect_counter = count_aspects_in_relations(discourse_trees_df)
         aspect_counter_df = pd.DataFrame(
             aspect_counter.most_common(), columns=["aspect", "aspect_occurrences"]
         ).sort_values(by="aspect_occurrences", ascending=False)
@@ -361,7 +728,7 @@ class AspectAnalysis:
         )
         return discourse_trees_df
 
-    def gerani_pipeline(self):
+    def gerani_pipeline(self, discourse_trees_df: pd.DataFrame = None):
         self.generate_aht(
             aht_graph_creation_fn=gerani_paper_arrg_to_aht,
             filter_relation_fn=rule_filters.filter_rules_gerani,
@@ -369,9 +736,12 @@ class AspectAnalysis:
             metric_for_aspect_with_max_weight="moi",
             aspects_to_skip=ASPECTS_TO_SKIP,
             with_aspect_filtering=False,
+            discourse_trees_df=discourse_trees_df,
         )
 
-    def our_pipeline(self, use_aspect_clustering: bool = False):
+    def our_pipeline(
+        self, use_aspect_clustering: bool = False, discourse_trees_df: pd.DataFrame = None
+    ):
         self.generate_aht(
             aht_graph_creation_fn=partial(
                 our_paper_arrg_to_aht, use_aspect_clustering=use_aspect_clustering
@@ -381,10 +751,14 @@ class AspectAnalysis:
             metric_for_aspect_with_max_weight="weight",
             aspects_to_skip=ASPECTS_TO_SKIP,
             with_aspect_filtering=False,
+            discourse_trees_df=discourse_trees_df,
         )
 
     def our_pipeline_top_n_rules_per_discourse_tree(
-        self, use_aspect_clustering: bool = False, top_n: int = 1
+        self,
+        use_aspect_clustering: bool = False,
+        top_n: int = 1,
+        discourse_trees_df: pd.DataFrame = None,
     ):
         self.generate_aht(
             aht_graph_creation_fn=partial(
@@ -395,4 +769,29 @@ class AspectAnalysis:
             metric_for_aspect_with_max_weight="weight",
             aspects_to_skip=ASPECTS_TO_SKIP,
             with_aspect_filtering=False,
+            discourse_trees_df=discourse_trees_df,
         )
+
+
+def count_aspects_in_relations(discourse_trees_df: pd.DataFrame) -> Counter:
+    # generate aspects counter for aspect when in discourse tree appear at least two aspects -
+    # the relation could be derived from it
+    return Counter(
+        flatten(
+            flatten(
+                (
+                    discourse_trees_df[
+                        discourse_trees_df.aspects.apply(
+                            lambda aspects: list(flatten(aspects))
+                        ).apply(lambda aspects: len(set(aspects)) > 1)
+                    ]["aspects"]
+                )
+            )
+        )
+    )
+
+
+def split_by_lengths(values: Sequence, lengths: Sequence[int]) -> List[List]:
+    """Flat values split back into consecutive lists, e.g. EDU values into documents."""
+    values = iter(values)
+    return [list(islice(values, length)) for length in lengths]
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Sequence
+
+import aiohttp
+from tqdm.asyncio import tqdm
+
+from aspects.utilities import settings
+
+RETRIABLE_STATUSES = frozenset([502, 503, 504])
+
+
+class AsyncServiceClient:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_in_flight: int = None,
+        retries_limit: int = None,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+    ):
+        """
+        Asynchronous client of one of the docker services (RST, aspects, sentiment).
+
+        session - aiohttp session shared by all clients
+        max_in_flight - how many requests may wait for the service at once
+        retries_limit - how many times a request is repeated when the service is not reachable,
+            it is overloaded or it times out
+        backoff - first delay between retries in seconds, doubled with every retry up to max_backoff
+        """
+        self.session = session
+        self.semaphore = asyncio.Semaphore(
+            max_in_flight or settings.SERVICES_MAX_IN_FLIGHT_REQUESTS
+        )
+        self.retries_limit = (
+            settings.RETRIES_LIMIT if retries_limit is None else retries_limit
+        )
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def post(
+        self, url: str, data_factory: Callable[[], Any] = None, **kwargs
+    ) -> aiohttp.ClientResponse:
+        """
+        data_factory - builds the request body for every attempt, for bodies that can be sent
+            only once (e.g. multipart aiohttp.FormData)
+        """
+        delay = self.backoff
+        for attempt in range(self.retries_limit + 1):
+            if data_factory is not None:
+                kwargs["data"] = data_factory()
+            try:
+                async with self.semaphore:
+                    response = await self.session.post(url, **kwargs)
+                    if response.status not in RETRIABLE_STATUSES:
+                        await response.read()
+                        return response
+                    response.release()
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = repr(e)
+
+            if attempt < self.retries_limit:
+                logging.info(f"Request to {url} failed ({error}), retry in {delay}s.")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+        raise ConnectionError(
+            f"Request to {url} failed {self.retries_limit + 1} times, last error: {error}"
+        )
+
+    async def post_json(self, url: str, payload: Dict) -> Any:
+        response = await self.post(url, json=payload)
+        response.raise_for_status()
+        return await response.json()
+
+
+def _rst_form_data(text: str) -> aiohttp.FormData:
+    data = aiohttp.FormData()
+    data.add_field("input", text, filename="input.txt")
+    return data
+
+
+async def parse_discourse_tree(client: AsyncServiceClient, text: str) -> str:
+    """Parse tree of text, failed documents get an empty string as in the synchronous client."""
+    try:
+        response = await client.post(
+            settings.RST_PARSER_DOCKER_URL, data_factory=lambda: _rst_form_data(text)
+        )
+        if response.status != 200:
+            return ""
+        return (await response.text()).replace("\\n", "\n")
+    except (ConnectionError, aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logging.info(f"Document with errors: {text}. Error: {str(e)}")
+        return ""
+
+
+async def extract_neural_aspects(
+    client: AsyncServiceClient, edus: Sequence[str]
+) -> List[List[str]]:
+    if not edus:
+        return []
+    # EDUs of a document are predicted with one request to the batch endpoint
+    return (
+        await client.post_json(
+            settings.ASPECT_EXTRACTOR_BATCH_DOCKER_URL, {"texts": list(edus)}
+        )
+    )["aspects"]
+
+
+async def extract_sentiments(
+    client: AsyncServiceClient, edus: Sequence[str]
+) -> List[float]:
+    if not edus:
+        return []
+    # EDUs of a document are predicted with one request to the batch endpoint
+    return (
+        await client.post_json(
+            settings.SENTIMENT_BATCH_DOCKER_URL,
+            {"texts": list(edus), "mini_batch_size": settings.SENTIMENT_MINI_BATCH_SIZE},
+        )
+    )["sentiment"]
+
+
+async def _run_for_all(fn, elements: Sequence, desc: str, max_in_flight: int) -> List:
+    timeout = aiohttp.ClientTimeout(total=settings.SERVICES_REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        client = AsyncServiceClient(session, max_in_flight=max_in_flight)
+        # gather keeps the order of the elements
+        return await tqdm.gather(
+            *[fn(client, element) for element in elements], desc=desc
+        )
+
+
+def run_for_all(
+    fn, elements: Sequence, desc: str = "Running services requests", max_in_flight: int = None
+) -> List:
+    """
+    Call an async service function for each of elements with a bounded number of requests in flight.
+    """
+    return asyncio.run(_run_for_all(fn, list(elements), desc, max_in_flight))
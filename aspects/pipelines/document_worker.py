@@ -0,0 +1,62 @@
+from typing import List, NamedTuple, Union
+
+from nltk import Tree
+
+from aspects.aspects.aspect_extractor import AspectExtractor
+from aspects.rst.compact_tree import CompactDiscourseTree
+from aspects.rst.edu_tree_rules_extractor import EDURelation
+from aspects.rst.extractors import extract_discourse_tree_with_ids_only, extract_rules
+from aspects.sentiment.sentiment_client import BiLSTMModel
+from aspects.sentiment.simple_textblob import analyze
+
+
+class DocumentRecord(NamedTuple):
+    discourse_tree_ids_only: CompactDiscourseTree
+    edus: List[str]
+    sentiment: List[float]
+    aspects: List[List[str]]
+    rules: List[EDURelation]
+
+
+class DocumentWorker:
+    def __init__(self, sentiment_model: str = "textblob"):
+        """
+        All per-document stages of AspectAnalysis fused into one call.
+
+        Created once per worker process, hence spaCy pipeline, sentiment lexicon and HTTP clients (with
+        keep-alive sessions) stay loaded between documents.
+        """
+        self.aspect_extractor = AspectExtractor()
+        if sentiment_model == "bilstm":
+            self.sentiment_fn = BiLSTMModel().get_sentiments
+        else:
+            self.sentiment_fn = analyze
+
+    def process(
+        self, discourse_tree: Union[Tree, CompactDiscourseTree]
+    ) -> DocumentRecord:
+        discourse_tree_ids_only, edus = extract_discourse_tree_with_ids_only(
+            discourse_tree
+        )
+        return DocumentRecord(
+            discourse_tree_ids_only=discourse_tree_ids_only,
+            edus=edus,
+            sentiment=self.sentiment_fn(edus),
+            aspects=self.aspect_extractor.extract_batch(edus),
+            rules=extract_rules(discourse_tree_ids_only),
+        )
+
+
+# worker of the current process, set by init_worker (ProcessPoolExecutor initializer)
+_worker: DocumentWorker = None
+
+
+def init_worker(sentiment_model: str = "textblob"):
+    global _worker
+    _worker = DocumentWorker(sentiment_model)
+
+
+def process_document(
+    discourse_tree: Union[Tree, CompactDiscourseTree]
+) -> DocumentRecord:
+    return _worker.process(discourse_tree)
@@ -0,0 +1,29 @@
+import mlflow
+import pytest
+from hamcrest import assert_that, equal_to, none
+
+from aspects.pipelines.aspect_analysis import AspectAnalysis
+
+
+@pytest.fixture
+def mlflow_run(tmp_path):
+    tracking_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    with mlflow.start_run() as run:
+        yield run
+    mlflow.set_tracking_uri(tracking_uri)
+
+
+def test_edu_cache_is_disabled_with_fused_document_workers(tmp_path, mlflow_run):
+    aspect_analysis = AspectAnalysis(
+        input_path=tmp_path / "reviews.json",
+        output_path=tmp_path / "output",
+        fused_document_workers=True,
+        edu_cache=True,
+    )
+
+    assert_that(aspect_analysis.edu_cache, equal_to(False))
+    assert_that(aspect_analysis.sentiment_cache, none())
+    assert_that(aspect_analysis.aspects_cache, none())
+    params = mlflow.get_run(mlflow_run.info.run_id).data.params
+    assert_that(params["edu_cache"], equal_to("False"))
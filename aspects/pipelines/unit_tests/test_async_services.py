@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from hamcrest import assert_that, equal_to
+
+from aspects.pipelines.async_services import (
+    AsyncServiceClient,
+    extract_sentiments,
+    parse_discourse_tree,
+)
+
+
+class _Response:
+    def __init__(self, status, payload=None):
+        self.status = status
+        self.payload = payload
+
+    async def read(self):
+        pass
+
+    def release(self):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return self.payload
+
+
+class _Session:
+    def __init__(self, n_failures=0):
+        self.n_failures = n_failures
+        self.n_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent_data = []
+
+    async def post(self, url, json=None, data=None):
+        if data is not None:
+            # multipart form data can be sent only once
+            assert not any(data is sent for sent in self.sent_data)
+            self.sent_data.append(data)
+        self.n_requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if self.n_failures > 0:
+            self.n_failures -= 1
+            return _Response(503)
+        if data is not None:
+            return _Response(200, "(N tree)\\n")
+        return _Response(200, {"sentiment": [float(len(text)) for text in json["texts"]]})
+
+
+async def _extract(session, edus, **kwargs):
+    client = AsyncServiceClient(session, backoff=0, **kwargs)
+    return await asyncio.gather(*[extract_sentiments(client, [edu]) for edu in edus])
+
+
+def test_requests_are_retried_with_results_in_order():
+    session = _Session(n_failures=3)
+    sentiments = asyncio.run(_extract(session, ["a", "bb", "ccc"], retries_limit=3))
+    assert_that(sentiments, equal_to([[1.0], [2.0], [3.0]]))
+    assert_that(session.n_requests, equal_to(6))
+
+
+def test_requests_fail_after_retries_limit():
+    with pytest.raises(ConnectionError):
+        asyncio.run(_extract(_Session(n_failures=3), ["a"], retries_limit=2))
+
+
+def test_in_flight_requests_are_bounded():
+    session = _Session()
+    asyncio.run(_extract(session, ["a"] * 20, max_in_flight=4))
+    assert_that(session.max_in_flight, equal_to(4))
+
+
+def test_rst_requests_are_retried_with_new_form_data():
+    session = _Session(n_failures=2)
+    client = AsyncServiceClient(session, backoff=0, retries_limit=3)
+    tree = asyncio.run(parse_discourse_tree(client, "text"))
+    assert_that(tree, equal_to("(N tree)\n"))
+    assert_that(len(session.sent_data), equal_to(3))
+
+
+def test_failed_rst_request_gives_empty_tree():
+    client = AsyncServiceClient(_Session(n_failures=3), backoff=0, retries_limit=2)
+    tree = asyncio.run(parse_discourse_tree(client, "text"))
+    assert_that(tree, equal_to(""))
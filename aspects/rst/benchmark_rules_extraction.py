@@ -0,0 +1,58 @@
+import timeit
+from typing import List
+
+from nltk import Tree
+
+from aspects.rst.edu_tree_rules_extractor import EDUTreeRulesExtractor
+from aspects.rst.sample_data import load_sample_trees, random_discourse_tree
+
+class ReferenceEDUTreeRulesExtractor(EDUTreeRulesExtractor):
+    """Rules extraction recomputing leaves and heights for every rule, as before the tree index."""
+
+    def calculate_gerani_weight(self):
+        if self.right_leaf is not None or self.left_leaf is not None:
+            leaves = self.tree.leaves()
+            n_edus_between_analyzed_edus = leaves.index(self.right_leaf) - leaves.index(self.left_leaf)
+            n_edus_in_tree = len(leaves)
+            tree_height = self.tree.height()
+            if self.left_child_parent.height() > self.right_child_parent.height():
+                sub_tree_height = self.left_child_parent.height()
+            else:
+                sub_tree_height = self.right_child_parent.height()
+            return round(
+                1 - 0.5 *
+                (float(n_edus_between_analyzed_edus) / n_edus_in_tree)
+                - 0.5 * (float(sub_tree_height) / tree_height), 2
+            )
+        return 0
+
+    def rst_relation_type(self):
+        if not isinstance(self.left_child_parent, Tree):
+            return self.right_child_parent.label()
+        elif self.left_child_parent.height() > self.right_child_parent.height():
+            return self.left_child_parent.label()
+        else:
+            return self.right_child_parent.label()
+
+
+def benchmark(trees: List[Tree], number: int = 10):
+    for only_hierarchical_relations in [True, False]:
+        for tree in trees:
+            assert (
+                EDUTreeRulesExtractor(tree, only_hierarchical_relations).extract()
+                == ReferenceEDUTreeRulesExtractor(tree, only_hierarchical_relations).extract()
+            ), "Rules differ from the reference extraction!"
+
+    for extractor_class in [ReferenceEDUTreeRulesExtractor, EDUTreeRulesExtractor]:
+        seconds = timeit.timeit(
+            lambda: [extractor_class(tree).extract() for tree in trees], number=number
+        ) / number
+        print(f"{extractor_class.__name__:35} {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    print("data/sample_trees")
+    benchmark(load_sample_trees(), number=1000)
+    for n_edus in [50, 200, 800]:
+        print(f"synthetic trees with {n_edus} EDUs")
+        benchmark([random_discourse_tree(n_edus, seed) for seed in range(5)], number=3)
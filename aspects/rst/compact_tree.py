@@ -0,0 +1,238 @@
+import re
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from nltk import Tree
+
+# columns of CompactDiscourseTree.nodes, nodes are in pre-order (parents always before children)
+PARENT, FIRST_CHILD, NEXT_SIBLING, RELATION, NUCLEARITY, EDU = range(6)
+N_COLUMNS = 6
+
+NO_NODE = -1
+# nuclearity of internal nodes, relation labels such as Elaboration[N][S] - bit 0 is set for the
+# satellite as a first child, bit 1 for the satellite as a second child, -1 for labels without it
+NUCLEARITY_CODES = {("N", "N"): 0, ("S", "N"): 1, ("N", "S"): 2, ("S", "S"): 3}
+NUCLEARITY_LABELS = {code: labels for labels, code in NUCLEARITY_CODES.items()}
+
+RELATION_PATTERN = re.compile(r"^(.*)\[([NS])\]\[([NS])\]$")
+
+
+class CompactDiscourseTree:
+    def __init__(
+        self,
+        nodes: np.ndarray,
+        relation_names: Sequence[str],
+        edu_texts: Optional[Sequence[str]] = None,
+    ):
+        """
+        Discourse tree kept in one small integer matrix instead of nested nltk.Tree objects.
+
+        It is a fraction of nltk.Tree pickle size and is cheap to send between worker processes and
+        to save in discourse trees data frame.
+
+        nodes - matrix with a row per node (subtree or EDU) in pre-order and columns: index of
+            parent, index of first child and index of next sibling (NO_NODE if there is no such
+            node), relation id (index of relation_names) and nuclearity code of subtrees, EDU of
+            leaves (EDU id or index of edu_texts)
+        relation_names - relation names (without nuclearity) used in the tree
+        edu_texts - texts of EDUs if leaves are texts, None if leaves are EDU ids
+        """
+        self.nodes = nodes
+        self.relation_names = tuple(relation_names)
+        self.edu_texts = None if edu_texts is None else tuple(edu_texts)
+
+    @property
+    def parents(self) -> np.ndarray:
+        return self.nodes[:, PARENT]
+
+    @property
+    def first_children(self) -> np.ndarray:
+        return self.nodes[:, FIRST_CHILD]
+
+    @property
+    def next_siblings(self) -> np.ndarray:
+        return self.nodes[:, NEXT_SIBLING]
+
+    @property
+    def relations(self) -> np.ndarray:
+        return self.nodes[:, RELATION]
+
+    @property
+    def nuclearity(self) -> np.ndarray:
+        return self.nodes[:, NUCLEARITY]
+
+    @property
+    def edus(self) -> np.ndarray:
+        return self.nodes[:, EDU]
+
+    @property
+    def is_leaf(self) -> np.ndarray:
+        return self.nodes[:, EDU] != NO_NODE
+
+    def __len__(self) -> int:
+        """Number of root children, as len(nltk.Tree)."""
+        return len(self.children(0))
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, CompactDiscourseTree)
+            and np.array_equal(self.nodes, other.nodes)
+            and self.relation_names == other.relation_names
+            and self.edu_texts == other.edu_texts
+        )
+
+    def __reduce__(self):
+        # only columns that cannot be derived from the others, as raw bytes since the header of numpy
+        # array pickle is bigger than most trees, children and siblings are restored from parents
+        leaf_edus = self.edus[self.is_leaf]
+        edus = None if np.array_equal(leaf_edus, np.arange(len(leaf_edus))) else self.edus
+        small = np.int8 if len(self.relation_names) < np.iinfo(np.int8).max else np.int16
+        return (
+            _from_bytes,
+            (
+                self.nodes.dtype.str,
+                self.parents.tobytes(),
+                self.relations.astype(small).tobytes(),
+                self.nuclearity.astype(np.int8).tobytes(),
+                None if edus is None else edus.tobytes(),
+                np.dtype(small).str,
+                self.relation_names,
+                self.edu_texts,
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"CompactDiscourseTree({self.to_tree()})"
+
+    def children(self, node: int) -> List[int]:
+        children = []
+        child = self.nodes[node, FIRST_CHILD]
+        while child != NO_NODE:
+            children.append(int(child))
+            child = self.nodes[child, NEXT_SIBLING]
+        return children
+
+    def label(self, node: int) -> str:
+        relation_name = self.relation_names[self.nodes[node, RELATION]]
+        nuclearity = self.nodes[node, NUCLEARITY]
+        if nuclearity == NO_NODE:
+            return relation_name
+        first, second = NUCLEARITY_LABELS[int(nuclearity)]
+        return f"{relation_name}[{first}][{second}]"
+
+    def leaves(self) -> List[Union[int, str]]:
+        edus = self.edus[self.is_leaf].tolist()
+        if self.edu_texts is None:
+            return edus
+        return [self.edu_texts[edu] for edu in edus]
+
+    def height(self) -> int:
+        """Height of the tree as nltk.Tree.height."""
+        heights = np.ones(len(self.nodes), dtype=np.int64)
+        parents = self.parents
+        for node in range(len(self.nodes) - 1, 0, -1):
+            parent = parents[node]
+            heights[parent] = max(heights[parent], heights[node] + 1)
+        return int(heights[0])
+
+    def with_edu_ids(self) -> Tuple["CompactDiscourseTree", List[str]]:
+        """Replace EDU texts in leaves with EDU ids, the same as EDUTreeMapper does for nltk.Tree."""
+        edus = self.leaves()
+        nodes = self.nodes.copy()
+        leaves = self.is_leaf
+        nodes[leaves, EDU] = np.arange(leaves.sum(), dtype=nodes.dtype)
+        return CompactDiscourseTree(nodes, self.relation_names), edus
+
+    @staticmethod
+    def from_tree(tree: Tree) -> "CompactDiscourseTree":
+        rows = []
+        leaves = []
+        relation_names = {}
+        last_children = {}
+        # explicit stack as trees of long documents exceed recursion limit, (node, parent) pairs
+        # are popped in pre-order
+        stack = [(tree, NO_NODE)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(rows)
+            if parent != NO_NODE:
+                if parent in last_children:
+                    rows[last_children[parent]][NEXT_SIBLING] = index
+                else:
+                    rows[parent][FIRST_CHILD] = index
+                last_children[parent] = index
+
+            if isinstance(node, Tree):
+                match = RELATION_PATTERN.match(node.label())
+                if match:
+                    relation_name, first, second = match.groups()
+                    nuclearity = NUCLEARITY_CODES[(first, second)]
+                else:
+                    relation_name, nuclearity = node.label(), NO_NODE
+                relation = relation_names.setdefault(relation_name, len(relation_names))
+                rows.append([parent, NO_NODE, NO_NODE, relation, nuclearity, NO_NODE])
+                stack.extend((child, index) for child in reversed(node))
+            else:
+                rows.append([parent, NO_NODE, NO_NODE, NO_NODE, NO_NODE, len(leaves)])
+                leaves.append(node)
+
+        if all(isinstance(leaf, int) for leaf in leaves):
+            nodes = np.array(rows, dtype=_dtype(max([len(rows), *leaves]))).reshape(-1, N_COLUMNS)
+            nodes[nodes[:, EDU] != NO_NODE, EDU] = leaves
+            return CompactDiscourseTree(nodes, relation_names)
+        nodes = np.array(rows, dtype=_dtype(len(rows))).reshape(-1, N_COLUMNS)
+        return CompactDiscourseTree(nodes, relation_names, leaves)
+
+    def to_tree(self) -> Tree:
+        subtrees = []
+        leaves = self.leaves()
+        leaf_index = 0
+        for node in range(len(self.nodes)):
+            if self.nodes[node, EDU] != NO_NODE:
+                subtree = leaves[leaf_index]
+                leaf_index += 1
+            else:
+                subtree = Tree(self.label(node), [])
+            parent = self.nodes[node, PARENT]
+            if parent != NO_NODE:
+                # pre-order, children are appended in their order
+                subtrees[parent].append(subtree)
+            subtrees.append(subtree)
+        return subtrees[0]
+
+
+def _dtype(max_value: int):
+    return np.int16 if max_value < np.iinfo(np.int16).max else np.int32
+
+
+def _from_bytes(
+    dtype: str,
+    parents: bytes,
+    relations: bytes,
+    nuclearity: bytes,
+    edus: Optional[bytes],
+    relations_dtype: str,
+    relation_names: Sequence[str],
+    edu_texts: Optional[Sequence[str]],
+) -> CompactDiscourseTree:
+    dtype = np.dtype(dtype)
+    parents = np.frombuffer(parents, dtype=dtype)
+    nodes = np.full((len(parents), N_COLUMNS), NO_NODE, dtype=dtype)
+    nodes[:, PARENT] = parents
+    nodes[:, RELATION] = np.frombuffer(relations, dtype=np.dtype(relations_dtype))
+    nodes[:, NUCLEARITY] = np.frombuffer(nuclearity, dtype=np.int8)
+    if edus is None:
+        leaves = nodes[:, RELATION] == NO_NODE
+        nodes[leaves, EDU] = np.arange(leaves.sum())
+    else:
+        nodes[:, EDU] = np.frombuffer(edus, dtype=dtype)
+
+    # nodes are in pre-order, hence stable sort by parent gives children of each node in order
+    by_parent = np.argsort(parents[1:], kind="stable") + 1
+    sorted_parents = parents[by_parent]
+    has_next_sibling = sorted_parents[:-1] == sorted_parents[1:]
+    nodes[by_parent[:-1][has_next_sibling], NEXT_SIBLING] = by_parent[1:][has_next_sibling]
+    is_first_child = np.ones(len(by_parent), dtype=bool)
+    is_first_child[1:] = ~has_next_sibling
+    nodes[sorted_parents[is_first_child], FIRST_CHILD] = by_parent[is_first_child]
+    return CompactDiscourseTree(nodes, relation_names, edu_texts)
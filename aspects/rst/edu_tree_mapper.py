@@ -6,9 +6,14 @@ class EDUTreeMapper:
         self.edus = []
 
     def process_tree(self, tree):
-        for index, subtree in enumerate(tree):
+        # explicit stack instead of recursion as trees of long documents exceed recursion limit,
+        # (subtree, index of child) pairs are popped in the order of depth first traversal
+        stack = [(tree, index) for index in reversed(range(len(tree)))]
+        while stack:
+            tree, index = stack.pop()
+            subtree = tree[index]
             if isinstance(subtree, Tree):
-                self.process_tree(subtree)
+                stack.extend((subtree, child_index) for child_index in reversed(range(len(subtree))))
             else:
                 tree[index] = len(self.edus)
                 self.edus.append(subtree)
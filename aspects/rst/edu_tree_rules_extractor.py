@@ -1,8 +1,10 @@
 import logging
-from typing import List, NamedTuple
+from typing import Dict, List, NamedTuple, Union
 
 from nltk.tree import Tree
 
+from aspects.rst.compact_tree import CompactDiscourseTree
+
 
 class EDURelation(NamedTuple):
     edu1: int
@@ -15,13 +17,17 @@ loger = logging.getLogger()
 
 
 class EDUTreeRulesExtractor:
-    def __init__(self, tree: Tree, only_hierarchical_relations: bool = True):
+    def __init__(
+        self,
+        tree: Union[Tree, CompactDiscourseTree],
+        only_hierarchical_relations: bool = True,
+    ):
         """
         Extracting rules from RST tress.
 
         rules - dictionary of rules extracted from Discourse Trees, key is
             document id, value list of rules for tree
-        tree - Discourse Tree
+        tree - Discourse Tree, compact trees are converted to nltk.Tree
         left_child_parent - parent of actually analyzed left leaf
         right_child_parent - parent of actually analyzed right leaf
 
@@ -31,18 +37,26 @@ class EDUTreeRulesExtractor:
 
         """
         self.rules: List[EDURelation] = []
+        if isinstance(tree, CompactDiscourseTree):
+            tree = tree.to_tree()
         self.tree: Tree = tree
         self.left_child_parent = None
         self.left_leaf = None
         self.right_child_parent = None
         self.right_leaf = None
         self.only_hierarchical_relations: bool = only_hierarchical_relations
+        # computed once per tree in _index_tree and reused for every rule
+        self.leaf_positions: Dict = {}
+        self.subtree_heights: Dict[int, int] = {}
+        self.n_leaves: int = 0
+        self.tree_height: int = 0
 
     def extract(self) -> List[EDURelation]:
         try:
             if len(self.tree) == 0:
                 # empty rules list
                 return self.rules
+            self._index_tree()
             self._process_tree(self.tree)
         # TODO: fix AttributeError: 'int' object has no attribute 'height' in gerani calculation
         except AttributeError as e:
@@ -51,29 +65,64 @@ class EDUTreeRulesExtractor:
             return []
         return self.rules
 
-    def _process_tree(self, tree):
-        # there are max two childred for each subtree
-        if len(tree) > 1:
-            self.left_child_parent = tree
-            self.right_child_parent = tree
-        else:
-            self.left_child_parent = tree
+    def _index_tree(self):
+        """
+        Single post-order pass over the tree collecting the position of each leaf (first occurrence,
+        as list.index) and the height of each subtree (as Tree.height), keyed by subtree id.
+        """
+        self.leaf_positions = {}
+        self.subtree_heights = {}
+        n_leaves = 0
+        stack = [(self.tree, False)]
+        while stack:
+            node, children_visited = stack.pop()
+            if not isinstance(node, Tree):
+                self.leaf_positions.setdefault(node, n_leaves)
+                n_leaves += 1
+            elif children_visited:
+                self.subtree_heights[id(node)] = 1 + max(
+                    (self.subtree_heights[id(child)] if isinstance(child, Tree) else 1 for child in node),
+                    default=0,
+                )
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node))
+
+        self.n_leaves = n_leaves
+        self.tree_height = self.subtree_heights[id(self.tree)]
 
-        for child in tree:
+    def _height(self, tree) -> int:
+        try:
+            return self.subtree_heights[id(tree)]
+        except KeyError:
+            # not a subtree of the indexed tree, fallback keeps the previous errors for non-trees
+            return tree.height()
+
+    def _process_tree(self, tree):
+        # explicit stack instead of recursion, deep trees of long documents exceed recursion limit,
+        # children are popped in the same order as in depth first recursion
+        stack = [(tree, None)]
+        while stack:
+            node, parent = stack.pop()
             # check if child is leaf or subtree
-            if isinstance(child, Tree):
+            if isinstance(node, Tree):
+                # there are max two childred for each subtree
+                if len(node) > 1:
+                    self.left_child_parent = node
+                    self.right_child_parent = node
+                else:
+                    self.left_child_parent = node
                 # go into subtree
-                self._process_tree(child)
-            # recursively until leaf
+                stack.extend((child, node) for child in reversed(node))
             else:
                 # leaf, parent/current subtree
-                self._traverse_parent(child, tree)
+                self._traverse_parent(node, parent)
 
     def _traverse_parent(self, leaf, parent):
         """ we reached leaf and want to parse sibling of leaf """
         # leaf = child
         # todo: check if none or sth other
-        if parent is not None:
+        while parent is not None:
             self.right_child_parent = parent
             for child in parent:
                 if child != leaf:
@@ -82,48 +131,50 @@ class EDUTreeRulesExtractor:
             # go up in the tree
             try:
                 self.relation = parent.label()
-                self._traverse_parent(leaf, parent.parent)
+                parent = parent.parent
             except AttributeError:
-                pass
+                break
 
     def _make_rules(self, leaf_left, tree):
-        # if anything other than Tree we got leaf level
-        if not isinstance(tree, Tree):
+        stack = [tree]
+        while stack:
+            tree = stack.pop()
+            # do deeper into tree
+            if isinstance(tree, Tree):
+                stack.extend(reversed(tree))
+                continue
+            # if anything other than Tree we got leaf level
             self.left_leaf = leaf_left
             self.right_leaf = tree
             relation = self.rst_relation_type()
             # relation name, nucleus/satellite, nucleus/satellite
             rel_name, nuc_sat_1, nuc_sat_2 = self.get_nucleus_satellite_and_relation_type(relation)
             if self.only_hierarchical_relations and not self.check_hierarchical_rst_relation(nuc_sat_1, nuc_sat_2):
-                return
+                continue
+            if nuc_sat_1 == 'N':
+                # [N][S] or [N][N]
+                self.rules.append(
+                    EDURelation(self.right_leaf, self.left_leaf, rel_name, self.calculate_gerani_weight())
+                )
             else:
-                if nuc_sat_1 == 'N':
-                    # [N][S] or [N][N]
-                    self.rules.append(
-                        EDURelation(self.right_leaf, self.left_leaf, rel_name, self.calculate_gerani_weight())
-                    )
-                else:
-                    # [S][N]
-                    self.rules.append(
-                        EDURelation(self.left_leaf, self.right_leaf, rel_name, self.calculate_gerani_weight())
-                    )
-        # do deeper into tree
-        else:
-            for child in tree:
-                self._make_rules(leaf_left, child)
+                # [S][N]
+                self.rules.append(
+                    EDURelation(self.left_leaf, self.right_leaf, rel_name, self.calculate_gerani_weight())
+                )
 
     def calculate_gerani_weight(self):
         if self.right_leaf is not None or self.left_leaf is not None:
             # calculate how many edus are between analyzed leafs,
             # leaf are integers hence we may substract them
-            leaves = self.tree.leaves()
-            n_edus_between_analyzed_edus = leaves.index(self.right_leaf) - leaves.index(self.left_leaf)
-            n_edus_in_tree = len(leaves)
-            tree_height = self.tree.height()
-            if self.left_child_parent.height() > self.right_child_parent.height():
-                sub_tree_height = self.left_child_parent.height()
+            n_edus_between_analyzed_edus = self.leaf_positions[self.right_leaf] - self.leaf_positions[self.left_leaf]
+            n_edus_in_tree = self.n_leaves
+            tree_height = self.tree_height
+            left_child_parent_height = self._height(self.left_child_parent)
+            right_child_parent_height = self._height(self.right_child_parent)
+            if left_child_parent_height > right_child_parent_height:
+                sub_tree_height = left_child_parent_height
             else:
-                sub_tree_height = self.right_child_parent.height()
+                sub_tree_height = right_child_parent_height
             return round(
                 1 - 0.5 *
                 (float(n_edus_between_analyzed_edus) / n_edus_in_tree)
@@ -135,7 +186,7 @@ class EDUTreeRulesExtractor:
         """ Find common nearest parent and take relation from higher parse tree """
         if not isinstance(self.left_child_parent, Tree):
             return self.right_child_parent.label()
-        elif self.left_child_parent.height() > self.right_child_parent.height():
+        elif self._height(self.left_child_parent) > self._height(self.right_child_parent):
             return self.left_child_parent.label()
         else:
             return self.right_child_parent.label()
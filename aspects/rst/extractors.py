@@ -1,17 +1,53 @@
 import logging
-from typing import Union, Tuple, List
+from typing import Callable, Union, Tuple, List, Sequence
 
 import nltk
 
+from aspects.rst.compact_tree import CompactDiscourseTree
 from aspects.rst.edu_tree_mapper import EDUTreeMapper
 from aspects.rst.edu_tree_rules_extractor import EDUTreeRulesExtractor
+from aspects.rst.parse_cache import RSTParseCache
 from aspects.rst.parser_client import RSTParserClient
 from aspects.utilities import settings
 
 
-def extract_discourse_tree(document: str) -> Union[nltk.Tree, None]:
+def extract_discourse_tree(
+    document: str, cache: RSTParseCache = None
+) -> Union[nltk.Tree, None]:
     parser = RSTParserClient()
-    parse_tree_str = parser.parse(document)
+    if cache is None:
+        parse_tree_str = parser.parse(document)
+    else:
+        parse_tree_str = cache.get_or_parse(
+            [document], lambda documents: [parser.parse(documents[0])]
+        )[0]
+    return discourse_tree_from_str(parse_tree_str, document)
+
+
+def extract_discourse_trees(
+    documents: Sequence[str],
+    batch_size: int = None,
+    concurrency: int = None,
+    parse_fn: Callable[[List[str]], List[str]] = None,
+    cache: RSTParseCache = None,
+) -> List[Union[nltk.Tree, None]]:
+    if parse_fn is None:
+        parse_fn = RSTParserClient(
+            batch_size=batch_size, concurrency=concurrency
+        ).parse_many
+    if cache is None:
+        parse_tree_strs = parse_fn(list(documents))
+    else:
+        parse_tree_strs = cache.get_or_parse(documents, parse_fn)
+    return [
+        discourse_tree_from_str(parse_tree_str, document)
+        for document, parse_tree_str in zip(documents, parse_tree_strs)
+    ]
+
+
+def discourse_tree_from_str(
+    parse_tree_str: str, document: str
+) -> Union[nltk.Tree, None]:
     try:
         return nltk.tree.Tree.fromstring(
             parse_tree_str,
@@ -24,13 +60,15 @@ def extract_discourse_tree(document: str) -> Union[nltk.Tree, None]:
 
 
 def extract_discourse_tree_with_ids_only(
-    discourse_tree: nltk.Tree,
-) -> Tuple[nltk.Tree, List[str]]:
+    discourse_tree: Union[nltk.Tree, CompactDiscourseTree],
+) -> Tuple[CompactDiscourseTree, List[str]]:
+    if isinstance(discourse_tree, CompactDiscourseTree):
+        return discourse_tree.with_edu_ids()
     edu_tree_preprocessor = EDUTreeMapper()
     edu_tree_preprocessor.process_tree(discourse_tree)
-    return discourse_tree, edu_tree_preprocessor.edus
+    return CompactDiscourseTree.from_tree(discourse_tree), edu_tree_preprocessor.edus
 
 
-def extract_rules(discourse_tree: nltk.Tree) -> List:
+def extract_rules(discourse_tree: Union[nltk.Tree, CompactDiscourseTree]) -> List:
     rules_extractor = EDUTreeRulesExtractor(tree=discourse_tree)
     return rules_extractor.extract()
@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import unicodedata
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Union
+
+from more_itertools import chunked
+
+from aspects.utilities import settings
+
+# sqlite limits number of query parameters
+SQLITE_MAX_VARIABLES = 900
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before hashing, only changes that do not affect RST parser are applied - paragraphs
+    (new lines) are kept as the parser uses them.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(re.sub(r"[ \t]+", " ", line).strip() for line in text.strip().split("\n"))
+
+
+class RSTParseCache:
+    def __init__(
+        self, path: Union[str, Path] = None, parser_version: str = None
+    ):
+        """
+        Persistent cache of RST parser outputs shared between experiments and datasets.
+
+        Parse trees are stored in SQLite under the hash of normalized document text and parser
+        version, hence the same review is parsed only once even if it appears in a different
+        dataset, a run with different max_docs or in another output directory.
+
+        path - SQLite database file
+        parser_version - changing it invalidates all previously cached trees
+        """
+        self.path = Path(path or settings.RST_PARSE_CACHE_PATH)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self.parser_version = parser_version or settings.RST_PARSER_VERSION
+        self.hits = 0
+        self.misses = 0
+
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS parse_trees (key TEXT PRIMARY KEY, tree TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path.as_posix(), timeout=60)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self.parser_version}\n{normalize_text(text)}".encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        trees = {}
+        with closing(self._connect()) as connection, connection:
+            for keys_chunk in chunked(set(keys), SQLITE_MAX_VARIABLES):
+                trees.update(
+                    connection.execute(
+                        f"SELECT key, tree FROM parse_trees WHERE key IN ({','.join('?' * len(keys_chunk))})",
+                        keys_chunk,
+                    ).fetchall()
+                )
+        return trees
+
+    def put_many(self, trees: Dict[str, str]):
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO parse_trees (key, tree) VALUES (?, ?)",
+                trees.items(),
+            )
+
+    def get_or_parse(
+        self, documents: Sequence[str], parse_fn: Callable[[List[str]], List[str]]
+    ) -> List[str]:
+        """
+        Get parse trees of documents, only documents missing in cache are parsed with parse_fn.
+
+        Failed parses (empty strings) are not cached, they will be parsed again in the next run.
+        """
+        keys = [self.key(document) for document in documents]
+        trees = self.get_many(keys)
+
+        missing = {}
+        for key, document in zip(keys, documents):
+            if key not in trees:
+                missing.setdefault(key, document)
+
+        n_hits = sum(key in trees for key in keys)
+        self.hits += n_hits
+        self.misses += len(keys) - n_hits
+        logging.info(
+            f"RST parse cache: {n_hits} documents cached, {len(missing)} to parse."
+        )
+
+        if missing:
+            parsed = dict(zip(missing.keys(), parse_fn(list(missing.values()))))
+            self.put_many({key: tree for key, tree in parsed.items() if tree})
+            trees.update(parsed)
+
+        return [trees[key] for key in keys]
@@ -1,21 +1,100 @@
+import logging
+from concurrent.futures.thread import ThreadPoolExecutor
+from typing import List, Sequence
 from uuid import uuid4
 
 import requests
-from requests import ReadTimeout
+from more_itertools import chunked
+from requests import ReadTimeout, RequestException
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
 
-from aspects.utilities.settings import RST_PARSER_DOCKER_URL
+from aspects.utilities.settings import (
+    RST_PARSER_BATCH_DOCKER_URL,
+    RST_PARSER_BATCH_SIZE,
+    RST_PARSER_CONCURRENCY,
+    RST_PARSER_DOCKER_URL,
+)
 
 
 class RSTParserClient:
-    def __init__(self, url=None):
+    def __init__(
+        self,
+        url=None,
+        batch_url=None,
+        batch_size: int = None,
+        concurrency: int = None,
+        timeout: int = 30,
+    ):
         self.url = url or RST_PARSER_DOCKER_URL
+        self.batch_url = batch_url or RST_PARSER_BATCH_DOCKER_URL
+        self.batch_size = batch_size or RST_PARSER_BATCH_SIZE
+        self.concurrency = concurrency or RST_PARSER_CONCURRENCY
+        self.timeout = timeout
+
+        # keep-alive connections shared by all requests (and threads) of this client
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def parse(self, text: str) -> str:
+        """Parse tree of text, an empty string if parsing failed (it is never cached then)."""
         files = {"input": (f"{str(uuid4())}.txt", text)}
         try:
-            response = requests.post(self.url, files=files, timeout=30)
-            return (
-                response.content.decode('utf-8').replace('\\n', '\n')
-            )
+            response = self.session.post(self.url, files=files, timeout=self.timeout)
         except ReadTimeout:
             return ""
+        if response.status_code != 200:
+            # body is an error message or page of the service, not a tree
+            logging.info(f"Document with errors: {text}. Status: {response.status_code}")
+            return ""
+        return response.content.decode('utf-8').replace('\\n', '\n')
+
+    def parse_batch(self, texts: Sequence[str]) -> List[str]:
+        """
+        Parse texts with one request, failed documents get an empty string as parse() does.
+        """
+        try:
+            response = self.session.post(
+                self.batch_url,
+                json={"texts": list(texts)},
+                timeout=self.timeout * len(texts),
+            )
+            response.raise_for_status()
+            results = response.json()["results"]
+        except (RequestException, ValueError, KeyError) as e:
+            logging.info(f"RST batch of {len(texts)} documents failed. Error: {str(e)}")
+            return [""] * len(texts)
+
+        if len(results) != len(texts):
+            # results cannot be matched with documents, later ones would be shifted
+            logging.info(
+                f"RST batch of {len(texts)} documents failed. Got {len(results)} results."
+            )
+            return [""] * len(texts)
+
+        parse_tree_strs = []
+        for text, result in zip(texts, results):
+            if result["error"]:
+                logging.info(f"Document with errors: {text}. Error: {result['error']}")
+            parse_tree_strs.append(result["tree"].replace('\\n', '\n'))
+        return parse_tree_strs
+
+    def parse_many(
+        self, texts: Sequence[str], batch_size: int = None, concurrency: int = None
+    ) -> List[str]:
+        """
+        Parse texts in batches sent concurrently, the output keeps the order of the input texts.
+        """
+        batches = list(chunked(texts, batch_size or self.batch_size))
+        with ThreadPoolExecutor(concurrency or self.concurrency) as pool:
+            return [
+                parse_tree_str
+                for batch_results in tqdm(
+                    pool.map(self.parse_batch, batches),
+                    total=len(batches),
+                    desc="Discourse trees parsing",
+                )
+                for parse_tree_str in batch_results
+            ]
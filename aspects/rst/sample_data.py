@@ -0,0 +1,50 @@
+"""Sample and synthetic discourse trees and EDUs shared by unit tests and benchmarks."""
+import random
+from typing import List
+
+from nltk import Tree
+
+from aspects.rst.extractors import extract_discourse_tree_with_ids_only
+from aspects.utilities import settings
+
+RELATIONS = ["Elaboration[N][S]", "Contrast[N][N]", "Attribution[S][N]", "Joint[N][N]", "Background[N][S]"]
+
+
+def _sample_tree_paths():
+    return sorted((settings.DATA_PATH / "sample_trees").glob("*.tree"))
+
+
+def load_sample_trees() -> List[Tree]:
+    return [
+        extract_discourse_tree_with_ids_only(
+            Tree.fromstring(
+                tree_path.read_text(),
+                leaf_pattern=settings.DISCOURSE_TREE_LEAF_PATTERN,
+                remove_empty_top_bracketing=True,
+            )
+        )[0].to_tree()
+        for tree_path in _sample_tree_paths()
+    ]
+
+
+def load_sample_edus(n_edus: int = 1024) -> List[str]:
+    edus = [
+        edu.strip()
+        for tree_path in _sample_tree_paths()
+        for edu in Tree.fromstring(
+            tree_path.read_text(),
+            leaf_pattern=settings.DISCOURSE_TREE_LEAF_PATTERN,
+            remove_empty_top_bracketing=True,
+        ).leaves()
+    ]
+    return (edus * (n_edus // len(edus) + 1))[:n_edus]
+
+
+def random_discourse_tree(n_edus: int, seed: int = 0) -> Tree:
+    """Random binary discourse tree over EDU ids, similar to a long review parsed by the RST parser."""
+    rand = random.Random(seed)
+    constituents = list(range(n_edus))
+    while len(constituents) > 1:
+        i = rand.randrange(len(constituents) - 1)
+        constituents[i:i + 2] = [Tree(rand.choice(RELATIONS), constituents[i:i + 2])]
+    return constituents[0]
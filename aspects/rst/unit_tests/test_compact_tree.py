@@ -0,0 +1,71 @@
+import pickle
+import sys
+
+from hamcrest import assert_that, equal_to
+from nltk import Tree
+
+from aspects.rst.sample_data import load_sample_trees, random_discourse_tree
+from aspects.rst.compact_tree import CompactDiscourseTree
+from aspects.rst.edu_tree_rules_extractor import EDUTreeRulesExtractor
+from aspects.rst.extractors import extract_discourse_tree_with_ids_only, extract_rules
+
+
+def _text_tree() -> Tree:
+    return Tree(
+        "Elaboration[N][S]",
+        [
+            "I love this phone",
+            Tree("Contrast[N][N]", ["the screen is great", "but battery is weak"]),
+            Tree("span", ["really weak"]),
+        ],
+    )
+
+
+def test_round_trip_of_tree_with_texts():
+    tree = _text_tree()
+    compact = CompactDiscourseTree.from_tree(tree)
+
+    assert_that(compact.to_tree(), equal_to(tree))
+    assert_that(compact.relation_names, equal_to(("Elaboration", "Contrast", "span")))
+    assert_that(compact.parents.tolist(), equal_to([-1, 0, 0, 2, 2, 0, 5]))
+    assert_that(compact.children(0), equal_to([1, 2, 5]))
+    assert_that(compact.nuclearity.tolist(), equal_to([2, -1, 0, -1, -1, -1, -1]))
+    assert_that(compact.leaves(), equal_to(tree.leaves()))
+    assert_that((len(compact), compact.height()), equal_to((len(tree), tree.height())))
+
+
+def test_pickle_round_trip():
+    for tree in [_text_tree(), Tree("span", [0])] + load_sample_trees():
+        compact = CompactDiscourseTree.from_tree(tree)
+        assert_that(pickle.loads(pickle.dumps(compact)), equal_to(compact))
+
+
+def test_edu_ids_same_as_edu_tree_mapper():
+    compact, edus = extract_discourse_tree_with_ids_only(
+        CompactDiscourseTree.from_tree(_text_tree())
+    )
+    tree, mapper_edus = extract_discourse_tree_with_ids_only(_text_tree())
+
+    assert_that(compact, equal_to(tree))
+    assert_that(edus, equal_to(mapper_edus))
+    assert_that(compact.leaves(), equal_to([0, 1, 2, 3]))
+
+
+def test_rules_same_as_for_nltk_tree():
+    for tree in load_sample_trees() + [random_discourse_tree(60, seed=2)]:
+        assert_that(
+            extract_rules(CompactDiscourseTree.from_tree(tree)),
+            equal_to(EDUTreeRulesExtractor(tree).extract()),
+        )
+
+
+def test_tree_deeper_than_recursion_limit():
+    tree = Tree("Elaboration[N][S]", [0, 1])
+    for edu in range(2, sys.getrecursionlimit() * 3):
+        tree = Tree("Elaboration[N][S]", [tree, edu])
+
+    compact = pickle.loads(pickle.dumps(CompactDiscourseTree.from_tree(tree)))
+    assert_that(compact.height(), equal_to(sys.getrecursionlimit() * 3))
+    # nltk.Tree comparison is recursive, hence comparing compact trees
+    assert_that(CompactDiscourseTree.from_tree(compact.to_tree()), equal_to(compact))
+    assert_that(compact.leaves(), equal_to(list(range(sys.getrecursionlimit() * 3))))
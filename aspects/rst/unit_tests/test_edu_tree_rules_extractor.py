@@ -1,8 +1,12 @@
+import sys
 import unittest
 
 from nltk.tree import Tree
 
+from aspects.rst.benchmark_rules_extraction import ReferenceEDUTreeRulesExtractor
+from aspects.rst.edu_tree_mapper import EDUTreeMapper
 from aspects.rst.edu_tree_rules_extractor import EDUTreeRulesExtractor, EDURelation
+from aspects.rst.sample_data import load_sample_trees, random_discourse_tree
 from aspects.utilities import settings
 
 
@@ -115,3 +119,52 @@ class AspectExtractionTest(unittest.TestCase):
                               EDURelation(edu1=563, edu2=561, relation_type='same-unit', gerani=0.4),
                               EDURelation(edu1=563, edu2=562, relation_type='Elaboration', gerani=0.75)]}
         self.assertEqual(rules, expected_rules)
+
+    def test_rules_same_as_reference_extraction(self):
+        trees = load_sample_trees() + [random_discourse_tree(n_edus, seed=n_edus) for n_edus in [2, 7, 60]]
+        for only_hierarchical_relations in [True, False]:
+            for tree in trees:
+                self.assertEqual(
+                    EDUTreeRulesExtractor(tree, only_hierarchical_relations).extract(),
+                    ReferenceEDUTreeRulesExtractor(tree, only_hierarchical_relations).extract()
+                )
+
+    def test_sample_tree_rules_with_edu_ids(self):
+        self._with_simple_discourse_tree()
+        EDUTreeMapper().process_tree(self.discourse_tree)
+        self.assertEqual(self.discourse_tree.leaves(), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            EDUTreeRulesExtractor(self.discourse_tree, only_hierarchical_relations=False).extract(),
+            [EDURelation(edu1=2, edu2=1, relation_type='Elaboration', weight=0.5),
+             EDURelation(edu1=3, edu2=1, relation_type='Elaboration', weight=0.4),
+             EDURelation(edu1=4, edu2=1, relation_type='Elaboration', weight=0.3),
+             EDURelation(edu1=3, edu2=2, relation_type='Joint', weight=0.6),
+             EDURelation(edu1=4, edu2=2, relation_type='Joint', weight=0.5),
+             EDURelation(edu1=4, edu2=3, relation_type='Elaboration', weight=0.7),
+             EDURelation(edu1=3, edu2=4, relation_type='Elaboration', weight=0.9)]
+        )
+
+    def test_edu_ids_of_tree_deeper_than_recursion_limit(self):
+        n_edus = sys.getrecursionlimit() * 3
+        tree = Tree('Elaboration[N][S]', ['edu 0', 'edu 1'])
+        for edu in range(2, n_edus):
+            tree = Tree('Elaboration[N][S]', [tree, f'edu {edu}'])
+
+        mapper = EDUTreeMapper()
+        mapper.process_tree(tree)
+        self.assertEqual(mapper.edus, [f'edu {edu}' for edu in range(n_edus)])
+        self.assertEqual(tree[1], n_edus - 1)
+        self.assertEqual(tree[0][1], n_edus - 2)
+
+    def test_rules_of_tree_deeper_than_recursion_limit(self):
+        inner_tree = random_discourse_tree(1000, seed=1)
+        tree = inner_tree
+        for _ in range(sys.getrecursionlimit() * 3):
+            tree = Tree('Elaboration[N][S]', [tree])
+
+        rules = EDUTreeRulesExtractor(tree, only_hierarchical_relations=False).extract()
+        self.assertEqual(
+            [(rule.edu1, rule.edu2, rule.relation_type) for rule in rules],
+            [(rule.edu1, rule.edu2, rule.relation_type)
+             for rule in EDUTreeRulesExtractor(inner_tree, only_hierarchical_relations=False).extract()]
+        )
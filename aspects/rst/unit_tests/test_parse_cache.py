@@ -0,0 +1,46 @@
+from hamcrest import assert_that, equal_to
+
+from aspects.rst.parse_cache import RSTParseCache, normalize_text
+
+
+class _Parser:
+    def __init__(self):
+        self.parsed = []
+
+    def parse_many(self, documents):
+        self.parsed.extend(documents)
+        return ["" if document == "broken" else f"(N {document})" for document in documents]
+
+
+def test_normalize_text_keeps_paragraphs():
+    assert_that(
+        normalize_text("  I love\tthis  phone. \r\n\r\nGreat   screen. "),
+        equal_to("I love this phone.\n\nGreat screen."),
+    )
+
+
+def test_only_missing_documents_are_parsed(tmp_path):
+    parser = _Parser()
+    cache = RSTParseCache(tmp_path / "cache.sqlite", parser_version="v1")
+
+    trees = cache.get_or_parse(["doc a", "doc b", "doc a", "broken"], parser.parse_many)
+    assert_that(trees, equal_to(["(N doc a)", "(N doc b)", "(N doc a)", ""]))
+    assert_that(parser.parsed, equal_to(["doc a", "doc b", "broken"]))
+
+    # new cache object, e.g. another run or dataset, shares the database
+    cache = RSTParseCache(tmp_path / "cache.sqlite", parser_version="v1")
+    trees = cache.get_or_parse(["doc  b", "doc c", "broken"], parser.parse_many)
+    assert_that(trees, equal_to(["(N doc b)", "(N doc c)", ""]))
+    assert_that(parser.parsed[3:], equal_to(["doc c", "broken"]))
+    assert_that((cache.hits, cache.misses), equal_to((1, 2)))
+
+
+def test_parser_version_invalidates_cache(tmp_path):
+    parser = _Parser()
+    RSTParseCache(tmp_path / "cache.sqlite", parser_version="v1").get_or_parse(
+        ["doc a"], parser.parse_many
+    )
+    RSTParseCache(tmp_path / "cache.sqlite", parser_version="v2").get_or_parse(
+        ["doc a"], parser.parse_many
+    )
+    assert_that(parser.parsed, equal_to(["doc a", "doc a"]))
@@ -0,0 +1,84 @@
+from hamcrest import assert_that, equal_to
+from requests import ConnectionError
+
+from aspects.rst.parse_cache import RSTParseCache
+from aspects.rst.parser_client import RSTParserClient
+
+
+class _Response:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        if "truncated" in self.texts:
+            return {"results": [{"tree": "(N doc)", "error": None}]}
+        return {
+            "results": [
+                {"tree": "", "error": "parser crashed"}
+                if text == "broken"
+                else {"tree": f"(N {text})", "error": None}
+                for text in self.texts
+            ]
+        }
+
+
+class _FileResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+
+class _Session:
+    def post(self, url, timeout, json=None, files=None):
+        if files is not None:
+            text = files["input"][1]
+            if text == "broken":
+                return _FileResponse(500, b"<html>Internal Server Error</html>")
+            return _FileResponse(200, f"(N {text})".encode("utf-8"))
+        if "unreachable" in json["texts"]:
+            raise ConnectionError()
+        return _Response(json["texts"])
+
+
+def _with_client():
+    client = RSTParserClient(batch_size=2, concurrency=3)
+    client.session = _Session()
+    return client
+
+
+def test_parse_many_keeps_order_of_documents():
+    texts = [f"doc{i}" for i in range(7)]
+    assert_that(
+        _with_client().parse_many(texts), equal_to([f"(N {text})" for text in texts])
+    )
+
+
+def test_parse_many_keeps_per_document_failures():
+    texts = ["doc0", "broken", "doc2", "unreachable", "doc4"]
+    assert_that(
+        _with_client().parse_many(texts),
+        equal_to(["(N doc0)", "", "", "", "(N doc4)"]),
+    )
+
+
+def test_parse_many_fails_batch_with_missing_results():
+    texts = ["doc0", "truncated", "doc2", "doc3"]
+    assert_that(
+        _with_client().parse_many(texts),
+        equal_to(["", "", "(N doc2)", "(N doc3)"]),
+    )
+
+
+def test_parse_failure_is_not_cached(tmp_path):
+    client = _with_client()
+    cache = RSTParseCache(tmp_path / "cache.sqlite", parser_version="test")
+    documents = ["doc0", "broken"]
+    trees = cache.get_or_parse(documents, lambda texts: [client.parse(text) for text in texts])
+    assert_that(trees, equal_to(["(N doc0)", ""]))
+    assert_that(
+        cache.get_many([cache.key(document) for document in documents]),
+        equal_to({cache.key("doc0"): "(N doc0)"}),
+    )
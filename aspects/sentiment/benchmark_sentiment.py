@@ -0,0 +1,36 @@
+import time
+from typing import List
+
+from more_itertools import chunked
+
+from aspects.rst.sample_data import load_sample_edus
+from aspects.sentiment.lexicon_sentiment import POLARITY_TOLERANCE, LexiconSentiment
+from aspects.sentiment.simple_textblob import analyze_with_textblob
+
+BATCH_SIZES = [1, 32, 256]
+
+
+def benchmark(edus: List[str], batch_sizes: List[int] = None):
+    """EDUs per second of sentiment, TextBlob object per EDU vs batches of the lexicon scorer."""
+    start = time.perf_counter()
+    textblob_polarities = analyze_with_textblob(edus)
+    print(f"{'TextBlob per EDU':25} {len(edus) / (time.perf_counter() - start):10.1f} EDUs/s")
+
+    for batch_size in batch_sizes or BATCH_SIZES:
+        scorer = LexiconSentiment()
+        start = time.perf_counter()
+        polarities = [
+            polarity
+            for edus_batch in chunked(edus, batch_size)
+            for polarity in scorer.polarity(edus_batch)
+        ]
+        seconds = time.perf_counter() - start
+        assert all(
+            abs(polarity - textblob_polarity) <= POLARITY_TOLERANCE
+            for polarity, textblob_polarity in zip(polarities, textblob_polarities)
+        ), "Lexicon polarities differ from TextBlob!"
+        print(f"{f'lexicon batch of {batch_size}':25} {len(edus) / seconds:10.1f} EDUs/s")
+
+
+if __name__ == "__main__":
+    benchmark(load_sample_edus(16384))
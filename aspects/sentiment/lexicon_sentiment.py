@@ -0,0 +1,170 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from textblob._text import (
+    ABBREVIATIONS,
+    EMOTICONS,
+    PUNCTUATION,
+    RE_ABBR1,
+    RE_ABBR2,
+    RE_ABBR3,
+    RE_EMOTICONS,
+    RE_SARCASM,
+    replacements,
+)
+from textblob.en import sentiment as textblob_sentiment
+
+# max absolute difference to TextBlob polarity when comparing them - words and their scores are
+# the same and so are the float operations, the tolerance only absorbs rounding, while any
+# difference in tokenization or emoticons changes polarity by orders of magnitude more
+POLARITY_TOLERANCE = 1e-9
+# max number of distinct raw tokens with memoized words
+TOKENS_CACHE_SIZE = 2 ** 16
+
+# token separating texts of a batch, it is neither whitespace nor punctuation
+TEXTS_SEPARATOR = "\x00"
+EOS = "END-OF-SENTENCE"
+
+RE_CONTRACTIONS = re.compile("|".join(re.escape(contraction) for contraction in replacements))
+RE_QUOTES = re.compile("([“”‘’'\"])")
+RE_LINEBREAK = re.compile(r"\n{2,}")
+RE_WHITESPACE = re.compile(r"\s+")
+
+LEADING_PUNCTUATION = tuple(PUNCTUATION.replace(".", ""))
+TRAILING_PUNCTUATION = LEADING_PUNCTUATION + (".",)
+
+
+class LexiconSentiment:
+    def __init__(self):
+        """
+        Batch polarity scorer compatible with TextBlob(text).sentiment.polarity.
+
+        TextBlob scores each text separately: it builds a blob, runs the regex tokenizer on it and
+        looks up words in a lazily loaded lexicon of per part-of-speech dicts. Here the whole batch
+        is normalized with one pass of each regex, raw tokens are split into words once per
+        distinct token (memoized in a bounded LRU cache) and the lexicon is flattened to a word -> (polarity, intensity,
+        is modifier) dict, so a batch of EDUs costs roughly one dict lookup per word.
+        """
+        self.lexicon: Dict[str, Tuple[float, float, bool]] = {
+            word: (scores[None][0], scores[None][2], "RB" in scores)
+            for word, scores in dict.items(_loaded(textblob_sentiment))
+        }
+        self.negations = frozenset(textblob_sentiment.negations)
+        self.emoticons: Dict[str, float] = {}
+        for (_, polarity), emoticons in EMOTICONS.items():
+            for emoticon in emoticons:
+                self.emoticons.setdefault(emoticon.lower(), polarity)
+
+    def polarity(self, texts: Sequence[str]) -> List[float]:
+        return [self.score(words) for words in self.tokenize(texts)]
+
+    def tokenize(self, texts: Sequence[str]) -> List[List[str]]:
+        """Lower-cased words of each text, the same as TextBlob sentiment tokenizer yields."""
+        if not texts:
+            return []
+        batch = f" {TEXTS_SEPARATOR} ".join(str(text) for text in texts)
+        batch = RE_CONTRACTIONS.sub(r" \g<0>", batch)
+        batch = RE_QUOTES.sub(r" \1 ", batch)
+        batch = RE_LINEBREAK.sub(f" {EOS} ", batch.replace("\r\n", "\n"))
+        words = [
+            word
+            for token in RE_WHITESPACE.split(batch)
+            if token
+            for word in _words_of_token(token)
+        ]
+        batch = RE_SARCASM.sub("(!)", " ".join(words))
+        batch = RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), batch)
+        texts_words = [[]]
+        for word in batch.lower().split():
+            if word == TEXTS_SEPARATOR:
+                texts_words.append([])
+            else:
+                texts_words[-1].append(word)
+        return texts_words
+
+    def score(self, words: List[str]) -> float:
+        """Polarity of lower-cased words, the algorithm of pattern's Sentiment.assessments."""
+        lexicon = self.lexicon
+        assessments = []  # [polarity, intensity, negated]
+        modifier = None
+        negation = None
+        for word in words:
+            scores = lexicon.get(word)
+            if scores is not None:
+                polarity, intensity, is_modifier = scores
+                if modifier is None:
+                    assessments.append([polarity, intensity, False])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[1], +1.0))
+                    last[1] = intensity
+                if negation is not None:
+                    assessments[-1][1] = 1.0 / assessments[-1][1]
+                    assessments[-1][2] = True
+                modifier = word if is_modifier else None
+                negation = word if word in self.negations else None
+            else:
+                if word in self.negations:
+                    negation = word
+                elif negation and len(word.strip("'")) > 1:
+                    negation = None
+                if negation is not None and modifier is not None and modifier.endswith("ly"):
+                    assessments[-1][2] = True
+                    negation = None
+                elif modifier and len(word) > 2:
+                    modifier = None
+                if word == "!" and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, +1.0))
+                if word == "(!)":
+                    assessments.append([0.0, 1.0, False])
+                if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                    emoticon_polarity = self.emoticons.get(word)
+                    if emoticon_polarity is not None:
+                        assessments.append([emoticon_polarity, 1.0, False])
+        if not assessments:
+            return 0.0
+        return sum(p * -0.5 if negated else p for p, _, negated in assessments) / len(
+            assessments
+        )
+
+
+def _loaded(lexicon):
+    # TextBlob lexicon is a lazy dict, it is read from XML on the first access
+    len(lexicon)
+    return lexicon
+
+
+@lru_cache(maxsize=TOKENS_CACHE_SIZE)
+def _words_of_token(token: str) -> Tuple[str, ...]:
+    return tuple(word for word in _split_punctuation(token) if word != EOS)
+
+
+def _split_punctuation(token: str) -> List[str]:
+    """Leading and trailing punctuation split from a token, as in TextBlob find_tokens."""
+    words = []
+    tail = []
+    while token.startswith(LEADING_PUNCTUATION) and token not in replacements:
+        words.append(token[0])
+        token = token[1:]
+    while token.endswith(TRAILING_PUNCTUATION) and token not in replacements:
+        if token.endswith(LEADING_PUNCTUATION):
+            tail.append(token[-1])
+            token = token[:-1]
+        if token.endswith("..."):
+            tail.append("...")
+            token = token[:-3].rstrip(".")
+        if token.endswith("."):
+            if (
+                token in ABBREVIATIONS
+                or RE_ABBR1.match(token) is not None
+                or RE_ABBR2.match(token) is not None
+                or RE_ABBR3.match(token) is not None
+            ):
+                break
+            tail.append(token[-1])
+            token = token[:-1]
+    if token != "":
+        words.append(token)
+    words.extend(reversed(tail))
+    return words
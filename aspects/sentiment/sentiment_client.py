@@ -1,18 +1,46 @@
-from typing import List
+from typing import List, Sequence
 
 import requests
+from more_itertools import chunked
 
-from aspects.utilities.settings import SENTIMENT_DOCKER_URL
+from aspects.utilities.settings import (
+    SENTIMENT_BATCH_DOCKER_URL,
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_DOCKER_URL,
+    SENTIMENT_MINI_BATCH_SIZE,
+)
 
 
 class BiLSTMModel:
-    def __init__(self, url=None, json_request_key=None, json_response_key=None):
+    def __init__(
+        self,
+        url=None,
+        json_request_key=None,
+        json_response_key=None,
+        batch_url=None,
+        batch_size: int = None,
+        mini_batch_size: int = None,
+    ):
         self.url = url or SENTIMENT_DOCKER_URL
+        self.batch_url = batch_url or SENTIMENT_BATCH_DOCKER_URL
+        self.batch_size = batch_size or SENTIMENT_BATCH_SIZE
+        self.mini_batch_size = mini_batch_size or SENTIMENT_MINI_BATCH_SIZE
         self.json_request_key = json_request_key or "text"
         self.json_response_key = json_response_key or "sentiment"
+        # keep-alive connection reused by all requests of this client
+        self.session = requests.Session()
 
     def analyse(self, text):
-        return requests.post(self.url, json={self.json_request_key: text}).json()
+        return self.session.post(self.url, json={self.json_request_key: text}).json()
 
-    def get_sentiments(self, texts: List[str]) -> List[float]:
-        return [self.analyse(text)[self.json_response_key] for text in texts]
+    def get_sentiments(self, texts: Sequence[str], batch_size: int = None) -> List[float]:
+        """Sentiments of texts, batch_size texts are sent in one request and predicted at once."""
+        sentiments = []
+        for texts_batch in chunked(texts, batch_size or self.batch_size):
+            response = self.session.post(
+                self.batch_url,
+                json={"texts": texts_batch, "mini_batch_size": self.mini_batch_size},
+            )
+            response.raise_for_status()
+            sentiments.extend(response.json()[self.json_response_key])
+        return sentiments
@@ -2,6 +2,21 @@ from typing import List
 
 from textblob import TextBlob
 
+from aspects.data_io.edu_cache import EDUCache
+from aspects.sentiment.lexicon_sentiment import LexiconSentiment
 
-def analyze(texts: List[str]) -> List[float]:
+_lexicon_sentiment = None
+
+
+def analyze(texts: List[str], cache: EDUCache = None) -> List[float]:
+    """TextBlob polarity of texts, scored as one batch by the lexicon scorer."""
+    global _lexicon_sentiment
+    if _lexicon_sentiment is None:
+        _lexicon_sentiment = LexiconSentiment()
+    if cache is not None:
+        return cache.get_or_compute(texts, _lexicon_sentiment.polarity)
+    return _lexicon_sentiment.polarity(texts)
+
+
+def analyze_with_textblob(texts: List[str]) -> List[float]:
     return [TextBlob(text).sentiment.polarity for text in texts]
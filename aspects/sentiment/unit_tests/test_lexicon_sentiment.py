@@ -0,0 +1,36 @@
+from hamcrest import assert_that, close_to, contains_exactly, equal_to
+
+from aspects.rst.sample_data import load_sample_edus
+from aspects.sentiment.lexicon_sentiment import POLARITY_TOLERANCE, LexiconSentiment
+from aspects.sentiment.simple_textblob import analyze, analyze_with_textblob
+
+TEXTS = [
+    "This phone is not very good!",
+    "I don't like it :) really",
+    "not really good (!)",
+    "",
+    "U.S. e.g. etc... great!!!",
+    'Mr. Smith said "awful" :-( ',
+    "never a good thing",
+    "horribly not nice",
+    "it's “great” ’ok’",
+    "line\n\nbreak good.",
+    ": ) happy",
+]
+
+
+def test_polarity_same_as_textblob():
+    texts = TEXTS + load_sample_edus(256)
+    assert_that(
+        LexiconSentiment().polarity(texts),
+        contains_exactly(
+            *[close_to(polarity, POLARITY_TOLERANCE) for polarity in analyze_with_textblob(texts)]
+        ),
+    )
+
+
+def test_batch_same_as_single_texts():
+    scorer = LexiconSentiment()
+    assert_that(scorer.polarity(TEXTS), equal_to([scorer.polarity([text])[0] for text in TEXTS]))
+    assert_that(analyze(TEXTS), equal_to(scorer.polarity(TEXTS)))
+    assert_that(scorer.polarity([]), equal_to([]))
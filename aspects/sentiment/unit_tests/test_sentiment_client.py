@@ -0,0 +1,42 @@
+from hamcrest import assert_that, equal_to
+
+from aspects.sentiment.sentiment_client import BiLSTMModel
+
+
+class _Response:
+    def __init__(self, texts):
+        self.texts = texts
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"sentiment": [float(len(text)) for text in self.texts]}
+
+
+class _Session:
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url, json):
+        self.requests.append(json)
+        return _Response(json["texts"])
+
+
+def test_get_sentiments_sends_batches_and_keeps_order():
+    model = BiLSTMModel(batch_size=2, mini_batch_size=8)
+    model.session = _Session()
+    texts = ["good", "bad", "", "not bad", "great"]
+
+    assert_that(model.get_sentiments(texts), equal_to([4.0, 3.0, 0.0, 7.0, 5.0]))
+    assert_that(
+        model.session.requests,
+        equal_to(
+            [
+                {"texts": texts[0:2], "mini_batch_size": 8},
+                {"texts": texts[2:4], "mini_batch_size": 8},
+                {"texts": texts[4:], "mini_batch_size": 8},
+            ]
+        ),
+    )
+    assert_that(model.get_sentiments([]), equal_to([]))
@@ -13,6 +13,10 @@ class ExperimentPaths:
         self.experiment_path.mkdir(exist_ok=True, parents=True)
 
         self.discourse_trees_df = self.output_path / 'discourse_trees_df.pkl'
+        # columnar checkpoint, one Parquet file per column, see aspects.data_io.column_store
+        self.discourse_trees_columns = self.output_path / 'discourse_trees_df'
+        # one columnar checkpoint per chunk of documents in streaming mode, named by its input rows range
+        self.discourse_trees_chunks = self.output_path / 'discourse_trees_df_chunks'
 
         self.aspect_sentiments = self.experiment_path / 'aspect_sentiments.pkl'
         self.aspect_to_aspect_graph = self.experiment_path / 'aspect_2_aspect_graph.pkl'
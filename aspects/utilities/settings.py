@@ -68,17 +68,51 @@ SENTIMENT_MODEL_TESTS = (
 )
 
 SENTIMENT_DOCKER_URL = 'http://localhost:5002/api/sentiment'
+SENTIMENT_BATCH_DOCKER_URL = 'http://localhost:5002/api/sentiment/batch/'
+# EDUs per request to the batch endpoint and per flair predict mini batch
+SENTIMENT_BATCH_SIZE = 256
+SENTIMENT_MINI_BATCH_SIZE = 32
 
 # --------------------------------------------- RST  ----------------------------------------------------------------- #
 
 RST_PARSER_DOCKER_URL = 'http://localhost:5000/api/rst/parse'
+RST_PARSER_BATCH_DOCKER_URL = 'http://localhost:5000/api/rst/parse_batch'
+RST_PARSER_BATCH_SIZE = 16
+RST_PARSER_CONCURRENCY = 8
+# bump the version when the parser or its models change to invalidate cached parse trees
+RST_PARSER_VERSION = 'feng-hirst-gCRF-2'
+RST_PARSE_CACHE_PATH = DATA_PATH / 'cache' / 'rst_parse_trees.sqlite'
 RETRIES_LIMIT = 100
 
+# --------------------------------------------- EDU CACHE ------------------------------------------------------------ #
+
+# sentiment and aspects of EDUs shared between datasets and runs
+EDU_CACHE_PATH = DATA_PATH / 'cache' / 'edu_results.sqlite'
+# results kept in memory
+EDU_CACHE_MAX_SIZE = 100000
+# EDUs missing in cache are extracted in batches of this size
+EDU_CACHE_BATCH_SIZE = 64
+# bump the versions when the models change to invalidate cached results
+SENTIMENT_MODEL_VERSIONS = {'textblob': 'textblob-lexicon-1', 'bilstm': 'flair-en-sentiment-1'}
+ASPECT_EXTRACTOR_VERSION = 'neural-and-ner-aspects-1'
+
+# --------------------------------------------- SERVICES ------------------------------------------------------------- #
+
+# async mode of AspectAnalysis, limit of requests waiting for each of docker services
+SERVICES_MAX_IN_FLIGHT_REQUESTS = 32
+SERVICES_REQUEST_TIMEOUT = 60
+
 # --------------------------------------------- ASPECT MODELS -------------------------------------------------------- #
 
 ASPECT_EXTRACTION_TRAIN_DATASET = DATA_PATH / 'aspects' / 'merged-electronic-aspects-uni-tag.conll'
 
 ASPECT_EXTRACTOR_DOCKER_URL = "http://localhost:5001/api/aspects"
+ASPECT_EXTRACTOR_BATCH_DOCKER_URL = "http://localhost:5001/api/aspects/batch/"
+# EDUs per request to the batch endpoint
+ASPECT_EXTRACTOR_BATCH_SIZE = 256
+# spacy nlp.pipe of NER aspects
+NER_BATCH_SIZE = 256
+NER_N_PROCESS = 1
 
 # --------------------------------------------- EMBEDDINGS ----------------------------------------------------------- #
 
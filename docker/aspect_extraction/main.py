@@ -1,3 +1,5 @@
+from typing import List
+
 import tensorflow as tf
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -14,6 +16,10 @@ class Request(BaseModel):
     text: str
 
 
+class BatchRequest(BaseModel):
+    texts: List[str]
+
+
 @app.post('/api/aspects/')
 async def sentiment(request: Request):
     # get graph to load tf session properly
@@ -21,3 +27,12 @@ async def sentiment(request: Request):
         return {
             'aspects': model.extract(request.text)
         }
+
+
+@app.post('/api/aspects/batch/')
+async def aspects_batch(request: BatchRequest):
+    # all texts are predicted with one model call, aspects are in the order of texts
+    with GRAPH.as_default():
+        return {
+            'aspects': model.extract_many(request.texts)
+        }
@@ -44,15 +44,28 @@ class NeuralAspectExtractor:
         return model, model_info
 
     def extract(self, text):
-        text_padded = self._get_padding(
-            text, self.word_embedding_vocab, self.model_info['sentence_len'])
-        prediction = self.model.predict(text_padded)
+        return self.extract_many([text])[0]
 
-        prediction = prediction[0][:, 2]
+    def extract_many(self, texts, batch_size=256):
+        """
+        Extract aspects of many texts with one predict call, texts are padded into one matrix and
+        predicted in batches of batch_size rows.
+        """
+        docs = [nlp.make_doc(text) for text in texts]
+        if not docs:
+            return []
+        texts_padded = self._get_padding(
+            docs, self.word_embedding_vocab, self.model_info['sentence_len'])
+        predictions = self.model.predict(texts_padded, batch_size=batch_size)
+        return [
+            self._decode_aspects(doc, prediction[:, 2])
+            for doc, prediction in zip(docs, predictions)
+        ]
 
+    def _decode_aspects(self, doc, prediction):
         all_aspects = []
         aspects = []
-        for idx, token in enumerate(nlp.make_doc(text)):
+        for idx, token in enumerate(doc):
             if idx < self.model_info['sentence_len'] and prediction[idx]:
                 aspects.append(token.text)
             else:
@@ -63,13 +76,16 @@ class NeuralAspectExtractor:
             all_aspects.append(' '.join(aspects))
         return all_aspects
 
-    def _get_padding(self, text, vocab, max_padding):
+    def _get_padding(self, docs, vocab, max_padding):
         return pad_sequences(
-            [[
-                vocab[token.text] if token.text in vocab else self.OOV_WORD_ID
-                for token
-                in nlp.make_doc(text)
-            ]],
+            [
+                [
+                    vocab[token.text] if token.text in vocab else self.OOV_WORD_ID
+                    for token
+                    in doc
+                ]
+                for doc in docs
+            ],
             maxlen=max_padding,
             padding='post'
         )
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
+import json
 import os
+import signal
+import subprocess
 import tempfile
+import threading
+from typing import Optional
 
 import hug
 import sh
@@ -10,34 +15,138 @@ PARSER_PATH = "/opt/feng-hirst-rst-parser/src"
 PARSER_EXECUTABLE = (
     "parser_wrapper.py"  # Feng/Hirst uses Python 2, but our API is in Python 3
 )
+RESIDENT_PARSER_EXECUTABLE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resident_parser.py"
+)
+PYTHON2 = os.environ.get("PARSER_PYTHON", "python2")
+# resident parser per worker by default, RESIDENT_PARSER=0 launches parser_wrapper.py per document
+RESIDENT_PARSER = os.environ.get("RESIDENT_PARSER", "1") != "0"
+# seconds the resident parser gets to exit on unload, then it is killed with its JVM and crfsuite
+UNLOAD_TIMEOUT = float(os.environ.get("RESIDENT_PARSER_UNLOAD_TIMEOUT", 10))
 
 
-@hug.post("/api/rst/parse")
-def call_parser(body, response):
+class ParserError(Exception):
+    pass
+
+
+def run_parser(input_file_content: bytes) -> sh.RunningCommand:
     parser = sh.Command(os.path.join(PARSER_PATH, PARSER_EXECUTABLE))
+    with tempfile.NamedTemporaryFile() as input_file:
+        input_file.write(input_file_content)
+        input_file.flush()
+        return parser(input_file.name, _cwd=PARSER_PATH)
+
+
+def parser_error_message(err: sh.ErrorReturnCode) -> str:
+    trace = str(err.stderr, "utf-8")
+    return "{0}\n\n{1}".format(err, trace)
+
+
+class ResidentParser:
+    def __init__(self):
+        """
+        Python 2 process with the Feng/Hirst parser initialized once, see resident_parser.py.
+
+        The process is started on the first document (not to exceed worker boot timeout), a dead
+        process is started again and the document parsed again.
+        """
+        self.process: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.unload()
+        self.process = subprocess.Popen(
+            [PYTHON2, RESIDENT_PARSER_EXECUTABLE, PARSER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=PARSER_PATH,
+            # own process group, hence its JVM and crfsuite children are killed with it
+            start_new_session=True,
+        )
+        if not self.process.stdout.readline():
+            raise ParserError("Resident parser process could not start.")
+
+    def request(self, text: str) -> Optional[dict]:
+        """Response of the process, None if it is dead or its output is not a response."""
+        try:
+            self.process.stdin.write(json.dumps({"input": text}).encode("utf-8") + b"\n")
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+            return json.loads(line) if line else None
+        except (BrokenPipeError, ValueError):
+            # a line that is not JSON leaves the protocol out of sync, the process is restarted
+            return None
+
+    def parse(self, text: str) -> str:
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                self.start()
+            response = self.request(text)
+            if response is None:
+                self.start()
+                response = self.request(text)
+            if response is None:
+                raise ParserError("Resident parser process died while parsing the document.")
+        if response["error"]:
+            raise ParserError(response["error"])
+        return response["tree"]
+
+    def unload(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=UNLOAD_TIMEOUT)
+            except (BrokenPipeError, subprocess.TimeoutExpired):
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        self.process = None
 
+
+resident_parser = ResidentParser()
+
+
+def parse_document(text: str) -> str:
+    if RESIDENT_PARSER:
+        return resident_parser.parse(text)
+    try:
+        return str(run_parser(text.encode("utf-8")).stdout, "utf-8")
+    except sh.ErrorReturnCode as err:
+        raise ParserError(parser_error_message(err))
+
+
+@hug.post("/api/rst/parse")
+def call_parser(body, response):
     if body and "input" in body:
         input_file_content = body["input"]
-        with tempfile.NamedTemporaryFile() as input_file:
-            input_file.write(input_file_content)
-            input_file.flush()
-            try:
-                result = parser(input_file.name, _cwd=PARSER_PATH)
-                with tempfile.NamedTemporaryFile(delete=False) as output_file:
-                    output_file.write(result.stdout)
-                    output_file.flush()
-                    return result.stdout
-
-            except sh.ErrorReturnCode_1 as err:
-                response.status = HTTP_500
-                trace = str(err.stderr, "utf-8")
-                error_msg = "{0}\n\n{1}".format(err, trace).encode("utf-8")
-
-                with tempfile.NamedTemporaryFile(delete=False) as error_file:
-                    error_file.write(error_msg)
-                    error_file.flush()
-                    return error_msg
+        if isinstance(input_file_content, bytes):
+            input_file_content = str(input_file_content, "utf-8")
+        try:
+            return parse_document(input_file_content).encode("utf-8")
+        except ParserError as err:
+            response.status = HTTP_500
+            return str(err).encode("utf-8")
 
     else:
         response.status = HTTP_400
         return {"body": body}
+
+
+@hug.post("/api/rst/parse_batch")
+def call_parser_batch(body, response):
+    """
+    Parse many documents in one request, body: {"texts": [...]}.
+
+    Results keep the order of the input texts, a failing document does not fail the whole batch but
+    gets its error message and an empty tree.
+    """
+    if body and "texts" in body:
+        results = []
+        for text in body["texts"]:
+            try:
+                results.append({"tree": parse_document(text), "error": None})
+            except ParserError as err:
+                results.append({"tree": "", "error": str(err)})
+        return {"results": results}
+    else:
+        response.status = HTTP_400
+        return {"body": body}
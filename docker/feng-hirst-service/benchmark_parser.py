@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Per-document parse latency of parser_wrapper.py launched per document vs. the resident parser.
+
+Usage (in the container): python3 benchmark_parser.py [reviews file, one review per line]
+"""
+import os.path
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from app import ResidentParser, run_parser
+
+default_reviews = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_reviews.txt")
+
+
+def run_parser_per_document(text: str) -> str:
+    return str(run_parser(text.encode("utf-8")).stdout, "utf-8")
+
+
+def benchmark(parse_fn: Callable[[str], str], texts: List[str]) -> Tuple[List[str], List[float]]:
+    trees = []
+    latencies = []
+    for text in texts:
+        start = time.time()
+        trees.append(parse_fn(text))
+        latencies.append(time.time() - start)
+    return trees, latencies
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1] if len(sys.argv) > 1 else default_reviews) as reviews_file:
+        reviews = [line.strip() for line in reviews_file if line.strip()]
+
+    per_document_trees, per_document_latencies = benchmark(run_parser_per_document, reviews)
+
+    resident_parser = ResidentParser()
+    start = time.time()
+    resident_parser.start()
+    # the parser is initialized with the first document, hence it is not measured
+    resident_parser.parse(reviews[0])
+    startup = time.time() - start
+    resident_trees, resident_latencies = benchmark(resident_parser.parse, reviews)
+    resident_parser.unload()
+
+    print("%-8s %15s %15s %10s" % ("review", "per-doc [s]", "resident [s]", "speedup"))
+    for i, (before, after) in enumerate(zip(per_document_latencies, resident_latencies)):
+        print("%-8d %15.3f %15.3f %9.1fx" % (i, before, after, before / after))
+
+    before = sum(per_document_latencies) / len(per_document_latencies)
+    after = sum(resident_latencies) / len(resident_latencies)
+    print("%-8s %15.3f %15.3f %9.1fx" % ("mean", before, after, before / after))
+    print("resident parser start and first document: %.3f s" % startup)
+
+    if per_document_trees != resident_trees:
+        print("*** Trees differ between the per-document and the resident parser!")
+        sys.exit(1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python2
+# -*- coding: utf-8 -*-
+"""
+Resident Feng/Hirst parser, started once per API worker (see app.ResidentParser).
+
+The parser (Python 2) is initialized once - models, the syntax parser JVM and crfsuite stay loaded
+between documents. Requests and responses are JSON lines: {"input": text} on stdin and
+{"tree": output, "error": null} or {"tree": "", "error": message} on stdout. The output of a
+document is exactly what parser_wrapper.py prints for it.
+"""
+import json
+import os
+import sys
+import tempfile
+import traceback
+from StringIO import StringIO
+
+PARSER_PATH = "/opt/feng-hirst-rst-parser/src"
+
+
+class ResidentDiscourseParser(object):
+    """
+    DiscourseParser factory returning the same parser for every call of parser_wrapper.main,
+    unloading is deferred to the exit of the process.
+    """
+
+    def __init__(self, parser_cls):
+        self.parser_cls = parser_cls
+        self.parser = None
+        self.unload = None
+
+    def __call__(self, *args, **kwargs):
+        if self.parser is None:
+            self.parser = self.parser_cls(*args, **kwargs)
+            self.unload = self.parser.unload
+            self.parser.unload = lambda: None
+        return self.parser
+
+
+def parse(parser_wrapper, text):
+    """Output of parser_wrapper.py for text, the input file is removed right after parsing."""
+    stdout = sys.stdout
+    sys.stdout = output = StringIO()
+    try:
+        # the parser reads (and sentence-splits) documents from files only
+        with tempfile.NamedTemporaryFile(suffix='.txt') as input_file:
+            input_file.write(text)
+            input_file.flush()
+            sys.argv = [parser_wrapper.__file__, input_file.name]
+            try:
+                parser_wrapper.main()
+            except SystemExit as e:
+                if e.code:
+                    raise Exception('Parser exited with code %s' % e.code)
+    finally:
+        sys.stdout = stdout
+    return output.getvalue()
+
+
+def main():
+    # responses only on the protocol stream, prints of the parser and its subprocesses go to stderr
+    protocol = os.fdopen(os.dup(1), 'w')
+    os.dup2(2, 1)
+
+    parser_path = sys.argv[1] if len(sys.argv) > 1 else PARSER_PATH
+    os.chdir(parser_path)
+    sys.path.insert(0, parser_path)
+    import parser_wrapper
+    resident_parser = ResidentDiscourseParser(parser_wrapper.DiscourseParser)
+    parser_wrapper.DiscourseParser = resident_parser
+
+    protocol.write(json.dumps({'ready': True}) + '\n')
+    protocol.flush()
+    for line in iter(sys.stdin.readline, ''):
+        text = json.loads(line)['input'].encode('utf-8')
+        try:
+            response = {'tree': parse(parser_wrapper, text).decode('utf-8'), 'error': None}
+        except Exception:
+            response = {'tree': '', 'error': traceback.format_exc()}
+        protocol.write(json.dumps(response) + '\n')
+        protocol.flush()
+
+    if resident_parser.unload is not None:
+        resident_parser.unload()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,3 +15,17 @@ def extract_aspects():
         'tree': parser.parse(text)
     }
     return jsonify(response)
+
+
+@app.route('/api/rst/parse_batch', methods=['POST'])
+def extract_aspects_batch():
+    if not request.json or 'texts' not in request.json:
+        abort(400)
+    results = []
+    # one failing document gets its error and an empty tree, the rest of the batch is still parsed
+    for text in request.json['texts']:
+        try:
+            results.append({'tree': parser.parse(text), 'error': None})
+        except Exception as e:
+            results.append({'tree': '', 'error': str(e)})
+    return jsonify({'results': results})
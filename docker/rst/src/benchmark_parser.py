@@ -0,0 +1,64 @@
+'''
+Per-document parse latency of the discourse parser with one crfsuite-stdin subprocess per
+classification vs. persistent in-process crfsuite taggers, and feature writing time saved per
+document by the tree builder feature cache kept across documents.
+
+Usage: python benchmark_parser.py [text files...]
+'''
+import os.path
+import sys
+import time
+
+from parse import DiscourseParser
+
+default_texts = ['../texts/BGSU1001.txt', '../texts/Emma_4.txt-0', '../texts/wsj_0607.out']
+
+
+def benchmark(parser, texts, repeats=3):
+    trees = []
+    latencies = []
+    cache_stats = []
+    for text in texts:
+        start = time.time()
+        for i in range(repeats):
+            tree = parser.parse(text)
+            if i == 0:
+                # the first parse of a document reuses features of the previous documents only
+                cache_stats.append(parser.treebuilder.feature_cache.document_stats())
+        latencies.append((time.time() - start) / repeats)
+        trees.append(tree)
+    return trees, latencies, cache_stats
+
+
+if __name__ == '__main__':
+    filenames = sys.argv[1:] or default_texts
+    texts = [open(os.path.abspath(filename)).read().decode('utf-8') for filename in filenames]
+
+    results = {}
+    for persistent_tagger in [False, True]:
+        parser = DiscourseParser(persistent_tagger=persistent_tagger)
+        results[persistent_tagger] = benchmark(parser, texts)
+        parser.unload()
+
+    subprocess_trees, subprocess_latencies, _ = results[False]
+    persistent_trees, persistent_latencies, cache_stats = results[True]
+
+    print '%-30s %15s %15s %10s' % ('document', 'subprocess [s]', 'persistent [s]', 'speedup')
+    for (filename, before, after) in zip(filenames, subprocess_latencies, persistent_latencies):
+        print '%-30s %15.3f %15.3f %9.1fx' % (os.path.basename(filename), before, after, before / after)
+
+    before = sum(subprocess_latencies) / len(subprocess_latencies)
+    after = sum(persistent_latencies) / len(persistent_latencies)
+    print '%-30s %15.3f %15.3f %9.1fx' % ('mean', before, after, before / after)
+
+    print
+    print '%-30s %10s %10s %10s %15s %15s' % ('document', 'hits', 'misses', 'hit rate', 'features [s]',
+                                             'saved [s]')
+    for (filename, stats) in zip(filenames, cache_stats):
+        print '%-30s %10d %10d %10.2f %15.3f %15.3f' % (os.path.basename(filename), stats['hits'], stats['misses'],
+                                                         stats['hit_rate'], stats['write_time'],
+                                                         stats['saved_time'])
+
+    if subprocess_trees != persistent_trees:
+        print '*** Trees differ between the subprocess and the persistent tagger!'
+        sys.exit(1)
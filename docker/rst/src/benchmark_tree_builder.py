@@ -0,0 +1,187 @@
+'''
+Greedy merge of the multi-sentential parser on synthetic documents with hundreds of sentences:
+heap of pair scores over a linked list of stumps vs. the previous linear scan of scores and
+splices of the lists of stumps and scores.
+
+Features and classifiers are replaced by cheap deterministic stand-ins. Besides the total time,
+the time of selecting the pair to merge and keeping the scores and stumps is reported - the
+scan and list splices before, heap operations now.
+
+Usage: python benchmark_tree_builder.py [numbers of sentences...]
+'''
+import gc
+import random
+import sys
+import time
+import zlib
+
+from document.doc import Document
+from document.sentence import Sentence
+from document.constituent import Constituent
+from parsers.multi_sentential_parser import MultiSententialParser
+
+LABELS = ['Elaboration[N][S]', 'Joint[N][N]', 'Contrast[N][N]', 'Background[N][S]', 'Attribution[S][N]']
+
+
+class SpanFeatureWriter:
+    def write_features_for_constituents(self, constituents, positions, scope, labeling):
+        features = set()
+        for (i, c) in enumerate(constituents):
+            if c:
+                features.add('Unit%d_Span=%d-%d' % (i, c.l_start, c.r_end))
+                features.add('Unit%d_Rel=%s' % (i, c.get_subtree_rel()))
+        return features
+
+
+class HashClassifier:
+    def __init__(self, labels=None):
+        self.labels = labels
+
+    def classify_many(self, sequences):
+        return [self.classify(vectors) for vectors in sequences]
+
+    def classify(self, vectors):
+        predictions = []
+        for vector in vectors:
+            h = zlib.crc32(vector) & 0xffffffff
+            if self.labels:
+                predictions.append((self.labels[h % len(self.labels)], 0.5))
+            else:
+                # few distinct scores, ties are resolved by the leftmost pair
+                predictions.append((str(h % 2), (h % 20) / 20.0))
+        return (zlib.crc32(''.join(vectors)) & 0xffffffff) % 1000 / 1000.0, predictions
+
+
+class HeapMultiSententialParser(MultiSententialParser):
+    def parse_sequence(self, doc):
+        self.select_time = 0.0
+        MultiSententialParser.parse_sequence(self, doc)
+
+    def set_score(self, stump, bin_score):
+        start = time.time()
+        MultiSententialParser.set_score(self, stump, bin_score)
+        self.select_time += time.time() - start
+
+    def pop_best(self):
+        start = time.time()
+        stump = MultiSententialParser.pop_best(self)
+        self.select_time += time.time() - start
+        return stump
+
+
+class ListMultiSententialParser(MultiSententialParser):
+    """Reference greedy merge as before - scan of all scores and splices of lists per merge."""
+
+    def parse_sequence(self, doc):
+        self.select_time = 0.0
+        for i in range(len(doc.constituents) - 1):
+            doc.constituent_scores.append(self.classify_pair_at(doc, i))
+
+        while len(doc.constituents) > 1:
+            start = time.time()
+            best_one = None
+            max_bin_score = -20.0
+            for (index, bin_score) in enumerate(doc.constituent_scores):
+                if bin_score > max_bin_score:
+                    best_one = index
+                    max_bin_score = bin_score
+            self.select_time += time.time() - start
+
+            self.connect_stumps_at(best_one, doc)
+
+        doc.discourse_tree = doc.constituents[0].parse_subtree
+
+    def classify_pair_at(self, doc, i):
+        max_prob = -20
+        struct_prob = None
+        for (s, j) in self.generate_crf_sequences(doc.constituents, i, labeling=False):
+            (sequence_prob, predictions) = self.parse_single_sequence(s, labeling=False)
+            if sequence_prob > max_prob:
+                max_prob = sequence_prob
+                struct_prob = predictions[j]
+        return struct_prob
+
+    def relabel_stumps_at(self, doc, i):
+        max_prob = -20
+        for (s, j) in self.generate_crf_sequences(doc.constituents, i, labeling=True):
+            (prob, predictions) = self.parse_single_sequence(s, labeling=True)
+            if prob > max_prob:
+                max_prob = prob
+                (s_star, j_star, max_prob_predictions) = (s, j, predictions)
+
+        for (k, c) in enumerate(s_star):
+            if not c.is_leaf():
+                c.parse_subtree.node = max_prob_predictions[k]
+
+        return i - j_star, len(s_star)
+
+    def connect_stumps_at(self, i, doc):
+        L = doc.constituents[i]
+        R = doc.constituents[i + 1]
+        new_constituent = L.make_new_constituent('n/a', R)
+        start = time.time()
+        doc.constituents[i:i + 2] = [new_constituent]
+        self.select_time += time.time() - start
+
+        (start, s_len) = self.relabel_stumps_at(doc, i)
+        for k in range(max(0, start - (self.window_size - 1) / 2 - 1), i):
+            doc.constituent_scores[k] = self.classify_pair_at(doc, k)
+
+        for k in range(i + 2, min(len(doc.constituents) - 1, i + 2 + (self.window_size - 1) / 2 + s_len)):
+            doc.constituent_scores[k] = self.classify_pair_at(doc, k - 1)
+
+        start = time.time()
+        doc.constituent_scores[i: i + 1] = []
+        self.select_time += time.time() - start
+
+
+def random_document(n_sentences, seed=0):
+    """Document of n_sentences already parsed sentences, one EDU each."""
+    rand = random.Random(seed)
+    doc = Document()
+    doc.edus = []
+    doc.cuts = []
+    doc.edu_word_segmentation = []
+    for i in range(n_sentences):
+        sentence = Sentence(i, '', doc)
+        sentence.start_edu = i
+        sentence.end_edu = i + 1
+        edu = ['w%d' % rand.randrange(50) for _ in range(rand.randint(3, 15))]
+        doc.edus.append(edu + ['<s>'])
+        doc.cuts.append((i, i + 1))
+        doc.edu_word_segmentation.append([(0, len(edu))])
+        doc.add_sentence(sentence)
+    doc.constituents = [Constituent(edu, doc, i, i + 1, i + 1, i, i) for (i, edu) in enumerate(doc.edus)]
+    return doc
+
+
+def build(parser_cls, n_sentences):
+    parser = parser_cls()
+    parser.feature_writer = SpanFeatureWriter()
+    parser.bin_classifier = HashClassifier()
+    parser.mc_classifier = HashClassifier(LABELS)
+
+    doc = random_document(n_sentences)
+    # as timeit does, collections of the growing number of objects would blur the scaling
+    gc.disable()
+    start = time.time()
+    parser.parse_sequence(doc)
+    total_time = time.time() - start
+    gc.enable()
+    return str(doc.discourse_tree), total_time, parser.select_time
+
+
+if __name__ == '__main__':
+    sizes = [int(n) for n in sys.argv[1:]] or [100, 400, 1600, 6400]
+
+    print '%-12s %12s %12s %15s %15s %10s' % ('sentences', 'list [s]', 'heap [s]', 'list select [s]',
+                                              'heap select [s]', 'speedup')
+    for n_sentences in sizes:
+        list_tree, list_time, list_select_time = build(ListMultiSententialParser, n_sentences)
+        heap_tree, heap_time, heap_select_time = build(HeapMultiSententialParser, n_sentences)
+        print '%-12d %12.3f %12.3f %15.3f %15.3f %9.1fx' % (n_sentences, list_time, heap_time, list_select_time,
+                                                            heap_select_time, list_select_time / heap_select_time)
+
+        if list_tree != heap_tree:
+            print '*** Trees differ between the list scan and the heap!'
+            sys.exit(1)
@@ -1,23 +1,102 @@
 import subprocess
+import threading
 from os.path import join, exists
 
 import paths
 
+try:
+    # SWIG binding shipped with crfsuite-0.12 (tools/crfsuite/crfsuite-0.12/swig/python)
+    import crfsuite
+except ImportError:
+    crfsuite = None
+
+
+def read_attributes(line):
+    """
+    Split a crfsuite input line into its label and (attribute, value) pairs.
+
+    Mirrors the tokenizer of the crfsuite frontend (frontend/iwa.c): fields are separated by tabs,
+    the first unescaped colon separates an attribute name from its value and backslash escapes
+    colons and backslashes. Attributes without a value get weight 1.0.
+    """
+    tokens = []
+    i = 0
+    n = len(line)
+    while i < n:
+        if line[i] == '\t':
+            i += 1
+            continue
+
+        fields = []
+        for _ in range(2):
+            chars = []
+            while i < n and line[i] not in ':\t':
+                c = line[i]
+                i += 1
+                if c == '\\' and i < n and line[i] in ':\\':
+                    c = line[i]
+                    i += 1
+                chars.append(c)
+            fields.append(''.join(chars))
+            if i < n and line[i] == ':' and len(fields) == 1:
+                i += 1
+            else:
+                break
+        tokens.append((fields[0], fields[1] if len(fields) > 1 else ''))
+
+    if not tokens:
+        return None, []
+
+    attributes = []
+    for name, value in tokens[1:]:
+        attributes.append((name, _atof(value) if value else 1.0))
+    return tokens[0][0], attributes
+
+
+def _atof(value):
+    # crfsuite parses weights with C atof, i.e. the longest numeric prefix or 0.0
+    for end in range(len(value), 0, -1):
+        try:
+            return float(value[:end])
+        except ValueError:
+            continue
+    return 0.0
+
 
 class CRFClassifier:
-    def __init__(self, name, model_type, model_path, model_file, verbose):
+    def __init__(self, name, model_type, model_path, model_file, verbose, persistent=True):
         self.verbose = 1
         self.name = name
         self.type = model_type
         self.model_fname = model_file
         self.model_path = model_path
+        self.classifier = None
+        self.tagger = None
 
         if not exists(join(self.model_path, self.model_fname)):
             print('The model path %s for CRF classifier %s does not exist.' % (
                 join(self.model_path, self.model_fname), name))
             raise OSError('Could not create classifier subprocess')
 
-        self.getConsole()
+        if persistent and crfsuite is None:
+            print('crfsuite python binding is not installed, classifier %s falls back to '
+                  'one crfsuite-stdin subprocess per classification.' % name)
+
+        self.persistent = persistent and crfsuite is not None
+        if self.persistent:
+            self.lock = threading.Lock()
+            self.load_tagger()
+        else:
+            self.getConsole()
+
+    def load_tagger(self):
+        """
+        Load the model once into an in-process crfsuite tagger that is reused by every classify call.
+        """
+        self.tagger = crfsuite.Tagger()
+        if not self.tagger.open(join(self.model_path, self.model_fname)):
+            raise OSError('Could not load CRF model %s' % join(self.model_path, self.model_fname))
+        return self.tagger
 
     def getConsole(self):
         self.classifier_cmd = '%s/crfsuite-stdin tag -pi -m %s -' % (
@@ -34,33 +113,79 @@ class CRFClassifier:
         return self.classifier
 
     def classify(self, vectors):
-        out, err = self.getConsole().communicate('\n'.join(vectors) + "\n\n")
-        lines = out.split("\n")
+        return self.classify_many([vectors])[0]
+
+    def classify_many(self, sequences):
+        """
+        Tags several sequences (lists of feature vectors) in one crfsuite call - one subprocess
+        run or one hold of the in-process tagger. Returns (sequence probability, predictions) of
+        every sequence in their order, predictions are (label, marginal probability) of each item.
+        """
+        if self.persistent:
+            return self.classify_in_process(sequences)
+
+        # crfsuite input separates sequences by an empty line
+        out, err = self.getConsole().communicate(''.join('\n'.join(vectors) + '\n\n' for vectors in sequences))
 
         if self.classifier.poll():
             raise OSError('crf_classifier subprocess died. Error: {}'.format(err))
 
-        predictions = []
-        for line in lines[1:]:
+        # -p prints "@probability\t<p>" before the "label:marginal" lines of each sequence
+        results = []
+        for line in out.split('\n'):
             line = line.strip()
-            if line != '':
+            if line.startswith('@probability'):
+                results.append((float(line.split('\t')[1]), []))
+            elif line != '':
                 fields = line.split(':')
                 label = fields[0]
                 prob = float(fields[1])
-                predictions.append((label, prob))
+                results[-1][1].append((label, prob))
+
+        if len(results) != len(sequences):
+            raise OSError('crf_classifier tagged %d sequences out of %d' % (len(results), len(sequences)))
+        return results
+
+    def classify_in_process(self, sequences):
+        xseqs = []
+        for vectors in sequences:
+            xseq = crfsuite.ItemSequence()
+            for vector in vectors:
+                item = crfsuite.Item()
+                for (attribute, value) in read_attributes(vector)[1]:
+                    item.append(crfsuite.Attribute(attribute, value))
+                xseq.append(item)
+            xseqs.append(xseq)
+
+        results = []
+        # the tagger keeps the sequence as state, hence one sequence at a time per model
+        with self.lock:
+            for xseq in xseqs:
+                self.tagger.set(xseq)
+                yseq = self.tagger.viterbi()
+                # round as crfsuite-stdin prints with %f, so the trees do not depend on the backend
+                seq_prob = float('%f' % self.tagger.probability(yseq))
+                predictions = [(label, float('%f' % self.tagger.marginal(label, t)))
+                               for (t, label) in enumerate(yseq)]
+                results.append((seq_prob, predictions))
 
-        seq_prob = float(lines[0].split('\t')[1])
-        return seq_prob, predictions
+        return results
 
     def poll(self):
         """
         Checks that the classifier processes are still alive
         """
+        if self.persistent:
+            return self.tagger is None
         if self.classifier is None:
             return True
         else:
             return self.classifier.poll() != None
 
     def unload(self):
-        if self.classifier and not self.poll():
+        if self.persistent:
+            if self.tagger is not None:
+                self.tagger.close()
+                self.tagger = None
+        elif self.classifier and not self.poll():
             self.classifier.stdin.write('\n')
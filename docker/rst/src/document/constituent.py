@@ -29,6 +29,11 @@ class Constituent:
         self.left_child = None
         self.right_child = None
 
+        # the structure of parse_subtree does not change (only relations are relabeled), hence
+        # its height and number of EDUs are computed once - from children for merged constituents
+        self.subtree_height = None
+        self.num_edus = None
+
     def __str__(self):
         return self.print_span()
 
@@ -39,10 +44,13 @@ class Constituent:
         return '(%d, %d, %d)' % (self.l_start, self.l_end, self.r_end)
 
     def get_subtree_height(self):
-        if isinstance(self.parse_subtree, ParseTree):
-            return self.parse_subtree.height()
-        else:
-            return 1
+        if self.subtree_height is None:
+            if isinstance(self.parse_subtree, ParseTree):
+                self.subtree_height = self.parse_subtree.height()
+            else:
+                self.subtree_height = 1
+
+        return self.subtree_height
 
     def get_subtree_in_span(self, pos='L'):
         assert pos == 'L' or pos == 'R'
@@ -91,8 +99,11 @@ class Constituent:
         return 1 if not isinstance(t, ParseTree) else len(t.leaves())
 
     def get_num_edus(self):
-        t = self.parse_subtree
-        return 1 if not isinstance(t, ParseTree) else len(t.leaves())
+        if self.num_edus is None:
+            t = self.parse_subtree
+            self.num_edus = 1 if not isinstance(t, ParseTree) else len(t.leaves())
+
+        return self.num_edus
 
     def get_num_edus_in_left(self):
         return self.get_num_edus_in_span('L')
@@ -256,5 +267,7 @@ class Constituent:
 
         new_c.left_child = self
         new_c.right_child = c
+        new_c.subtree_height = max(self.get_subtree_height(), c.get_subtree_height()) + 1
+        new_c.num_edus = self.get_num_edus() + c.get_num_edus()
 
         return new_c
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from nltk.tree import Tree
+
+
+class FeatureCache:
+
+    def __init__(self, max_size=None):
+        """
+        Bounded LRU cache of CRF feature strings of constituent windows, shared by the intra- and
+        multi-sentential parsers and kept by the tree builder across documents.
+
+        Keys are built by the parsers from the content the features are computed from (see
+        get_content_key and BaseParser.get_features_key), never from positions alone, hence
+        entries are reused by later documents only when the features would be the same.
+
+        max_size - number of feature strings, FEATURE_CACHE_SIZE environment variable or 20000
+        by default
+        """
+        self.max_size = max_size or int(os.environ.get('FEATURE_CACHE_SIZE', 20000))
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_time = 0.0
+        self.new_document()
+
+    def new_document(self):
+        """Starts per-document counters, totals are kept."""
+        self.document_hits = 0
+        self.document_misses = 0
+        self.document_write_time = 0.0
+
+    def get(self, key):
+        with self.lock:
+            features_str = self.entries.pop(key, None)
+            if features_str is None:
+                return None
+            # most recently used entries are at the end
+            self.entries[key] = features_str
+            self.hits += 1
+            self.document_hits += 1
+            return features_str
+
+    def put(self, key, features_str, write_time=0.0):
+        """Adds features written in write_time seconds, the least recently used are evicted."""
+        with self.lock:
+            self.misses += 1
+            self.document_misses += 1
+            self.write_time += write_time
+            self.document_write_time += write_time
+
+            self.entries[key] = features_str
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def mean_write_time(self):
+        return self.write_time / self.misses if self.misses else 0.0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits * 1.0 / lookups if lookups else 0.0
+
+    def document_stats(self):
+        """
+        Lookups of the current document, saved_time is the feature writing time of its hits
+        estimated by the mean writing time of all misses.
+        """
+        lookups = self.document_hits + self.document_misses
+        return {
+            'hits': self.document_hits,
+            'misses': self.document_misses,
+            'hit_rate': self.document_hits * 1.0 / lookups if lookups else 0.0,
+            'write_time': self.document_write_time,
+            'saved_time': self.document_hits * self.mean_write_time(),
+        }
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+            'write_time': self.write_time,
+            'saved_time': self.hits * self.mean_write_time(),
+        }
+
+
+def get_content_key(doc, sentence_ids):
+    """
+    Digest of everything tree features read from sentences of doc: EDU tokens (with paragraph
+    marks), EDU word segmentation, lexicalized syntax trees (with heads) and sentence cuts
+    relative to the first sentence.
+    """
+    digest = hashlib.sha1()
+    offset = doc.cuts[sentence_ids[0]][0]
+    for sent_id in sentence_ids:
+        (start_edu, end_edu) = doc.cuts[sent_id]
+        digest.update(repr((start_edu - offset, end_edu - offset,
+                            doc.edus[start_edu:end_edu],
+                            doc.edu_word_segmentation[sent_id],
+                            get_tree_key(doc.sentences[sent_id].parse_tree))))
+    return digest.digest()
+
+
+def get_tree_key(t):
+    """Nodes of a syntax tree in pre-order with their heads and leaves, the tree is determined by it."""
+    return [(subtree.node, getattr(subtree, 'head', None), getattr(subtree, 'head_sup', None),
+             tuple(None if isinstance(child, Tree) else child for child in subtree))
+            for subtree in t.subtrees()]
@@ -11,7 +11,7 @@ from treebuilder.build_tree_CRF import CRFTreeBuilder
 class DiscourseParser(object):
     def __init__(self, output_dir=None, verbose=False,
                  skip_parsing=False, global_features=False,
-                 save_preprocessed_doc=False, preprocesser=None):
+                 save_preprocessed_doc=False, preprocesser=None, persistent_tagger=True):
 
         self.output_dir = os.path.join(output_dir if output_dir is not None else '')
         self.feature_sets = 'gCRF'
@@ -27,9 +27,11 @@ class DiscourseParser(object):
         self.preprocesser = Preprocesser()
 
         self.segmenter = CRFSegmenter(
-            _name=self.feature_sets, verbose=self.verbose, global_features=self.global_features)
+            _name=self.feature_sets, verbose=self.verbose, global_features=self.global_features,
+            persistent_tagger=persistent_tagger)
         if not self.skip_parsing:
-            self.treebuilder = CRFTreeBuilder(_name=self.feature_sets, verbose=self.verbose)
+            self.treebuilder = CRFTreeBuilder(
+                _name=self.feature_sets, verbose=self.verbose, persistent_tagger=persistent_tagger)
         else:
             self.treebuilder = None
 
@@ -1,18 +1,82 @@
+import time
+
+from features_parser.feature_cache import FeatureCache, get_content_key
+
+
 class BaseParser:
     def __init__(self, name, verbose=False, window_size=3):
         self.name = name
         self.verbose = verbose
         self.window_size = window_size
 
-        self.cached_mc_features = {}
-        self.cached_struct_features = {}
+        self.feature_cache = FeatureCache()
+        self.content_key = None
+        self.edu_offset = 0
 
     def clear_cache(self):
-        self.cached_mc_features = {}
-        self.cached_struct_features = {}
+        self.feature_cache.clear()
+
+    def set_content(self, doc, sentence_ids):
+        """
+        Sentences parsed next, feature cache keys cover their content and spans relative to the
+        first of them, hence features are reused across documents with the same content.
+        """
+        self.content_key = get_content_key(doc, sentence_ids)
+        self.edu_offset = doc.cuts[sentence_ids[0]][0]
+
+    def get_features_key(self, constituents, labeling):
+        """
+        Cache key of features of constituents window: parsed content, spans of constituents and
+        what the features read from their discourse subtrees (relation of the root and height).
+        """
+        spans = []
+        for c in constituents:
+            if c:
+                spans.append((c.l_start - self.edu_offset, c.l_end - self.edu_offset,
+                              c.r_end - self.edu_offset, c.get_subtree_rel(), c.get_subtree_height()))
+            else:
+                spans.append(None)
+
+        return self.scope, labeling, self.content_key, tuple(spans)
+
+    def write_features(self, constituents, positions, labeling):
+        key = self.get_features_key(constituents, labeling)
+        inst_features_str = self.feature_cache.get(key)
+        if inst_features_str is None:
+            if self.verbose:
+                for (i, c) in enumerate(constituents):
+                    print 'c%d:' % i, c
+
+            start = time.time()
+            inst_features = self.feature_writer.write_features_for_constituents(constituents, positions,
+                                                                                self.scope,
+                                                                                labeling=labeling)
+            inst_features_str = '\t'.join(list(inst_features))
+            self.feature_cache.put(key, inst_features_str, time.time() - start)
+
+        return inst_features_str
 
     def parse_single_sequence(self, s, labeling):
+        return self.parse_sequences([s], labeling)[0]
+
+    def parse_sequences(self, sequences, labeling):
+        """
+        (sequence probability, scores) of every sequence of constituents, all of them are tagged
+        in one classifier call.
+        """
+        if not labeling:
+            classifier = self.bin_classifier
+        else:
+            classifier = self.mc_classifier
+
+        #        print classifier.name
+        results = classifier.classify_many([self.write_sequence_features(s, labeling) for s in sequences])
+
+        return [(sequence_prob, self.get_scores(predictions, labeling)) for (sequence_prob, predictions) in results]
+
+    def write_sequence_features(self, s, labeling):
         features = []
+        positions = [-1, 0, 1]
 
         if not labeling:
             for k in range(len(s) - 1):
@@ -29,40 +93,7 @@ class BaseParser:
                 else:
                     c3 = s[k + 2]
 
-                C = [c0, c1, c2, c3]
-                if c0:
-                    c0_num_edus = c0.get_num_edus()
-                else:
-                    c0_num_edus = 0
-
-                c1_tot = c1.l_start
-                c1_num_edus = c1.get_num_edus()
-                c2_num_edus = c2.get_num_edus()
-
-                if c3:
-                    c3_num_edus = c3.get_num_edus()
-                else:
-                    c3_num_edus = 0
-
-                positions = [-1, 0, 1]
-                hash_key = (c1_tot, c0_num_edus, c1_num_edus, c2_num_edus, c3_num_edus)
-
-                if hash_key in self.cached_struct_features:
-                    #                if False:
-                    inst_features_str = self.cached_struct_features[hash_key]
-                else:
-                    if self.verbose:
-                        print 'c0:', c0
-                        print 'c1:', c1
-                        print 'c2:', c2
-                        print 'c3:', c3
-                    inst_features = self.feature_writer.write_features_for_constituents(C, positions,
-                                                                                        self.scope,
-                                                                                        labeling=False)
-
-                    inst_features_str = '\t'.join(list(inst_features))
-                    self.cached_struct_features[hash_key] = inst_features_str
-
+                inst_features_str = self.write_features([c0, c1, c2, c3], positions, labeling=False)
                 features.append('%d\t%s' % (0, inst_features_str))
 
         else:
@@ -83,50 +114,15 @@ class BaseParser:
                     c1 = c.left_child
                     c2 = c.right_child
 
-                    C = [c0, c1, c2, c3]
-                    if c0:
-                        c0_num_edus = c0.get_num_edus()
-                    else:
-                        c0_num_edus = 0
-
-                    c1_tot = c1.l_start
-                    c1_num_edus = c1.get_num_edus()
-                    c2_num_edus = c2.get_num_edus()
-
-                    if c3:
-                        c3_num_edus = c3.get_num_edus()
-                    else:
-                        c3_num_edus = 0
-
-                    positions = [-1, 0, 1]
-                    hash_key = (c1_tot, c0_num_edus, c1_num_edus, c2_num_edus, c3_num_edus)
-                    if self.verbose:
-                        print 'c0:', c0
-                        print 'c1:', c1
-                        print 'c2:', c2
-                        print 'c3:', c3
-
-                    if hash_key in self.cached_mc_features:
-                        inst_features_str = self.cached_mc_features[hash_key]
-                    else:
-                        inst_features = self.feature_writer.write_features_for_constituents(
-                            C, positions, self.scope, labeling=True)
-
-                        inst_features_str = '\t'.join(list(inst_features))
-                        self.cached_mc_features[hash_key] = inst_features_str
+                    inst_features_str = self.write_features([c0, c1, c2, c3], positions, labeling=True)
                 else:
                     inst_features_str = 'Num_EDUs=1'
 
                 features.append('%d\t%s' % (0, inst_features_str))
 
-        if not labeling:
-            classifier = self.bin_classifier
-        else:
-            classifier = self.mc_classifier
-
-        #        print classifier.name
-        (sequence_prob, predictions) = classifier.classify(features)
+        return features
 
+    def get_scores(self, predictions, labeling):
         scores = []
         for i in range(len(predictions)):
             (prediction, prob) = predictions[i]
@@ -140,7 +136,7 @@ class BaseParser:
             else:
                 scores.append(prediction)
 
-        return sequence_prob, scores
+        return scores
 
     def generate_crf_sequences(self, stumps, i, labeling=False):
         if self.scope:
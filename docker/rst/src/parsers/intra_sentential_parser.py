@@ -91,7 +91,7 @@ class IntraSententialParser(BaseParser):
                     print
 
     def parse_each_sentence(self, sentence):
-        self.clear_cache()
+        self.set_content(sentence.doc, [sentence.sent_id])
 
         sentence.prepare_parsing()
 
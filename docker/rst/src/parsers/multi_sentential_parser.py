@@ -1,12 +1,59 @@
+import heapq
+import itertools
+
 from base_parser import BaseParser
 
 
+class Stump:
+    def __init__(self, constituent):
+        """
+        Constituent in the linked list of stumps of a document, score is the structure probability
+        of the pair of this stump and the next one.
+        """
+        self.constituent = constituent
+        self.prev = None
+        self.next = None
+        self.score = None
+        # heap entry of the current score, older entries of the stump are stale
+        self.entry = None
+
+    def neighbours(self, before, after):
+        """
+        Constituents of up to before stumps on the left, this stump and up to after stumps on the
+        right, with the index of this stump among them.
+        """
+        constituents = [self.constituent]
+        stump = self.prev
+        while stump is not None and len(constituents) <= before:
+            constituents.append(stump.constituent)
+            stump = stump.prev
+        constituents.reverse()
+        i = len(constituents) - 1
+
+        stump = self.next
+        while stump is not None and len(constituents) <= i + after:
+            constituents.append(stump.constituent)
+            stump = stump.next
+
+        return constituents, i
+
+    def walk_left(self, steps):
+        stump = self
+        while steps > 0 and stump.prev is not None:
+            stump = stump.prev
+            steps -= 1
+        return stump
+
+
 class MultiSententialParser(BaseParser):
     def __init__(self, name='MultiParser', verbose=False, window_size=3):
         BaseParser.__init__(self, name, verbose, window_size)
 
         self.scope = False
 
+        self.heap = []
+        self.entry_ids = itertools.count()
+
     def add_classifier(self, classifier, name):
         if name == 'bin':
             self.bin_classifier = classifier
@@ -18,61 +65,95 @@ class MultiSententialParser(BaseParser):
         print 'Added classifier', name, 'to treebuilder', self.name
 
     def parse_document(self, doc):
-        self.clear_cache()
+        self.set_content(doc, range(len(doc.sentences)))
 
         doc.prepare_parsing()
 
         return self.parse_sequence(doc)
 
     def parse_sequence(self, doc):
+        """
+        Greedy bottom-up merging of the best scored pair of stumps.
+
+        Stumps are a linked list and scores of pairs are kept in a heap ordered by score and
+        position of the pair, re-scored pairs get a new entry and their old entries are skipped
+        when popped. A merge costs O(log n) instead of a scan of all scores, ties are broken by
+        the leftmost pair as before.
+        """
         if len(doc.constituents) == 1:
             doc.discourse_tree = doc.constituents[0].parse_subtree
             return
 
-        for i in range(len(doc.constituents) - 1):
-            bin_score = self.classify_pair(doc, i)
-            doc.constituent_scores.append(bin_score)
+        stumps = [Stump(c) for c in doc.constituents]
+        for (L, R) in zip(stumps, stumps[1:]):
+            L.next = R
+            R.prev = L
 
-        seq_prob = None
-        while len(doc.constituents) > 1:
-            best_one = None
-            max_bin_score = -20.0
-            for (index, bin_score) in enumerate(doc.constituent_scores):
-                if bin_score > max_bin_score:
-                    best_one = index
-                    max_bin_score = bin_score
+        self.heap = []
+        for (stump, bin_score) in zip(stumps[:-1], self.classify_pairs(stumps[:-1])):
+            self.set_score(stump, bin_score)
 
-            seq_prob = self.connect_stumps(best_one, doc)
+        for _ in range(len(stumps) - 1):
+            stump = self.connect_stumps(self.pop_best())
+        self.heap = []
 
         if doc.constituents:
-            doc.discourse_tree = doc.constituents[0].parse_subtree
+            doc.constituents = [stump.constituent]
+            doc.constituent_scores = []
+            doc.discourse_tree = stump.constituent.parse_subtree
         else:
             doc.discourse_tree = u''
 
-    def classify_pair(self, doc, i):
+    def set_score(self, stump, bin_score):
+        stump.score = bin_score
+        # leftmost pair first among equal scores, the entry id only makes entries unique
+        stump.entry = (-bin_score, stump.constituent.l_start, next(self.entry_ids), stump)
+        heapq.heappush(self.heap, stump.entry)
+
+    def pop_best(self):
+        while True:
+            entry = heapq.heappop(self.heap)
+            stump = entry[-1]
+            if stump.entry is entry:
+                return stump
+
+    def classify_pair(self, stump):
+        return self.classify_pairs([stump])[0]
+
+    def classify_pairs(self, stumps):
+        """
+        Structure probabilities of pairs of each of stumps and its next stump, candidate sequences
+        of all the pairs are tagged in one classifier call.
+        """
+        candidates = []
+        for stump in stumps:
+            (constituents, i) = stump.neighbours(self.window_size - 1, self.window_size)
+            for (s, j) in self.generate_crf_sequences(constituents, i, labeling=False):
+                candidates.append((stump, s, j))
+
+        if not candidates:
+            return []
+
+        results = self.parse_sequences([s for (stump, s, j) in candidates], labeling=False)
+
+        max_probs = {}
+        struct_probs = {}
+        for ((stump, s, j), (sequence_prob, predictions)) in zip(candidates, results):
+            if sequence_prob > max_probs.get(stump, -20):
+                max_probs[stump] = sequence_prob
+                struct_probs[stump] = predictions[j]
+
+        return [struct_probs[stump] for stump in stumps]
+
+    def relabel_stumps(self, stump):
         max_prob = -20
         max_prob_sequence = None
         max_prob_predictions = None
 
-        for (s, j) in self.generate_crf_sequences(doc.constituents, i, labeling=False):
-            (sequence_prob, predictions) = self.parse_single_sequence(s, labeling=False)
-
-            if sequence_prob > max_prob:
-                max_prob = sequence_prob
-                max_prob_sequence = (s, j)
-                max_prob_predictions = predictions
-
-        (s_star, j_star) = max_prob_sequence
-        struct_prob = max_prob_predictions[j_star]
-        return struct_prob
-
-    def relabel_stumps(self, doc, i):
-        max_prob = -20
-        max_prob_sequence = None
-        max_prob_predictions = None
-
-        for (s, j) in self.generate_crf_sequences(doc.constituents, i, labeling=True):
-            (prob, predictions) = self.parse_single_sequence(s, labeling=True)
+        (constituents, i) = stump.neighbours(self.window_size - 1, self.window_size - 1)
+        candidates = self.generate_crf_sequences(constituents, i, labeling=True)
+        results = self.parse_sequences([s for (s, j) in candidates], labeling=True)
+        for ((s, j), (prob, predictions)) in zip(candidates, results):
             if prob > max_prob:
                 max_prob = prob
                 max_prob_sequence = (s, j)
@@ -99,28 +180,51 @@ class MultiSententialParser(BaseParser):
                     print 'with predicted label', predicted_label
                     print
 
-        return max_prob, i - j_star, len(s_star)
+        return max_prob, stump.walk_left(j_star), len(s_star)
 
-    def connect_stumps(self, i, doc):
+    def connect_stumps(self, L):
+        """Merges stump L with the next one, returns the new stump."""
+        R = L.next
         if self.verbose:
-            print 'Connecting stumps[%d] and stumps[%d]' % (i, i + 1)
-            print 'stumps[%d]' % i, doc.constituents[i]
+            print 'Connecting stumps %s and %s' % (L.constituent, R.constituent)
+            print 'L', L.constituent
             print
-            print 'stumps[%d]' % (i + 1), doc.constituents[i + 1]
-
-        L = doc.constituents[i]
-        R = doc.constituents[i + 1]
-        new_constituent = L.make_new_constituent('n/a', R)
-        doc.constituents[i:i + 2] = [new_constituent]
-
-        (seq_prob, start, s_len) = self.relabel_stumps(doc, i)
-        for k in range(max(0, start - (self.window_size - 1) / 2 - 1), i):
-            bin_score = self.classify_pair(doc, k)
-            doc.constituent_scores[k] = bin_score
-
-        for k in range(i + 2, min(len(doc.constituents) - 1, i + 2 + (self.window_size - 1) / 2 + s_len)):
-            bin_score = self.classify_pair(doc, k - 1)
-            doc.constituent_scores[k] = bin_score
-
-        doc.constituent_scores[i: i + 1] = []
-        return seq_prob
+            print 'R', R.constituent
+
+        new_constituent = L.constituent.make_new_constituent('n/a', R.constituent)
+        stump = Stump(new_constituent)
+        stump.prev = L.prev
+        stump.next = R.next
+        if stump.prev is not None:
+            stump.prev.next = stump
+        if stump.next is not None:
+            stump.next.prev = stump
+        L.entry = None
+        R.entry = None
+
+        # the pair of the new stump and the next one keeps the score of R and the next one
+        if R.score is not None and stump.next is not None:
+            self.set_score(stump, R.score)
+
+        (seq_prob, start, s_len) = self.relabel_stumps(stump)
+
+        # pairs around the relabeled sequence are scored again: from (window_size - 1) / 2 + 1
+        # stumps left of its start to the pair left of the new stump, and up to
+        # (window_size - 1) / 2 + s_len pairs right of the new stump except the last pair
+        pairs = []
+        left = start.walk_left((self.window_size - 1) / 2 + 1)
+        while left is not stump:
+            pairs.append(left)
+            left = left.next
+
+        right = stump.next
+        for _ in range((self.window_size - 1) / 2 + s_len):
+            if right is None or right.next is None or right.next.next is None:
+                break
+            pairs.append(right)
+            right = right.next
+
+        for (pair, bin_score) in zip(pairs, self.classify_pairs(pairs)):
+            self.set_score(pair, bin_score)
+
+        return stump
@@ -6,17 +6,20 @@ from document.dependency import Dependency
 from document.sentence import Sentence
 from document.token import Token
 from prep import prep_utils
-from prep.syntax_parser import SyntaxParser
+from prep.syntax_parser import SyntaxParserPool
 from trees.lexicalized_tree import LexicalizedTree
 
 
 class Preprocesser:
 
-    def __init__(self):
+    def __init__(self, syntax_parsers=None):
+        """
+        syntax_parsers - number of syntax parser JVMs parsing sentences of a document in parallel
+        """
         self.syntax_parser = None
 
         try:
-            self.syntax_parser = SyntaxParser()
+            self.syntax_parser = SyntaxParserPool(syntax_parsers)
         except Exception as e:
             raise Exception(str(e) + 'Please check paths.py file and ROOT PATH if it points to the right directory')
 
@@ -26,9 +29,11 @@ class Preprocesser:
     def parse_single_sentence(self, raw_text):
         return self.syntax_parser.parse_sentence(raw_text)
 
-    def process_single_sentence(self, doc, raw_text):
+    def process_single_sentence(self, doc, raw_text, parse_result=None):
         sentence = Sentence(len(doc.sentences), raw_text, doc)
-        parse_tree_str, deps_str = self.parse_single_sentence(raw_text)
+        if parse_result is None:
+            parse_result = self.parse_single_sentence(raw_text)
+        parse_tree_str, deps_str = parse_result
 
         parse = LexicalizedTree.fromstring(parse_tree_str, leaf_pattern='(?<=\\s)[^\)\(]+')
         sentence.set_unlexicalized_tree(parse)
@@ -63,8 +68,10 @@ class Preprocesser:
 
     def preprocess(self, text, doc):
         doc.sentences = []
-        for sentence in self.nlp(unicode(text)).sents:
-            self.process_single_sentence(doc, sentence.text)
+        sentences = [sentence.text for sentence in self.nlp(unicode(text)).sents]
+        # sentences are parsed in parallel and added to the document in order
+        for raw_text, parse_result in zip(sentences, self.syntax_parser.parse_sentences(sentences)):
+            self.process_single_sentence(doc, raw_text, parse_result)
 
     def unload(self):
         if self.syntax_parser:
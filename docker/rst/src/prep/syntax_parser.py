@@ -1,4 +1,8 @@
+import logging
+import os
 import subprocess
+import threading
+from Queue import Empty, Queue
 
 from paths import STANFORD_PARSER_PATH
 
@@ -19,14 +23,14 @@ class SyntaxParser:
         self.syntax_parser.stdin.write("%s\n" % s.strip())
         self.syntax_parser.stdin.flush()
 
-        # Read stderr anyway to avoid problems
-        cur_line = "debut"
-
         finished_penn_parse = False
         penn_parse_result = ""
         dep_parse_results = []
-        while cur_line != "":
+        while True:
             cur_line = self.syntax_parser.stdout.readline()
+            # end of output of the process, also in the middle of the penn or dependency parse
+            if cur_line == "":
+                raise IOError('Syntax parser process closed its output, parsing of:' + s + '--')
             # Check for errors
             if cur_line.strip() == "SENTENCE_SKIPPED_OR_UNPARSABLE":
                 raise Exception("Syntactic parsing of the following sentence failed:" + s + "--")
@@ -59,3 +63,93 @@ class SyntaxParser:
             self.syntax_parser.stdin.close()
             self.syntax_parser.stdout.close()
             self.syntax_parser.stderr.close()
+
+
+class SyntaxParserPool:
+
+    def __init__(self, size=None, parser_factory=SyntaxParser):
+        """
+        K warm SyntaxParser JVMs, sentences of a document are parsed by all of them in parallel.
+
+        A parser is checked out by one thread at a time (uwsgi threads share the pool). A dead JVM
+        is restarted and its sentence parsed again, hence it does not fail the request.
+
+        Every JVM takes up to 1000 MB of heap and every uwsgi process has its own pool, hence a
+        size above 1 multiplies the memory of the service by it.
+
+        size - number of JVMs, SYNTAX_PARSER_POOL_SIZE environment variable or 1 by default
+        """
+        self.size = size or int(os.environ.get('SYNTAX_PARSER_POOL_SIZE', 1))
+        self.parser_factory = parser_factory
+        self.parsers = [self.parser_factory() for _ in range(self.size)]
+        self.idle = Queue()
+        for parser in self.parsers:
+            self.idle.put(parser)
+
+    def parse_sentence(self, s):
+        return self.parse_sentences([s])[0]
+
+    def parse_sentences(self, sentences):
+        """
+        Penn and dependency parses of sentences in their order, the first parse error is raised.
+        """
+        results = [None] * len(sentences)
+        errors = []
+        tasks = Queue()
+        for task in enumerate(sentences):
+            tasks.put(task)
+
+        def work():
+            parser = self.idle.get()
+            try:
+                while not errors:
+                    try:
+                        i, s = tasks.get_nowait()
+                    except Empty:
+                        return
+                    try:
+                        results[i], parser = self._parse_with_restart(parser, s)
+                    except Exception as e:
+                        errors.append(e)
+            finally:
+                self.idle.put(parser)
+
+        workers = [threading.Thread(target=work) for _ in range(min(self.size, len(sentences)))]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def _parse_with_restart(self, parser, s):
+        if parser.poll():
+            parser = self._restart(parser)
+        try:
+            return parser.parse_sentence(s), parser
+        except (IOError, OSError):
+            # JVM died while parsing - broken pipe or end of its output
+            parser = self._restart(parser)
+            return parser.parse_sentence(s), parser
+
+    def _restart(self, parser):
+        logging.warning('Syntax parser JVM is dead, restarting it.')
+        try:
+            parser.unload()
+        except (IOError, OSError, ValueError):
+            pass
+        new_parser = self.parser_factory()
+        self.parsers[self.parsers.index(parser)] = new_parser
+        return new_parser
+
+    def poll(self):
+        """
+        Checks that all parser processes are dead
+        """
+        return all(parser.poll() for parser in self.parsers)
+
+    def unload(self):
+        for parser in self.parsers:
+            parser.unload()
@@ -6,9 +6,10 @@ from features_parser.segmenter_feature_writer import SegmenterFeatureWriter
 
 
 class CRFSegmenter:
-    def __init__(self, _name='crf_segmenter', verbose=False, global_features=False):
+    def __init__(self, _name='crf_segmenter', verbose=False, global_features=False, persistent_tagger=True):
         self.name = _name
         self.verbose = verbose
+        self.persistent_tagger = persistent_tagger
 
         self.feature_writer = SegmenterFeatureWriter()
 
@@ -24,7 +25,8 @@ class CRFSegmenter:
             model_type='segmenter',
             model_path=paths.SEGMENTER_MODEL_PATH,
             model_file='seg.crfsuite',
-            verbose=self.verbose
+            verbose=self.verbose,
+            persistent=self.persistent_tagger
         )
         self.add_classifier(classifier1, 'classifier1')
 
@@ -34,7 +36,8 @@ class CRFSegmenter:
                 model_type='segmenter',
                 model_path=paths.SEGMENTER_MODEL_PATH,
                 model_file='seg_global_features.crfsuite',
-                verbose=self.verbose
+                verbose=self.verbose,
+                persistent=self.persistent_tagger
             )
 
             self.add_classifier(classifier2, 'classifier2')
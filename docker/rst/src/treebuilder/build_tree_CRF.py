@@ -1,5 +1,8 @@
+import threading
+
 import paths
 from classifiers.crf_classifier import CRFClassifier
+from features_parser.feature_cache import FeatureCache
 from features_parser.tree_feature_writer import CRFTreeFeatureWriter
 from parsers.intra_sentential_parser import IntraSententialParser
 from parsers.multi_sentential_parser import MultiSententialParser
@@ -7,15 +10,20 @@ from trees.parse_tree import ParseTree
 
 
 class CRFTreeBuilder:
-    def __init__(self, _name="gCRF", verbose=False):
+    def __init__(self, _name="gCRF", verbose=False, persistent_tagger=True):
         self.name = _name
         self.verbose = verbose
+        self.persistent_tagger = persistent_tagger
         self.window_size = 3
+        # uwsgi threads share the tree builder, parsers keep state of the document being parsed
+        # (feature cache content key, heap of pair scores), hence documents are built one at a time
+        self.lock = threading.Lock()
 
         self.intra_parser = IntraSententialParser(verbose=self.verbose, window_size=self.window_size)
         self.multi_parser = MultiSententialParser(verbose=self.verbose, window_size=self.window_size)
 
         self.add_feature_writer()
+        self.add_feature_cache()
 
         self.add_classifiers()
 
@@ -26,25 +34,29 @@ class CRFTreeBuilder:
                                         model_type='treebuilder',
                                         model_path=paths.TREE_BUILD_MODEL_PATH,
                                         model_file='struct/intra.crfsuite',
-                                        verbose=self.verbose)
+                                        verbose=self.verbose,
+                                        persistent=self.persistent_tagger)
 
         bin_classifier2 = CRFClassifier(name=self.name + "_multi_bin",
                                         model_type='treebuilder',
                                         model_path=paths.TREE_BUILD_MODEL_PATH,
                                         model_file='struct/multi.crfsuite',
-                                        verbose=self.verbose)
+                                        verbose=self.verbose,
+                                        persistent=self.persistent_tagger)
 
         mc_classifier1 = CRFClassifier(name=self.name + "_intra_mc",
                                        model_type='treebuilder',
                                        model_path=paths.TREE_BUILD_MODEL_PATH,
                                        model_file='label/intra.crfsuite',
-                                       verbose=self.verbose)
+                                       verbose=self.verbose,
+                                       persistent=self.persistent_tagger)
 
         mc_classifier2 = CRFClassifier(name=self.name + "_multi_mc",
                                        model_type='treebuilder',
                                        model_path=paths.TREE_BUILD_MODEL_PATH,
                                        model_file='label/multi.crfsuite',
-                                       verbose=self.verbose)
+                                       verbose=self.verbose,
+                                       persistent=self.persistent_tagger)
 
         self.add_classifier(bin_classifier1, 'bin1')
         self.add_classifier(mc_classifier1, 'mc1')
@@ -71,21 +83,36 @@ class CRFTreeBuilder:
         self.intra_parser.feature_writer = feature_writer
         self.multi_parser.feature_writer = feature_writer
 
+    def add_feature_cache(self):
+        # kept across documents of the worker, keys are safe to share between the parsers
+        self.feature_cache = FeatureCache()
+
+        self.intra_parser.feature_cache = self.feature_cache
+        self.multi_parser.feature_cache = self.feature_cache
+
     def build_tree(self, doc):
         if len(doc.edus) == 1:
             return [ParseTree("n/a", [doc.edus[0]])]
 
-        for i in range(len(doc.sentences)):
-            sentence = doc.sentences[i]
-            (start_edu, end_edu) = doc.cuts[i]
+        with self.lock:
+            self.feature_cache.new_document()
 
-            if self.verbose:
-                print 'sentence %d' % i
-                print 'start_edu', start_edu, 'end_edu', end_edu
+            for i in range(len(doc.sentences)):
+                sentence = doc.sentences[i]
+                (start_edu, end_edu) = doc.cuts[i]
 
-            self.intra_parser.parse_each_sentence(sentence)
+                if self.verbose:
+                    print 'sentence %d' % i
+                    print 'start_edu', start_edu, 'end_edu', end_edu
 
-        self.multi_parser.parse_document(doc)
+                self.intra_parser.parse_each_sentence(sentence)
+
+            self.multi_parser.parse_document(doc)
+
+            if self.verbose:
+                print 'Feature cache: %(hits)d hits, %(misses)d misses (hit rate %(hit_rate).2f), ' \
+                      '%(write_time).3f s writing features, %(saved_time).3f s saved' \
+                      % self.feature_cache.document_stats()
 
         return doc.discourse_tree
 
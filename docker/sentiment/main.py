@@ -1,3 +1,5 @@
+from typing import List
+
 from fastapi import FastAPI
 from flair.data import Sentence
 from flair.models import TextClassifier
@@ -11,13 +13,37 @@ class Request(BaseModel):
     text: str
 
 
-@app.post('/api/sentiment/')
-async def sentiment(request: Request):
-    sentence = Sentence(request.text)
-    classifier.predict(sentence)
+class BatchRequest(BaseModel):
+    texts: List[str]
+    mini_batch_size: int = 32
+
+
+def _sentiment(sentence: Sentence):
+    # empty texts are not classified by flair
+    if not sentence.labels:
+        return {'value': None, 'sentiment': 0.0}
     label = sentence.labels[0]
     return {
         # positive > 0, negative < 0
         'value': label.value,
         'sentiment': label.score if label.value == 'POSITIVE' else label.score * -1
     }
+
+
+@app.post('/api/sentiment/')
+async def sentiment(request: Request):
+    sentence = Sentence(request.text)
+    classifier.predict(sentence)
+    return _sentiment(sentence)
+
+
+@app.post('/api/sentiment/batch/')
+async def sentiment_batch(request: BatchRequest):
+    # sentences are classified in mini batches of one predict call, results are in the order of texts
+    sentences = [Sentence(text) for text in request.texts]
+    classifier.predict(sentences, mini_batch_size=request.mini_batch_size)
+    sentiments = [_sentiment(sentence) for sentence in sentences]
+    return {
+        'value': [sentiment['value'] for sentiment in sentiments],
+        'sentiment': [sentiment['sentiment'] for sentiment in sentiments],
+    }